@@ -0,0 +1,89 @@
+"""Move predictor cost: the original dict-based Markov chain vs NGramPredictor.
+
+Generates a long synthetic player history (a repeating pattern with noise),
+bulk-loads it with ``fit`` and then times one ``predict`` + ``update`` per
+round, as the game does, along with how often each predictor guessed right.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_ai
+"""
+import time
+import random
+import argparse
+
+import numpy as np
+
+from controllers.ngram_predictor import NGramPredictor, MOVES
+
+
+class LegacyMarkov:
+    """The first-order transition table MarkovChainAI used before NGramPredictor."""
+
+    def __init__(self):
+        self.transitions = {a: {b: 0 for b in MOVES} for a in MOVES}
+        self.last_player_move = None
+
+    def update_history(self, new_move):
+        if self.last_player_move:
+            self.transitions[self.last_player_move][new_move] += 1
+        self.last_player_move = new_move
+
+    def predict_next_move(self):
+        if not self.last_player_move:
+            return random.choice(MOVES)
+        next_moves = self.transitions[self.last_player_move]
+        if sum(next_moves.values()) == 0:
+            return random.choice(MOVES)
+        return max(next_moves, key=next_moves.get)
+
+
+def player_history(rounds: int, noise: float = 0.2, seed: int = 0) -> np.ndarray:
+    """Moves of a player who cycles rock, rock, paper, scissors but deviates ``noise`` of the time."""
+    rng = np.random.default_rng(seed)
+    pattern = np.array([0, 0, 1, 2])
+    moves = pattern[np.arange(rounds) % len(pattern)]
+    deviate = rng.random(rounds) < noise
+    moves[deviate] = rng.integers(0, 3, int(deviate.sum()))
+    return moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=1_000_000, help="rounds bulk-loaded with fit()")
+    parser.add_argument("--rounds", type=int, default=200_000, help="rounds played one at a time")
+    args = parser.parse_args()
+
+    history = player_history(args.history)
+    live = player_history(args.rounds, seed=1).tolist()
+
+    legacy = LegacyMarkov()
+    start = time.perf_counter()
+    for move in history.tolist():
+        legacy.update_history(MOVES[move])
+    legacy_load_s = time.perf_counter() - start
+    hits = 0
+    start = time.perf_counter()
+    for move in live:
+        hits += legacy.predict_next_move() == MOVES[move]
+        legacy.update_history(MOVES[move])
+    legacy_us = (time.perf_counter() - start) / len(live) * 1e6
+    print(f"{'legacy order 1':18s} load {legacy_load_s * 1000:8.1f} ms  "
+          f"predict+update {legacy_us:6.2f} us  hit rate {hits / len(live):.3f}")
+
+    for order in (1, 2, 3, 4):
+        predictor = NGramPredictor(order)
+        start = time.perf_counter()
+        predictor.fit(history)
+        load_s = time.perf_counter() - start
+        hits = 0
+        start = time.perf_counter()
+        for move in live:
+            hits += predictor.predict() == move
+            predictor.update(move)
+        per_round_us = (time.perf_counter() - start) / len(live) * 1e6
+        print(f"{f'ngram order {order}':18s} load {load_s * 1000:8.1f} ms  "
+              f"predict+update {per_round_us:6.2f} us  hit rate {hits / len(live):.3f}  "
+              f"({predictor.nbytes / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
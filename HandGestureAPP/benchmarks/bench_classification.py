@@ -0,0 +1,70 @@
+"""Per-hand ML classification cost: one predict per hand vs one predict per frame/window.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_classification
+"""
+import os
+import time
+import argparse
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.synthetic import GESTURES, make_hand, to_landmark_list, training_set
+from controllers.gesture_detector import GestureDetector
+from models.game_models import GameSettings
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gesture_model.pkl")
+
+
+def load_or_train_model(detector):
+    if os.path.exists(MODEL_PATH):
+        return joblib.load(MODEL_PATH)
+    hands, labels = training_set()
+    features = detector.extract_features_batch([to_landmark_list(h) for h in hands])
+    clf = RandomForestClassifier(n_estimators=100, random_state=42)
+    clf.fit(features, labels)
+    return clf
+
+
+def time_per_hand(fn, batches, repeats):
+    hands = sum(len(b) for b in batches) * repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for batch in batches:
+            fn(batch)
+    return (time.perf_counter() - start) / hands * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--window", type=int, default=5, help="frames per batch in window mode")
+    args = parser.parse_args()
+
+    detector = GestureDetector(GameSettings())
+    detector.model = load_or_train_model(detector)
+
+    rng = np.random.default_rng(1)
+    frames = [
+        [to_landmark_list(make_hand(GESTURES[i % 3], rng, 0.3)),
+         to_landmark_list(make_hand(GESTURES[(i + 1) % 3], rng, 0.7))]
+        for i in range(args.frames)
+    ]
+    windows = [sum(frames[i:i + args.window], []) for i in range(0, len(frames), args.window)]
+
+    def single(batch):
+        for hand in batch:
+            detector.rule_based_classify(hand)
+
+    results = {
+        "single-sample predict": time_per_hand(single, frames, args.repeats),
+        "batched per frame (2 hands)": time_per_hand(detector.classify_hands, frames, args.repeats),
+        f"batched per window ({args.window} frames)": time_per_hand(detector.classify_hands, windows, args.repeats),
+    }
+    for name, us in results.items():
+        print(f"{name:32s} {us:10.1f} µs/hand")
+
+
+if __name__ == "__main__":
+    main()
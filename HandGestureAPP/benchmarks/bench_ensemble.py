@@ -0,0 +1,99 @@
+"""Decision latency and strength of EnsembleAI at each difficulty.
+
+Plays every difficulty against a few scripted players and times one full
+decision (``get_counter_move`` + ``update_history``) per round. EXPERT must
+stay well under a millisecond per decision.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_ensemble
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks.bench_ai import player_history
+from controllers.ensemble_ai import EnsembleAI, BEATS
+from controllers.ngram_predictor import MOVES, MOVE_INDEX
+from models.game_models import Difficulty
+
+
+def outcome(player: int, ai: int) -> str:
+    if player == ai:
+        return "draw"
+    return "win" if BEATS[ai] == player else "loss"
+
+
+class PatternPlayer:
+    def __init__(self, rounds, seed):
+        self.moves = player_history(rounds, seed=seed).tolist()
+        self.i = -1
+
+    def play(self, last_ai, last_outcome):
+        self.i += 1
+        return self.moves[self.i]
+
+
+class WinStayLoseShiftPlayer:
+    def __init__(self, rounds, seed):
+        self.rng = np.random.default_rng(seed)
+        self.last = 0
+
+    def play(self, last_ai, last_outcome):
+        if last_ai is not None and last_outcome != "win":
+            self.last = int(BEATS[last_ai])
+        if self.rng.random() < 0.1:
+            self.last = int(self.rng.integers(3))
+        return self.last
+
+
+class BiasedPlayer:
+    def __init__(self, rounds, seed):
+        self.moves = np.random.default_rng(seed).choice(3, size=rounds, p=[0.5, 0.3, 0.2]).tolist()
+        self.i = -1
+
+    def play(self, last_ai, last_outcome):
+        self.i += 1
+        return self.moves[self.i]
+
+
+PLAYERS = {"pattern": PatternPlayer, "wsls": WinStayLoseShiftPlayer, "biased": BiasedPlayer}
+
+
+def play(difficulty: Difficulty, player_cls, rounds: int, seed: int):
+    history = os.path.join(tempfile.gettempdir(), "bench_ensemble_missing_history.rpsh")
+    ai = EnsembleAI(history, difficulty=difficulty, seed=seed)
+    player = player_cls(rounds, seed)
+    latencies = np.empty(rounds)
+    ai_wins = 0
+    last_ai = last_outcome = None
+    for i in range(rounds):
+        move = player.play(last_ai, last_outcome)
+        start = time.perf_counter()
+        ai_move = MOVE_INDEX[ai.get_counter_move()]
+        last_outcome = outcome(move, ai_move)
+        ai.update_history(MOVES[move], last_outcome)
+        latencies[i] = time.perf_counter() - start
+        last_ai = ai_move
+        ai_wins += last_outcome == "loss"
+    return latencies * 1e6, ai_wins / rounds, ai.weight_report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for difficulty in Difficulty:
+        for name, player_cls in PLAYERS.items():
+            latencies, win_rate, weights = play(difficulty, player_cls, args.rounds, args.seed)
+            p50, p99 = np.percentile(latencies, (50, 99))
+            top = max(weights, key=weights.get)
+            print(f"{difficulty.value:7s} vs {name:8s} decision p50 {p50:6.1f} us  p99 {p99:6.1f} us  "
+                  f"AI win rate {win_rate:.3f}  top predictor {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Shared featurizer vs the per-hand list-comprehension path it replaced.
+
+Times, per hand, the old ``extract_features`` (one Python list per hand),
+the old batch version, and controllers/featurizer.py both from MediaPipe
+landmark lists (what GestureDetector does) and from ready (N, 21, 3) arrays
+(what training does), for each feature schema.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_featurizer
+"""
+import time
+import argparse
+
+import numpy as np
+
+from benchmarks.synthetic import GESTURES, make_hand, to_landmark_list
+from controllers.featurizer import FeatureSchema, featurize, hand_points
+
+
+def legacy_extract_features(landmarks):
+    points = np.array([[lm.x, lm.y] for lm in landmarks.landmark])
+    base = points[0]
+    points = points - base
+    max_dist = np.max(np.linalg.norm(points, axis=1))
+    if max_dist > 0:
+        points = points / max_dist
+    return points.flatten().tolist()
+
+
+def legacy_extract_features_batch(hands):
+    points = np.array([[[lm.x, lm.y] for lm in hand.landmark] for hand in hands])
+    points = points - points[:, :1, :]
+    max_dist = np.max(np.linalg.norm(points, axis=2), axis=1)
+    max_dist[max_dist == 0] = 1.0
+    points = points / max_dist[:, None, None]
+    return points.reshape(len(hands), -1)
+
+
+def us_per_hand(fn, hands: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / hands * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    arrays = np.array([make_hand(GESTURES[i % 3], rng, 0.3 + 0.4 * (i % 2)) for i in range(args.hands)])
+    landmarks = [to_landmark_list(hand) for hand in arrays]
+
+    legacy = np.array([legacy_extract_features(hand) for hand in landmarks], dtype=np.float32)
+    print(f"identical to the legacy features: {np.array_equal(legacy, featurize(hand_points(landmarks)))}")
+
+    rows = [
+        ("legacy per hand", lambda: [legacy_extract_features(hand) for hand in landmarks]),
+        ("legacy batch", lambda: legacy_extract_features_batch(landmarks)),
+        ("landmarks -> featurize, per hand", lambda: [featurize(hand_points([hand])) for hand in landmarks]),
+        ("landmarks -> featurize, 2 hands", lambda: [featurize(hand_points(landmarks[i:i + 2]))
+                                                     for i in range(0, len(landmarks), 2)]),
+        ("landmarks -> featurize, batch", lambda: featurize(hand_points(landmarks))),
+    ]
+    for schema in (FeatureSchema(), FeatureSchema(use_z=True), FeatureSchema(use_angles=True),
+                   FeatureSchema(use_z=True, use_angles=True)):
+        name = f"array -> featurize z={int(schema.use_z)} angles={int(schema.use_angles)} ({schema.dim})"
+        rows.append((name, lambda schema=schema: featurize(arrays, schema)))
+
+    for name, fn in rows:
+        print(f"{name:45s} {us_per_hand(fn, args.hands, args.repeats):8.2f} us/hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Temporal filter cost and signal rate: the original list-based filter vs GestureVoter.
+
+Replays a synthetic landmark stream through the rule-based classifier once,
+then feeds the same per-frame votes to both filters.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_filter
+"""
+import time
+import argparse
+
+from benchmarks.synthetic import GESTURES, gesture_sequence, to_landmark_list
+from controllers.gesture_detector import GestureDetector
+from controllers.gesture_filter import GestureVoter
+from models.game_models import GameSettings
+
+
+class LegacyFilter:
+    """The filter_gesture implementation GestureDetector used before GestureVoter.
+
+    ``time.time()`` is replaced by the replay clock so the 1 s history window
+    holds the same ~30 frames it would hold on a live camera.
+    """
+
+    def __init__(self):
+        self.gesture_history = []
+        self.emitted = 0
+
+    def filter_gesture(self, gesture, confidence, finger_count, now):
+        self.gesture_history.append((gesture, confidence, now, finger_count))
+
+        current_time = now
+        self.gesture_history = [(g, c, t, f) for g, c, t, f in self.gesture_history
+                                if current_time - t < 1.0]
+
+        if len(self.gesture_history) >= 3:
+            recent_gestures = [g for g, c, t, f in self.gesture_history[-5:]]
+            if recent_gestures.count(gesture) >= 3 and confidence > 0.7:
+                self.emitted += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=20, help="rock/paper/scissors cycles in the stream")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    detector = GestureDetector(GameSettings())
+    detector.model = None
+    sequence = [GESTURES[i % 3] for i in range(args.cycles * 3)]
+    votes = [detector.rule_based_classify(to_landmark_list(points), use_model=False)
+             for points, _ in gesture_sequence(sequence)]
+    frame_dt = 1.0 / 30.0
+    duration_s = len(votes) * frame_dt
+
+    legacy_best = voter_best = float("inf")
+    for _ in range(args.repeats):
+        legacy = LegacyFilter()
+        start = time.perf_counter()
+        for i, vote in enumerate(votes):
+            legacy.filter_gesture(*vote, i * frame_dt)
+        legacy_best = min(legacy_best, time.perf_counter() - start)
+
+        voter = GestureVoter()
+        emitted = 0
+        start = time.perf_counter()
+        for i, vote in enumerate(votes):
+            if voter.add(*vote, i * frame_dt) is not None:
+                emitted += 1
+        voter_best = min(voter_best, time.perf_counter() - start)
+
+    print(f"frames replayed: {len(votes)} ({duration_s:.1f} s of video, {len(sequence)} gesture changes)")
+    print(f"legacy filter  {legacy_best / len(votes) * 1e6:7.2f} µs/frame  "
+          f"{legacy.emitted:5d} signals ({legacy.emitted / duration_s:5.1f}/s)")
+    print(f"GestureVoter   {voter_best / len(votes) * 1e6:7.2f} µs/frame  "
+          f"{emitted:5d} signals ({emitted / duration_s:5.1f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compiled NumPy forest vs sklearn: equivalence, load time and prediction latency.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_forest
+"""
+import os
+import time
+import tempfile
+import argparse
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.bench_classification import MODEL_PATH
+from benchmarks.synthetic import to_landmark_list, training_set
+from controllers.forest_evaluator import CompiledForest, export_forest
+from controllers.gesture_detector import GestureDetector
+from models.game_models import GameSettings
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    detector = GestureDetector(GameSettings())
+    hands, labels = training_set()
+    features = detector.extract_features_batch([to_landmark_list(h) for h in hands])
+
+    if os.path.exists(MODEL_PATH):
+        forest = joblib.load(MODEL_PATH)
+    else:
+        forest = RandomForestClassifier(n_estimators=100, random_state=42).fit(features, labels)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl_path = os.path.join(tmp, "model.pkl")
+        npz_path = os.path.join(tmp, "model.npz")
+        joblib.dump(forest, pkl_path)
+        compiled = export_forest(forest, npz_path)
+
+        pkl_load = best_of(lambda: joblib.load(pkl_path), 5)
+        npz_load = best_of(lambda: CompiledForest.load(npz_path), 5)
+
+    rng = np.random.default_rng(0)
+    probe = features[rng.permutation(len(features))] + rng.normal(0, 0.05, features.shape)
+    # Depth-limited trees end in impure leaves, whose stored class fractions must be used as is
+    shallow = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42).fit(features, labels)
+    for name, candidate, model in (("full depth", forest, compiled),
+                                   ("max_depth=5", shallow, CompiledForest.from_sklearn(shallow))):
+        identical = (
+            np.array_equal(candidate.predict_proba(probe), model.predict_proba(probe))
+            and np.array_equal(candidate.predict(probe), model.predict(probe))
+        )
+        print(f"bit-identical predict/predict_proba ({name}): {identical}")
+        assert identical, f"compiled forest differs from sklearn ({name})"
+
+    print(f"load    sklearn pickle {pkl_load * 1e3:8.2f} ms   compiled {npz_load * 1e3:8.2f} ms")
+    for batch in (1, 2, 10):
+        sample = probe[:batch]
+        sk = best_of(lambda: forest.predict(sample), args.repeats)
+        np_ = best_of(lambda: compiled.predict(sample), args.repeats)
+        print(f"predict batch={batch:<3d} sklearn {sk * 1e6:10.1f} µs   compiled {np_ * 1e6:10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
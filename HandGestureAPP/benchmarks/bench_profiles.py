@@ -0,0 +1,58 @@
+"""Profile switching: cache hits, evictions and load time for each cache size.
+
+Switches between ``--profiles`` players in a fixed random order the way the
+main window does (load in the background, then activate), for several
+``max_profiles`` values including 1, and checks that every profile is still
+cached when the window asks for it after its load finishes.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_profiles
+"""
+import os
+import random
+import logging
+import argparse
+import tempfile
+
+from controllers.profile_manager import DEFAULT_PROFILE, ProfileManager
+from utils.logger import setup_logging
+
+
+def run(root: str, switches: list, max_profiles: int) -> dict:
+    profiles = ProfileManager(root, os.path.join(root, "historico.rpsh"), max_profiles=max_profiles)
+    profiles.get(DEFAULT_PROFILE)
+    load_ms = []
+    for name in switches:
+        misses = profiles.misses
+        profiles.load_async(name).result()
+        if profiles.misses > misses:
+            load_ms.append(profiles.last_load_ms)
+        # MainWindow.on_profile_loaded looks the profile up again before activating it
+        assert profiles.cached(name) is not None, f"profile {name!r} evicted before it was activated"
+        profiles.activate(name)
+        assert len(profiles.cache) <= max_profiles, "cache above max_profiles after activation"
+    profiles.shutdown()
+    stats = profiles.stats()
+    stats["avg_load_ms"] = sum(load_ms) / len(load_ms) if load_ms else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=8)
+    parser.add_argument("--switches", type=int, default=200)
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=[1, 2, 4, 16])
+    args = parser.parse_args()
+    setup_logging().setLevel(logging.WARNING)
+
+    names = [f"jogador{i}" for i in range(args.profiles)]
+    rng = random.Random(0)
+    switches = [rng.choice(names) for _ in range(args.switches)]
+    with tempfile.TemporaryDirectory() as root:
+        for size in args.cache_sizes:
+            stats = run(root, switches, size)
+            print(f"max_profiles={size:<3d} hits {stats['hits']:4d}  misses {stats['misses']:4d}  "
+                  f"evictions {stats['evictions']:4d}  load {stats['avg_load_ms']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
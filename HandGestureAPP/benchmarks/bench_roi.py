@@ -0,0 +1,101 @@
+"""ROI tracking: one MediaPipe instance shared by crops and full frames vs one per input geometry.
+
+Renders a clip of a drawn hand moving, resizing and briefly leaving the
+frame (MediaPipe detects the drawing), then runs HandROITracker over it with
+a single tracking-mode Hands for crops and full frames, and with a separate
+instance for crops. Reports the redetection rate (ROI frames where the hand
+was lost and a full-frame pass was needed), the share of frames served from
+the ROI, frames with a hand found and the mean inference time per frame.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_roi
+"""
+import math
+import argparse
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from controllers.roi_tracker import HandROITracker
+
+SKIN = (140, 175, 225)
+CREASE = (110, 145, 200)
+
+
+def render_hand(cx: int, cy: int, size: int, rng: np.random.Generator, width: int = 640,
+                height: int = 480) -> np.ndarray:
+    """An open hand drawn with filled shapes, palm centred on (cx, cy), about ``2 * size`` pixels tall."""
+    frame = np.full((height, width, 3), (60, 90, 70), np.uint8)
+    cv2.ellipse(frame, (cx, cy), (int(0.45 * size), size // 2), 0, 0, 360, SKIN, -1, cv2.LINE_AA)
+    cv2.rectangle(frame, (cx - int(0.28 * size), cy + int(0.3 * size)), (cx + int(0.28 * size), cy + size), SKIN, -1)
+    for i, (length, angle) in enumerate(zip((0.9, 1.0, 0.92, 0.72), (-12, -4, 4, 13))):
+        bx, by = cx + int((-0.33 + 0.22 * i) * size), cy - int(0.38 * size)
+        angle = math.radians(angle)
+        tx, ty = bx + int(math.sin(angle) * length * size), by - int(math.cos(angle) * length * size)
+        cv2.line(frame, (bx, by), (tx, ty), SKIN, int(0.2 * size), cv2.LINE_AA)
+        for k in (0.33, 0.66):
+            jx, jy = int(bx + (tx - bx) * k), int(by + (ty - by) * k)
+            cv2.line(frame, (jx - int(0.07 * size), jy), (jx + int(0.07 * size), jy), CREASE, 2)
+    bx, by = cx - int(0.4 * size), cy + int(0.15 * size)
+    cv2.line(frame, (bx, by), (bx - int(0.45 * size), by - int(0.45 * size)), SKIN, int(0.24 * size), cv2.LINE_AA)
+    frame = cv2.GaussianBlur(frame, (7, 7), 0)
+    return np.clip(frame + rng.normal(0, 4, frame.shape), 0, 255).astype(np.uint8)
+
+
+def render_clip(frames: int, seed: int = 0) -> list:
+    """The hand circles the frame and changes size; it leaves for 10 frames every 100."""
+    rng = np.random.default_rng(seed)
+    clip = []
+    for i in range(frames):
+        if i % 100 >= 90:
+            clip.append(np.full((480, 640, 3), (60, 90, 70), np.uint8))
+            continue
+        t = i / 30.0
+        cx = int(320 + 150 * math.sin(t * 1.3))
+        cy = int(260 + 50 * math.sin(t * 2.1))
+        size = int(95 + 25 * math.sin(t * 0.7))
+        clip.append(render_hand(cx, cy, size, rng))
+    return clip
+
+
+def run(clip, separate: bool, refresh_interval: int) -> dict:
+    def create():
+        return mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2, model_complexity=1,
+                                        min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    hands = create()
+    roi_hands = create() if separate else None
+    tracker = HandROITracker(refresh_interval=refresh_interval)
+    found = 0
+    inference_ms = []
+    for frame in clip:
+        results = tracker.process(frame, hands.process, roi_hands.process if roi_hands else None)
+        found += bool(results.multi_hand_landmarks)
+        inference_ms.append(tracker.frame_inference_ms[-1])
+    hands.close()
+    if roi_hands:
+        roi_hands.close()
+    stats = tracker.stats()
+    stats["hand_frames"] = found
+    stats["avg_inference_ms"] = float(np.mean(inference_ms))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--refresh-interval", type=int, default=30)
+    args = parser.parse_args()
+
+    clip = render_clip(args.frames)
+    visible = sum(1 for i in range(args.frames) if i % 100 < 90)
+    print(f"{args.frames} frames, hand visible in {visible}")
+    for name, separate in (("shared instance", False), ("separate ROI instance", True)):
+        stats = run(clip, separate, args.refresh_interval)
+        print(f"{name:22s} redetection rate {stats['redetection_rate']:6.1%}  "
+              f"ROI frames {stats['roi_frames'] / stats['frames']:6.1%}  "
+              f"hand found {stats['hand_frames']:4d}  {stats['avg_inference_ms']:6.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Time to recognize a gesture: frame-by-frame voting vs the sliding-window sequence classifier.
+
+Trains a SequenceClassifier on synthetic clips (other seeds than the
+committed ones), then replays every clip in benchmarks/data through
+GestureDetector twice, frame by frame on the clip clock: once with the
+forest from run_suite plus GestureVoter (3 of 5 votes), once with the
+sequence classifier at each confidence threshold. For each run it reports
+the delay from the moment the hand starts forming a gesture to its first
+emission, the milliseconds saved against voting (segment by segment, over
+the segments both runs emitted), gestures never emitted, emissions of a
+gesture other than the one being formed, and the cost of process_frame. Calibration is reported on held-out synthetic clips.
+
+Run from HandGestureAPP:  python -m benchmarks.bench_sequence
+"""
+import json
+import time
+import logging
+import argparse
+
+import numpy as np
+from PyQt5.QtCore import Qt
+
+from benchmarks.clips import CLIPS, CLIP_FPS, clip_path
+from benchmarks.run_suite import build_model, clip_labels, percentile_summary, segment_delays
+from benchmarks.synthetic import GESTURES, gesture_sequence
+from controllers.featurizer import hand_points
+from controllers.frame_sources import LandmarkStreamSource, RecordedHandResults, make_landmark_list
+from controllers.gesture_detector import GestureDetector
+from controllers.sequence_classifier import DEFAULT_WINDOW, SequenceClassifier
+from models.game_models import GameSettings
+from utils.logger import setup_logging
+
+
+def jitter(points: np.ndarray, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """Adds Gaussian noise of ``noise`` (normalized image units) to the x and y of (..., 21, 3) landmarks."""
+    if not noise:
+        return points
+    points = points.copy()
+    points[..., :2] += rng.normal(0.0, noise, points[..., :2].shape)
+    return points
+
+
+def training_clips(count: int, seed: int = 100, noise: float = 0.0):
+    """Synthetic single-hand clips with random gesture orders, hold and transition lengths."""
+    rng = np.random.default_rng(seed)
+    # Separate draws, so the clips have the same gestures and timing at every noise level
+    noise_rng = np.random.default_rng(seed + 1)
+    clips = []
+    for i in range(count):
+        gestures = list(rng.choice(GESTURES, size=8))
+        frames = list(gesture_sequence(gestures, hold_frames=int(rng.integers(15, 40)),
+                                       transition_frames=int(rng.integers(3, 11)),
+                                       seed=seed + i, center_x=float(rng.uniform(0.25, 0.75))))
+        clips.append(([jitter(points, noise, noise_rng) for points, _ in frames], [label for _, label in frames]))
+    return clips
+
+
+def forming_targets(frames) -> list:
+    """Gesture being held or formed at every frame (the next label while it changes shape)."""
+    targets = [label for label, _ in frames]
+    upcoming = None
+    for i in range(len(targets) - 1, -1, -1):
+        if targets[i] is None:
+            targets[i] = upcoming
+        else:
+            upcoming = targets[i]
+    return targets
+
+
+def replay(name: str, forest=None, sequence_model=None, threshold: float = 0.9, noise: float = 0.0) -> dict:
+    """Feeds a clip to process_frame synchronously with capture timestamps on the clip clock.
+
+    ``noise`` jitters the recorded landmarks, with the same draws in every run of the clip.
+    """
+    # The sequence path only runs with use_ml_model on
+    settings = GameSettings(show_landmarks=False, use_ml_model=forest is not None or sequence_model is not None,
+                            sequence_threshold=threshold)
+    detector = GestureDetector(settings)
+    detector.model = forest
+    detector.sequence_model = sequence_model
+    emissions = []
+    frame_index = [0]
+    detector.gesture_detected.connect(
+        lambda gesture, *_: emissions.append((frame_index[0] + 1, gesture)), Qt.DirectConnection
+    )
+    source = LandmarkStreamSource(clip_path(name))
+    source.open()
+    rng = np.random.default_rng(0)
+    elapsed = 0.0
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        hands = source.recorded_hands()
+        if noise and hands.multi_hand_landmarks:
+            points = jitter(hand_points(hands.multi_hand_landmarks), noise, rng)
+            hands = RecordedHandResults([make_landmark_list(p) for p in points], hands.multi_handedness)
+        start = time.perf_counter()
+        detector.process_frame(frame, hands, frame_index[0] / CLIP_FPS)
+        elapsed += time.perf_counter() - start
+        frame_index[0] += 1
+    source.release()
+
+    frames = clip_labels(name)
+    targets = forming_targets(frames)
+    per_segment = segment_delays(frames, emissions)
+    delays = [delay for delay in per_segment if delay is not None]
+    return {
+        "time_to_stable_ms": percentile_summary(delays),
+        "delays_ms": per_segment,
+        "missed": len(per_segment) - len(delays),
+        "wrong_emissions": sum(1 for frame, gesture in emissions if targets[frame - 1] not in (None, gesture)),
+        "frame_us": elapsed / max(1, frame_index[0]) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train-clips", type=int, default=40, help="synthetic clips to train the sequence model on")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="frames per window")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--noise", type=float, nargs="+", default=[0.0, 0.02, 0.04],
+                        help="landmark jitter (normalized units) added to the training and replayed clips")
+    parser.add_argument("--clips", nargs="*", default=list(CLIPS), choices=list(CLIPS))
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+    setup_logging().setLevel(logging.INFO)
+
+    forest = build_model()
+    results = {"noise": {}}
+    for noise in args.noise:
+        start = time.perf_counter()
+        model = SequenceClassifier.fit(training_clips(args.train_clips, noise=noise), window=args.window)
+        metrics = model.metrics
+        print(f"\n=== noise {noise:g} ===\nsequence model: window {model.window}, "
+              f"trained in {time.perf_counter() - start:.1f} s, holdout accuracy {metrics['holdout_accuracy']:.3f}, "
+              f"temperature {metrics['temperature']:.2f}, ECE {metrics['ece_uncalibrated']:.3f} -> {metrics['ece']:.3f}")
+        if metrics["holdout_accuracy"] == 1.0:
+            print("the clips are separable: every window is classified with near-certainty, so the threshold "
+                  "barely matters and the ms saved are an upper bound")
+
+        clips = {}
+        for name in args.clips:
+            voting = replay(name, forest=forest, noise=noise)
+            runs = {"voting": voting}
+            print(f"\n{name}: voting {voting['time_to_stable_ms'].get('mean', float('nan')):6.1f} ms "
+                  f"(missed {voting['missed']}, wrong {voting['wrong_emissions']}, {voting['frame_us']:.0f} us/frame)")
+            for threshold in args.thresholds:
+                run = replay(name, sequence_model=model, threshold=threshold, noise=noise)
+                # Same clip, same segments: compared segment by segment where both runs emitted
+                paired = [v - s for v, s in zip(voting["delays_ms"], run["delays_ms"])
+                          if v is not None and s is not None]
+                if paired:
+                    run["saved_ms"] = percentile_summary(paired)
+                runs[f"sequence@{threshold:g}"] = run
+                saved = run.get("saved_ms", {}).get("mean", float("nan"))
+                print(f"  sequence p>={threshold:<5g} {run['time_to_stable_ms'].get('mean', float('nan')):6.1f} ms  "
+                      f"saved {saved:6.1f} ms  missed {run['missed']}  wrong {run['wrong_emissions']}  "
+                      f"{run['frame_us']:.0f} us/frame")
+            clips[name] = runs
+        results["noise"][f"{noise:g}"] = {"model": metrics, "clips": clips}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Small recorded landmark clips used by the benchmark suite.
+
+The clips in benchmarks/data are committed; run this module from
+HandGestureAPP to regenerate them:  python -m benchmarks.clips
+"""
+import os
+
+from benchmarks.synthetic import gesture_sequence, write_landmark_stream
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CLIP_FPS = 30.0
+
+
+def single_hand_clip():
+    sequence = ["rock", "paper", "scissors", "rock", "scissors", "paper", "rock"]
+    frames, labels = [], []
+    for points, label in gesture_sequence(sequence, hold_frames=30, transition_frames=6, seed=1):
+        frames.append([points])
+        labels.append(label)
+    return frames, labels
+
+
+def two_player_clip():
+    left = list(gesture_sequence(["rock", "scissors", "paper", "paper"], hold_frames=40, seed=2, center_x=0.27))
+    right = list(gesture_sequence(["paper", "rock", "rock", "scissors"], hold_frames=40, seed=3, center_x=0.73))
+    frames, labels = [], []
+    for (left_points, left_label), (right_points, right_label) in zip(left, right):
+        frames.append([left_points, right_points])
+        labels.append(left_label)
+    return frames, labels
+
+
+def hand_leaves_clip():
+    """The hand leaves the frame between gestures, so tracking restarts each time."""
+    source_frames = list(gesture_sequence(["paper", "rock", "scissors", "paper"], hold_frames=35, seed=4))
+    frames, labels = [], []
+    for i, (points, label) in enumerate(source_frames):
+        frames.append([points])
+        labels.append(label)
+        if label is not None and i % 41 == 34:
+            frames.extend([] for _ in range(12))
+            labels.extend(None for _ in range(12))
+    return frames, labels
+
+
+CLIPS = {
+    "single_hand": single_hand_clip,
+    "two_players": two_player_clip,
+    "hand_leaves": hand_leaves_clip,
+}
+
+
+def clip_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.jsonl")
+
+
+def main():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for name, build in CLIPS.items():
+        frames, labels = build()
+        write_landmark_stream(clip_path(name), frames, CLIP_FPS, labels, decimals=4)
+        print(f"{clip_path(name)}: {len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
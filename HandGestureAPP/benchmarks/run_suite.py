@@ -0,0 +1,279 @@
+"""Headless end-to-end benchmark suite over the committed landmark clips.
+
+Drives GestureDetector (capture -> classify -> vote -> emit) on every clip in
+benchmarks/data with no display and no camera, plus micro-benchmarks of the
+rule-based classifier, the ML path and the gesture filter. Results are
+written as JSON and can be checked against a stored baseline.
+
+Run from HandGestureAPP:
+    python -m benchmarks.run_suite --output results.json
+    python -m benchmarks.run_suite --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tracemalloc
+import numpy as np
+from PyQt5.QtCore import Qt
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.clips import CLIPS, CLIP_FPS, clip_path
+from benchmarks.synthetic import GESTURES, make_hand, to_landmark_list, training_set
+from controllers.forest_evaluator import CompiledForest
+from controllers.frame_sources import LandmarkStreamSource
+from controllers.gesture_detector import GestureDetector
+from models.game_models import GameSettings
+from utils.logger import setup_logging
+
+# Metrics where a larger value is better; every other metric is a cost
+HIGHER_IS_BETTER = ("fps",)
+
+
+def percentile_summary(values) -> dict:
+    if not len(values):
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {"count": len(values), "mean": float(np.mean(values)), "p50": float(p50),
+            "p95": float(p95), "p99": float(p99)}
+
+
+def build_model():
+    """A small deterministic forest so the ML path does not depend on a local gesture_model.pkl."""
+    detector = GestureDetector(GameSettings(use_ml_model=False))
+    hands, labels = training_set(samples_per_gesture=100)
+    features = detector.extract_features_batch([to_landmark_list(h) for h in hands])
+    forest = RandomForestClassifier(n_estimators=100, random_state=42).fit(features, labels)
+    return CompiledForest.from_sklearn(forest)
+
+
+def clip_labels(name: str):
+    """Ground-truth label and hand presence per frame of a clip."""
+    with open(clip_path(name), "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [(record.get("label"), bool(record.get("hands"))) for record in records]
+
+
+def segment_delays(frames, emissions) -> list:
+    """Clip time (ms) from the moment a hand starts forming each gesture to its first emission.
+
+    One entry per labelled segment, in clip order, None for segments whose
+    gesture was never emitted. A gesture starts forming on the first frame
+    with a hand after the previous labelled segment ends, so transition frames
+    count towards the delay.
+    """
+    segments = []
+    forming = None
+    previous = None
+    for i, (label, has_hand) in enumerate(frames):
+        if label is None:
+            if forming is None and has_hand:
+                forming = i
+            continue
+        if label != previous:
+            segments.append((label, i if forming is None else forming))
+        previous = label
+        forming = None
+
+    results = []
+    frame_ms = 1000.0 / CLIP_FPS
+    for index, (label, onset) in enumerate(segments):
+        end = segments[index + 1][1] if index + 1 < len(segments) else len(frames)
+        hits = [frame for frame, gesture in emissions if gesture == label and onset <= frame <= end]
+        # Emissions are recorded as the 1-based number of the emitting frame, so it is hits[0] - 1
+        results.append((hits[0] - 1 - onset) * frame_ms if hits else None)
+    return results
+
+
+def time_to_stable(frames, emissions) -> list:
+    """Delays of the segments whose gesture was emitted; see ``segment_delays``."""
+    return [delay for delay in segment_delays(frames, emissions) if delay is not None]
+
+
+def run_clip(name: str, model) -> dict:
+    settings = GameSettings(profiling_enabled=True, show_landmarks=False, use_ml_model=model is not None)
+    detector = GestureDetector(settings, LandmarkStreamSource(clip_path(name)))
+    if model is not None:
+        detector.model = model
+    emissions = []
+    # Emitted inside process_frame, before frames_processed counts the frame
+    detector.gesture_detected.connect(
+        lambda gesture, confidence, fingers, *_: emissions.append((detector.frames_processed + 1, gesture)),
+        Qt.DirectConnection
+    )
+    detector.player_gesture_detected.connect(
+        lambda player, gesture, confidence, fingers, *_: None, Qt.DirectConnection
+    )
+
+    start = time.perf_counter()
+    if not detector.start_detection():
+        raise RuntimeError(f"Could not open clip {name}")
+    detector.wait()
+    elapsed = time.perf_counter() - start
+    frames = detector.frames_processed
+    stages = detector.get_stage_timings()
+    detector.stop_detection()
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed,
+        "stages_ms": {stage: {k: v for k, v in values.items() if k != "count"} for stage, values in stages.items()},
+        "time_to_stable_ms": percentile_summary(time_to_stable(clip_labels(name), emissions)),
+        "memory": measure_allocations(name, model),
+    }
+
+
+def measure_allocations(name: str, model) -> dict:
+    """Per-frame allocation cost of process_frame, measured synchronously under tracemalloc.
+
+    CPython has no allocation counter, so this reports the transient peak
+    bytes allocated while a frame is processed and the blocks still alive
+    afterwards (a leak indicator).
+    """
+    settings = GameSettings(show_landmarks=False, use_ml_model=model is not None)
+    detector = GestureDetector(settings)
+    if model is not None:
+        detector.model = model
+    source = LandmarkStreamSource(clip_path(name))
+    source.open()
+    frames = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append((frame, source.recorded_hands()))
+
+    # Warm up caches before measuring
+    for frame, hands in frames[:10]:
+        detector.process_frame(frame, hands)
+
+    peaks = []
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for frame, hands in frames:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        detector.process_frame(frame, hands)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    return {
+        "alloc_peak_kib_per_frame": float(np.mean(peaks)) / 1024.0,
+        "retained_blocks_per_frame": (blocks_after - blocks_before) / len(frames),
+    }
+
+
+def component_benchmarks(model, repeats: int = 3) -> dict:
+    detector = GestureDetector(GameSettings(use_ml_model=False))
+    rng = np.random.default_rng(7)
+    hands = [to_landmark_list(make_hand(GESTURES[i % 3], rng)) for i in range(300)]
+
+    def per_call_us(fn, items):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for item in items:
+                fn(item)
+            best = min(best, time.perf_counter() - start)
+        return best / len(items) * 1e6
+
+    results = {"rule_based_us_per_hand": per_call_us(lambda h: detector.rule_based_classify(h, use_model=False), hands)}
+
+    detector.settings.use_ml_model = True
+    detector.model = model
+    pairs = [hands[i:i + 2] for i in range(0, len(hands), 2)]
+    results["ml_single_us_per_hand"] = per_call_us(detector.rule_based_classify, hands)
+    results["ml_batched_us_per_hand"] = per_call_us(detector.classify_hands, pairs) / 2.0
+
+    votes = [detector.rule_based_classify(h, use_model=False) for h in hands]
+    timestamps = [i / CLIP_FPS for i in range(len(votes))]
+    voter = detector.create_voter()
+    results["filter_us_per_vote"] = per_call_us(
+        lambda i: voter.add(*votes[i], timestamps[i]), range(len(votes))
+    )
+    return results
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not name.endswith(".count") and not name.endswith(".frames"):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Returns ``(metric, baseline, current, change)`` for every metric that regressed past ``threshold``."""
+    current = flatten({"clips": results["clips"], "components": results["components"]})
+    reference = flatten({"clips": baseline["clips"], "components": baseline["components"]})
+    regressions = []
+    for metric, old in reference.items():
+        new = current.get(metric)
+        if new is None or old <= 0:
+            continue
+        change = (new - old) / old
+        if metric.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > threshold:
+            regressions.append((metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="JSON from a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative regression per metric (0.25 = 25%%)")
+    parser.add_argument("--clips", nargs="*", default=list(CLIPS), choices=list(CLIPS))
+    args = parser.parse_args()
+    # Per-frame DEBUG records would flood the report
+    setup_logging().setLevel(logging.INFO)
+
+    model = build_model()
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "clips": {},
+        "components": component_benchmarks(model),
+    }
+    for name in args.clips:
+        results["clips"][f"{name}/rules"] = run_clip(name, None)
+        results["clips"][f"{name}/ml"] = run_clip(name, model)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for clip, values in results["clips"].items():
+        stable = values["time_to_stable_ms"]
+        total = values["stages_ms"].get("total", {})
+        print(f"{clip:22s} {values['fps']:8.0f} fps  total p95 {total.get('p95_ms', 0):6.2f} ms  "
+              f"stable after {stable.get('mean', float('nan')):6.1f} ms  "
+              f"{values['memory']['alloc_peak_kib_per_frame']:6.1f} KiB/frame")
+    for name, value in results["components"].items():
+        print(f"{name:28s} {value:8.2f}")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for metric, old, new, change in regressions:
+            print(f"REGRESSION {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Offline AI-vs-bot simulation: win rates with confidence intervals.
+
+Plays AI strategies (anything with ``get_counter_move()`` and
+``update_history(move, outcome)``) against synthetic players. Non-reactive
+players are generated as whole NumPy arrays up front, outcomes are looked up
+in a 3x3 table and tallied with ``np.bincount``, and independent games are
+spread over a process pool. Every game gets its own seed spawned from
+``--seed``, so results do not depend on the number of workers.
+
+Rounds within a game are correlated (the AI adapts, reactive bots answer
+it), so the confidence interval is a bootstrap over the per-game win rates:
+the games, not the rounds, are the independent samples.
+
+Run from HandGestureAPP:
+    python -m benchmarks.simulate --rounds 1000000
+    python -m benchmarks.simulate --ai markov markov:3 ensemble:expert --bots cyclic reactive
+"""
+import os
+import json
+import math
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from controllers.ai_logic import MarkovChainAI
+from controllers.ensemble_ai import EnsembleAI
+from controllers.ngram_predictor import MOVES, OUTCOMES
+from models.game_models import Difficulty
+from utils.round_history import RoundHistory, JSON_MOVES, MOVE_CODES, is_binary_history
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The binary history the app appends to, then the JSON histories it was converted from
+REPLAY_CANDIDATES = (
+    os.path.join(APP_DIR, "historico.rpsh"),
+    os.path.join(APP_DIR, "historico.json"),
+    os.path.join(os.path.dirname(APP_DIR), "historico.json"),
+)
+DEFAULT_REPLAY = next((path for path in REPLAY_CANDIDATES if os.path.exists(path)), REPLAY_CANDIDATES[0])
+BOOTSTRAP_RESAMPLES = 10_000
+
+# RESULT[player, ai]: outcome index (win/draw/loss) from the player's point of view
+RESULT = np.array([
+    [1, 2, 0],
+    [0, 1, 2],
+    [2, 0, 1],
+])
+RESULT_LIST = RESULT.tolist()
+BEATS = (1, 2, 0)
+
+
+class Bot:
+    """A synthetic player. Precomputed bots fill ``moves`` once; reactive ones override ``respond``."""
+    reactive = False
+
+    def __init__(self, rng: np.random.Generator, rounds: int):
+        self.rng = rng
+        self.rounds = rounds
+        self.moves = self.plan() if not self.reactive else None
+
+    def plan(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def respond(self, i: int, last_ai: int, last_outcome: int) -> int:
+        return int(self.moves[i])
+
+
+class BiasedBot(Bot):
+    """Favours rock 50%, paper 30%, scissors 20%."""
+    def plan(self):
+        return self.rng.choice(3, size=self.rounds, p=[0.5, 0.3, 0.2])
+
+
+class CyclicBot(Bot):
+    """Cycles rock, rock, paper, scissors and deviates 15% of the time."""
+    def plan(self):
+        moves = np.array([0, 0, 1, 2])[np.arange(self.rounds) % 4]
+        noise = self.rng.random(self.rounds) < 0.15
+        moves[noise] = self.rng.integers(0, 3, int(noise.sum()))
+        return moves
+
+
+class RandomBot(Bot):
+    """Uniform random; no strategy should beat it, which makes it a sanity check."""
+    def plan(self):
+        return self.rng.integers(0, 3, self.rounds)
+
+
+class ReactiveBot(Bot):
+    """Win-stay/lose-shift: repeats after a win, otherwise plays what beats the AI's last move."""
+    reactive = True
+
+    def __init__(self, rng, rounds):
+        super().__init__(rng, rounds)
+        self.noise = rng.random(rounds) < 0.1
+        self.noise_moves = rng.integers(0, 3, rounds)
+        self.last = int(rng.integers(3))
+
+    def respond(self, i, last_ai, last_outcome):
+        if last_ai >= 0 and last_outcome != 0:
+            self.last = BEATS[last_ai]
+        if self.noise[i]:
+            self.last = int(self.noise_moves[i])
+        return self.last
+
+
+class ReplayBot(Bot):
+    """Replays recorded human moves (historico.rpsh or a JSON history), from a random starting round.
+
+    Games are never longer than the history (``simulate`` caps them): a looped
+    history is a cyclic bot the AI learns, not a human.
+    """
+
+    def __init__(self, rng, rounds, path: str = DEFAULT_REPLAY):
+        self.path = path
+        super().__init__(rng, rounds)
+
+    def plan(self):
+        moves = load_replay_moves(self.path)
+        start = int(self.rng.integers(len(moves)))
+        return np.resize(np.roll(moves, -start), self.rounds)
+
+
+BOTS = {"biased": BiasedBot, "cyclic": CyclicBot, "random": RandomBot, "reactive": ReactiveBot, "replay": ReplayBot}
+
+
+def load_replay_moves(path: str) -> np.ndarray:
+    if is_binary_history(path):
+        moves = np.asarray(RoundHistory(path).read()["player"])
+    else:
+        moves = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        moves.append(MOVE_CODES[JSON_MOVES.get(json.loads(line).get("usuario"), "unknown")])
+                    except json.JSONDecodeError:
+                        continue
+        moves = np.array(moves, dtype=np.int64)
+    moves = moves[moves < 3]
+    if not len(moves):
+        raise ValueError(f"No rounds to replay in {path}")
+    return moves
+
+
+def build_ai(spec: str, seed: int):
+    """``markov[:order]`` or ``ensemble[:difficulty]``, with no history file so nothing is read or written."""
+    name, _, arg = spec.partition(":")
+    history = os.path.join(tempfile.gettempdir(), "simulate-no-history.rpsh")
+    if name == "markov":
+        return MarkovChainAI(history_file=history, order=int(arg or 1))
+    if name == "ensemble":
+        return EnsembleAI(history, difficulty=Difficulty(arg or Difficulty.EXPERT.value), seed=seed)
+    raise ValueError(f"Unknown AI strategy: {spec}")
+
+
+def play_game(ai_spec: str, bot_name: str, rounds: int, seed_entropy, replay_path: str = DEFAULT_REPLAY) -> np.ndarray:
+    """Plays one game and returns the AI's (wins, draws, losses)."""
+    seed_sequence = np.random.SeedSequence(seed_entropy)
+    rng = np.random.default_rng(seed_sequence)
+    python_seed, ai_seed = (int(x) for x in seed_sequence.generate_state(2))
+    # MarkovChainAI falls back to the random module for unseen contexts
+    random.seed(python_seed)
+    ai = build_ai(ai_spec, ai_seed)
+    bot = ReplayBot(rng, rounds, replay_path) if bot_name == "replay" else BOTS[bot_name](rng, rounds)
+
+    player_moves = np.empty(rounds, dtype=np.int64)
+    ai_moves = np.empty(rounds, dtype=np.int64)
+    move_index = {move: i for i, move in enumerate(MOVES)}
+    last_ai = last_outcome = -1
+    for i in range(rounds):
+        player = bot.respond(i, last_ai, last_outcome)
+        ai_move = move_index[ai.get_counter_move()]
+        last_outcome = RESULT_LIST[player][ai_move]
+        ai.update_history(MOVES[player], OUTCOMES[last_outcome])
+        player_moves[i] = player
+        ai_moves[i] = ai_move
+        last_ai = ai_move
+
+    # The player's loss is the AI's win
+    counts = np.bincount(RESULT[player_moves, ai_moves], minlength=3)
+    return np.array([counts[2], counts[1], counts[0]])
+
+
+def bootstrap_interval(rates, seed: int = 0, resamples: int = BOOTSTRAP_RESAMPLES, level: float = 0.95):
+    """Percentile bootstrap interval of the mean of per-game ``rates``; NaN with fewer than two games."""
+    rates = np.asarray(rates, dtype=np.float64)
+    if len(rates) < 2:
+        return math.nan, math.nan
+    rng = np.random.default_rng(seed)
+    means = rates[rng.integers(len(rates), size=(resamples, len(rates)))].mean(axis=1)
+    tail = (1.0 - level) / 2.0 * 100.0
+    low, high = np.percentile(means, (tail, 100.0 - tail))
+    return float(low), float(high)
+
+
+def simulate(ai_specs, bot_names, rounds: int, games: int, seed: int, workers: int = None,
+             replay_path: str = DEFAULT_REPLAY):
+    """Returns the per-pairing report and the overall rounds per second."""
+    rounds_per_game = max(1, rounds // games)
+    replay_rounds = rounds_per_game
+    if "replay" in bot_names:
+        replay_rounds = min(rounds_per_game, len(load_replay_moves(replay_path)))
+    tasks = []
+    for a, ai_spec in enumerate(ai_specs):
+        for b, bot_name in enumerate(bot_names):
+            game_rounds = replay_rounds if bot_name == "replay" else rounds_per_game
+            for g in range(games):
+                tasks.append((ai_spec, bot_name, game_rounds, (seed, a, b, g), replay_path))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [play_game(*task) for task in tasks]
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            results = list(pool.map(play_game, *zip(*tasks), chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    totals = {}
+    game_rates = {}
+    for (ai_spec, bot_name, _, _, _), counts in zip(tasks, results):
+        totals[(ai_spec, bot_name)] = totals.get((ai_spec, bot_name), 0) + counts
+        game_rates.setdefault((ai_spec, bot_name), []).append(counts[0] / counts.sum())
+
+    report = []
+    for (ai_spec, bot_name), (wins, draws, losses) in totals.items():
+        played = int(wins + draws + losses)
+        low, high = bootstrap_interval(game_rates[(ai_spec, bot_name)], seed)
+        report.append({
+            "ai": ai_spec, "bot": bot_name, "rounds": played, "games": len(game_rates[(ai_spec, bot_name)]),
+            "win_rate": wins / played, "win_ci95": [low, high],
+            "draw_rate": draws / played, "loss_rate": losses / played,
+        })
+    total_rounds = sum(entry["rounds"] for entry in report)
+    return report, total_rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ai", nargs="+", default=["markov", "markov:3", "ensemble:expert"],
+                        help="markov[:order] or ensemble[:easy|medium|hard|expert]")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS), choices=list(BOTS))
+    parser.add_argument("--rounds", type=int, default=100_000, help="rounds per AI/bot pairing")
+    parser.add_argument("--games", type=int, default=32, help="independent games per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores, 1 = no pool)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", default=DEFAULT_REPLAY, help="history replayed by the replay bot")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report, rounds_per_s = simulate(args.ai, args.bots, args.rounds, args.games, args.seed, args.workers,
+                                    args.replay)
+    for entry in report:
+        low, high = entry["win_ci95"]
+        print(f"{entry['ai']:16s} vs {entry['bot']:9s} AI wins {entry['win_rate']:.3f} "
+              f"[{low:.3f}, {high:.3f}]  draws {entry['draw_rate']:.3f}  losses {entry['loss_rate']:.3f}  "
+              f"({entry['rounds']} rounds, {entry['games']} games)")
+    capped = [entry for entry in report if entry["bot"] == "replay" and entry["rounds"] < args.rounds]
+    if capped:
+        print(f"replay games capped at the {capped[0]['rounds'] // capped[0]['games']} rounds of {args.replay}")
+    print(f"{rounds_per_s:,.0f} rounds/s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "rounds_per_s": rounds_per_s, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
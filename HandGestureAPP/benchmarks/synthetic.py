@@ -0,0 +1,98 @@
+"""Deterministic synthetic hands and landmark streams for the benchmarks."""
+import json
+import numpy as np
+
+from controllers.frame_sources import make_landmark_list
+
+GESTURES = ("rock", "paper", "scissors")
+
+# Which of (thumb, index, middle, ring, pinky) are extended for each gesture
+EXTENDED = {
+    "rock": (0, 0, 0, 0, 0),
+    "paper": (1, 1, 1, 1, 1),
+    "scissors": (0, 1, 1, 0, 0),
+}
+
+
+def make_hand(gesture: str, rng: np.random.Generator, center_x: float = 0.5,
+              scale: float = 1.0, noise: float = 0.003) -> np.ndarray:
+    """Returns a (21, 3) array of normalized landmarks shaped like ``gesture``."""
+    extended = EXTENDED[gesture]
+    points = np.zeros((21, 3))
+    points[0] = [0.0, 0.3, 0.0]
+    points[1] = [-0.03, 0.25, 0.0]
+    points[2] = [-0.05, 0.22, 0.0]
+    points[3] = [-0.06, 0.20, 0.0]
+    points[4] = [-0.15, 0.18, 0.0] if extended[0] else [-0.05, 0.20, 0.0]
+    for finger in range(4):
+        base = 5 + 4 * finger
+        x = -0.04 + 0.027 * finger
+        points[base] = [x, 0.15, 0.0]
+        points[base + 1] = [x, 0.10, 0.0]
+        points[base + 2] = [x, 0.05, 0.0]
+        points[base + 3] = [x, -0.05, 0.0] if extended[finger + 1] else [x, 0.12, 0.0]
+    points[:, :2] *= scale
+    points[:, 0] += center_x
+    points[:, 1] += 0.5
+    points[:, :2] += rng.normal(0.0, noise, (21, 2))
+    return points
+
+
+def blend_hands(start: np.ndarray, end: np.ndarray, alpha: float) -> np.ndarray:
+    return start + (end - start) * alpha
+
+
+def to_landmark_list(points: np.ndarray):
+    return make_landmark_list(points)
+
+
+def gesture_sequence(gestures, hold_frames: int = 30, transition_frames: int = 6,
+                     seed: int = 0, center_x: float = 0.5):
+    """Yields ``(points, label)`` per frame, morphing between consecutive gestures."""
+    rng = np.random.default_rng(seed)
+    previous = None
+    for gesture in gestures:
+        target = make_hand(gesture, rng, center_x, noise=0.0)
+        if previous is not None:
+            for step in range(1, transition_frames + 1):
+                points = blend_hands(previous, target, step / (transition_frames + 1))
+                points[:, :2] += rng.normal(0.0, 0.003, (21, 2))
+                yield points, None
+        for _ in range(hold_frames):
+            points = target.copy()
+            points[:, :2] += rng.normal(0.0, 0.003, (21, 2))
+            yield points, gesture
+        previous = target
+
+
+def write_landmark_stream(path: str, frames, fps: float = 30.0, labels=None, decimals: int = 5):
+    """Writes frames (lists of (21, 3) arrays, one per hand) in LandmarkStreamSource format.
+
+    ``labels`` optionally adds the ground-truth gesture of each frame (None while
+    the hand is changing shape); the source ignores it, the benchmarks read it.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for i, hands in enumerate(frames):
+            record = {
+                "t": round(i / fps, 4),
+                "hands": [
+                    {"handedness": "Right" if points[0, 0] >= 0.5 else "Left", "score": 0.95,
+                     "landmarks": np.round(points, decimals).tolist()}
+                    for points in hands
+                ],
+            }
+            if labels is not None:
+                record["label"] = labels[i]
+            f.write(json.dumps(record) + "\n")
+
+
+def training_set(samples_per_gesture: int = 200, seed: int = 0):
+    """Returns (hands, labels) with varied position, scale and noise."""
+    rng = np.random.default_rng(seed)
+    hands, labels = [], []
+    for gesture in GESTURES:
+        for _ in range(samples_per_gesture):
+            hands.append(make_hand(gesture, rng, center_x=rng.uniform(0.3, 0.7),
+                                   scale=rng.uniform(0.7, 1.3), noise=0.008))
+            labels.append(gesture)
+    return hands, labels
@@ -0,0 +1,120 @@
+import time
+import numpy as np
+from collections import deque
+
+from utils.logger import setup_logging
+
+logger = setup_logging()
+
+
+class AdaptiveInferenceController:
+    """Keeps per-frame processing within a latency budget.
+
+    Measured frame times are averaged over a window. When frames run over
+    budget the controller first lowers the MediaPipe model complexity, then
+    starts skipping inference on some frames (the detector reuses or
+    extrapolates the last landmarks). When there is headroom it undoes those
+    steps in reverse order. Every change is logged in ``decisions``.
+    The measured cost of a complexity level is trusted for ``cost_ttl_s``
+    seconds only, so one slow spike cannot block the upgrade back for good:
+    once it expires the upgrade is probed again.
+    """
+
+    def __init__(self, target_frame_ms: float, min_complexity: int = 0, max_complexity: int = 1,
+                 max_skip: int = 3, window: int = 30, high_water: float = 0.9, low_water: float = 0.6,
+                 cost_ttl_s: float = 30.0):
+        self.target_frame_ms = target_frame_ms
+        self.min_complexity = min_complexity
+        self.max_complexity = max_complexity
+        self.complexity = max_complexity
+        self.max_skip = max_skip
+        self.skip = 0
+        self.window = window
+        self.high_water = high_water
+        self.low_water = low_water
+        self.cost_ttl_s = cost_ttl_s
+        self.frame_ms = deque(maxlen=window)
+        self.inference_ms = deque(maxlen=window)
+        self.frame_index = 0
+        self.inferred_frames = 0
+        self.skipped_frames = 0
+        self.decisions = deque(maxlen=50)
+        # (mean frame ms, perf_counter time) last measured at each complexity
+        self.complexity_cost = {}
+
+    def should_infer(self) -> bool:
+        infer = self.frame_index % (self.skip + 1) == 0
+        self.frame_index += 1
+        if infer:
+            self.inferred_frames += 1
+        else:
+            self.skipped_frames += 1
+        return infer
+
+    def record(self, frame_ms: float, inference_ms: float):
+        """Reports the cost of a frame that ran inference. Returns True if complexity changed."""
+        self.frame_ms.append(frame_ms)
+        self.inference_ms.append(inference_ms)
+        if len(self.frame_ms) < self.window:
+            return False
+        return self.adjust()
+
+    def adjust(self) -> bool:
+        frame_ms = float(np.mean(self.frame_ms))
+        now = time.perf_counter()
+        self.complexity_cost[self.complexity] = (frame_ms, now)
+        # Average cost per captured frame once skipped frames are amortized
+        load = frame_ms / (self.skip + 1) / self.target_frame_ms
+
+        if load > self.high_water:
+            if self.complexity > self.min_complexity:
+                return self._set(complexity=self.complexity - 1, reason=f"load {load:.2f} over budget")
+            if self.skip < self.max_skip:
+                self._set(skip=self.skip + 1, reason=f"load {load:.2f} over budget")
+            return False
+
+        if self.skip > 0:
+            if frame_ms / self.skip / self.target_frame_ms < self.low_water:
+                self._set(skip=self.skip - 1, reason=f"load {load:.2f}, headroom to infer more often")
+            return False
+
+        if self.complexity < self.max_complexity:
+            # Without a recent measurement assume the heavier model costs about twice as much
+            measured = self.complexity_cost.get(self.complexity + 1)
+            if measured is not None and now - measured[1] < self.cost_ttl_s:
+                upgraded = measured[0]
+            else:
+                upgraded = frame_ms * 2.0
+            if upgraded / self.target_frame_ms < self.low_water:
+                return self._set(complexity=self.complexity + 1, reason=f"load {load:.2f}, headroom for a heavier model")
+        return False
+
+    def _set(self, complexity: int = None, skip: int = None, reason: str = "") -> bool:
+        changed_complexity = complexity is not None and complexity != self.complexity
+        decision = {
+            "time": time.perf_counter(),
+            "complexity": self.complexity if complexity is None else complexity,
+            "skip": self.skip if skip is None else skip,
+            "reason": reason,
+        }
+        if complexity is not None:
+            self.complexity = complexity
+        if skip is not None:
+            self.skip = skip
+        self.frame_ms.clear()
+        self.inference_ms.clear()
+        self.decisions.append(decision)
+        logger.info(f"Adaptive inference: complexity={self.complexity}, skip={self.skip} ({reason})")
+        return changed_complexity
+
+    def stats(self) -> dict:
+        return {
+            "target_frame_ms": self.target_frame_ms,
+            "model_complexity": self.complexity,
+            "skip_frames": self.skip,
+            "mean_frame_ms": float(np.mean(self.frame_ms)) if self.frame_ms else 0.0,
+            "mean_inference_ms": float(np.mean(self.inference_ms)) if self.inference_ms else 0.0,
+            "inferred_frames": self.inferred_frames,
+            "skipped_frames": self.skipped_frames,
+            "decisions": list(self.decisions),
+        }
@@ -1,27 +1,54 @@
 import json
 import random
 import os
+import hashlib
 import logging
+import tempfile
+
+import numpy as np
+
+from controllers.ngram_predictor import NGramPredictor, MOVES, MOVE_INDEX, OUTCOME_INDEX
+from utils.round_history import RoundHistory, RECORD_DTYPE, HEADER_SIZE, MOVE_CODES, is_binary_history
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = 1
+# Bytes hashed at the start and just before the consumed offset to detect a replaced history file
+FINGERPRINT_BYTES = 4096
+
 class MarkovChainAI:
-    def __init__(self, history_file="../historico.json"):
+    """Predicts the player's next move from the last ``order`` rounds.
+
+    One NGramPredictor is kept per order from ``order`` down to 1; prediction
+    uses the longest context that has been seen before. With ``use_outcomes``
+    the context also includes whether the player won, drew or lost.
+
+    The counts learned from the history file are saved to ``snapshot_file``
+    with the byte offset they cover, so a restart only parses lines appended
+    since. The snapshot is discarded if the history was truncated or replaced.
+    """
+
+    def __init__(self, history_file="../historico.json", order: int = 1, use_outcomes: bool = False,
+                 snapshot_file: str = None):
         # main.py is run from HandGestureAPP usually, but we need to resolve the path correctly.
         # It's better to use an absolute path or relative to the current working dir.
         # Let's assume history_file is passed from main.py
         self.history_file = history_file
-        # transitions[prev_move][next_move] = count
-        self.transitions = {
-            "rock": {"rock": 0, "paper": 0, "scissors": 0},
-            "paper": {"rock": 0, "paper": 0, "scissors": 0},
-            "scissors": {"rock": 0, "paper": 0, "scissors": 0}
-        }
+        self.snapshot_file = snapshot_file or history_file + ".snapshot.npz"
+        self.order = order
+        self.use_outcomes = use_outcomes
+        # Highest order first, so predict_next_move can back off to shorter contexts
+        self.predictors = [NGramPredictor(k, use_outcomes) for k in range(order, 0, -1)]
         self.translation_map = {
             "Pedra": "rock",
             "Papel": "paper",
             "Tesoura": "scissors"
         }
+        self.outcome_map = {
+            "Vitória": "win",
+            "Empate": "draw",
+            "Derrota": "loss"
+        }
         self.last_player_move = None
         self.load_history()
 
@@ -30,54 +57,158 @@ class MarkovChainAI:
             return
         
         try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            prev_move = None
-            for line in lines:
+            offset = self.load_snapshot()
+            consumed = self.read_history(offset)
+            if consumed != offset:
+                self.save_snapshot(consumed)
+            logger.info(f"MarkovChainAI history loaded successfully ({consumed - offset} new bytes parsed).")
+        except Exception as e:
+            logger.error(f"Error loading history for AI: {e}")
+
+    def read_history(self, offset: int = 0) -> int:
+        """Learns from the complete lines after ``offset`` and returns the offset they end at.
+
+        A trailing line without a newline may still be being written, so it is
+        left for the next start. Binary histories (see utils.round_history) are
+        read through a memory map instead.
+        """
+        if is_binary_history(self.history_file):
+            return self.read_binary_history(offset)
+        
+        moves = []
+        outcomes = []
+        with open(self.history_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
                 if not line.strip():
                     continue
                 try:
-                    data = json.loads(line)
+                    data = json.loads(line.decode('utf-8'))
                     user_move_pt = data.get("usuario")
                     user_move = self.translation_map.get(user_move_pt)
                     
                     if user_move:
-                        if prev_move:
-                            self.transitions[prev_move][user_move] += 1
-                        prev_move = user_move
-                except json.JSONDecodeError:
+                        moves.append(MOVE_INDEX[user_move])
+                        outcome = self.outcome_map.get(data.get("resultado"), "draw")
+                        outcomes.append(OUTCOME_INDEX[outcome])
+                except (json.JSONDecodeError, UnicodeDecodeError):
                     continue
-            
-            logger.info("MarkovChainAI history loaded successfully.")
+        
+        for predictor in self.predictors:
+            predictor.fit(moves, outcomes)
+        if moves:
+            self.last_player_move = MOVES[moves[-1]]
+        return offset
+
+    def read_binary_history(self, offset: int = 0) -> int:
+        offset = max(offset, HEADER_SIZE)
+        records = RoundHistory(self.history_file).read(offset)
+        known = records["player"] != MOVE_CODES["unknown"]
+        moves = np.asarray(records["player"][known], dtype=np.int64)
+        outcomes = np.asarray(records["result"][known], dtype=np.int64)
+        for predictor in self.predictors:
+            predictor.fit(moves, outcomes)
+        if len(moves):
+            self.last_player_move = MOVES[moves[-1]]
+        return offset + len(records) * RECORD_DTYPE.itemsize
+
+    def history_fingerprint(self, offset: int) -> str:
+        """Hash of the first and last ``FINGERPRINT_BYTES`` of the history up to ``offset``."""
+        digest = hashlib.sha1()
+        with open(self.history_file, 'rb') as f:
+            digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+            tail_start = max(0, offset - FINGERPRINT_BYTES)
+            f.seek(tail_start)
+            digest.update(f.read(offset - tail_start))
+        return digest.hexdigest()
+
+    def load_snapshot(self) -> int:
+        """Restores the counts from the snapshot and returns the history offset it covers (0 if unusable)."""
+        if not os.path.exists(self.snapshot_file):
+            return 0
+        try:
+            with np.load(self.snapshot_file, allow_pickle=False) as data:
+                if (int(data["version"]) != SNAPSHOT_VERSION or int(data["order"]) != self.order
+                        or bool(data["use_outcomes"]) != self.use_outcomes):
+                    logger.info("AI snapshot was built with other settings, rebuilding from history.")
+                    return 0
+                offset = int(data["offset"])
+                history = os.stat(self.history_file)
+                if history.st_size < offset or int(data["inode"]) != history.st_ino:
+                    logger.info("History file was truncated or rotated, rebuilding AI snapshot.")
+                    return 0
+                if str(data["fingerprint"]) != self.history_fingerprint(offset):
+                    logger.info("History file content changed, rebuilding AI snapshot.")
+                    return 0
+                for predictor in self.predictors:
+                    k = predictor.order
+                    predictor.set_state({
+                        "counts": data[f"counts_{k}"], "context": data[f"context_{k}"], "filled": data[f"filled_{k}"]
+                    })
+                last_move = int(data["last_move"])
+                self.last_player_move = MOVES[last_move] if last_move >= 0 else None
+                return offset
         except Exception as e:
-            logger.error(f"Error loading history for AI: {e}")
+            logger.warning(f"Ignoring unreadable AI snapshot {self.snapshot_file}: {e}")
+            for predictor in self.predictors:
+                predictor.reset()
+            self.last_player_move = None
+            return 0
 
-    def update_history(self, new_move):
-        """Update the transition matrix with a new move during gameplay."""
-        if new_move not in ["rock", "paper", "scissors"]:
+    def save_snapshot(self, offset: int):
+        """Writes the counts covering the history up to ``offset``, atomically."""
+        arrays = {
+            "version": np.array(SNAPSHOT_VERSION),
+            "order": np.array(self.order),
+            "use_outcomes": np.array(self.use_outcomes),
+            "offset": np.array(offset),
+            "inode": np.array(os.stat(self.history_file).st_ino),
+            "fingerprint": np.array(self.history_fingerprint(offset)),
+            "last_move": np.array(MOVE_INDEX.get(self.last_player_move, -1)),
+        }
+        for predictor in self.predictors:
+            state = predictor.get_state()
+            for name in ("counts", "context", "filled"):
+                arrays[f"{name}_{predictor.order}"] = state[name]
+        
+        directory = os.path.dirname(os.path.abspath(self.snapshot_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.snapshot_file)
+        except OSError as e:
+            logger.warning(f"Could not save AI snapshot: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(predictor.nbytes for predictor in self.predictors)
+
+    def update_history(self, new_move, outcome=None):
+        """Update the move counts with a new move (and its ``win``/``draw``/``loss`` outcome) during gameplay."""
+        if new_move not in MOVE_INDEX:
             return
             
-        if self.last_player_move:
-            self.transitions[self.last_player_move][new_move] += 1
+        move = MOVE_INDEX[new_move]
+        outcome_index = OUTCOME_INDEX.get(outcome)
+        for predictor in self.predictors:
+            predictor.update(move, outcome_index)
             
         self.last_player_move = new_move
 
     def predict_next_move(self):
-        """Predicts what the player will play next based on their last move."""
-        if not self.last_player_move:
-            return random.choice(["rock", "paper", "scissors"])
-            
-        next_moves = self.transitions[self.last_player_move]
-        total_transitions = sum(next_moves.values())
-        
-        if total_transitions == 0:
-            return random.choice(["rock", "paper", "scissors"])
-            
-        # Find the move with the highest probability
-        predicted_move = max(next_moves, key=next_moves.get)
-        
-        return predicted_move
+        """Predicts what the player will play next based on their last moves."""
+        for predictor in self.predictors:
+            prediction = predictor.predict()
+            if prediction is not None:
+                return MOVES[prediction]
+                
+        return random.choice(["rock", "paper", "scissors"])
 
     def get_counter_move(self):
         """Returns the move that defeats the predicted player's move."""
@@ -0,0 +1,120 @@
+import numpy as np
+
+from controllers.ai_logic import MarkovChainAI
+from controllers.ngram_predictor import MOVES, MOVE_INDEX, OUTCOME_INDEX
+from models.game_models import Difficulty
+
+# PAYOFF[ai, player]: +1 when the AI move beats the player move, -1 when it loses
+PAYOFF = np.array([
+    [0, -1, 1],
+    [1, 0, -1],
+    [-1, 1, 0],
+], dtype=np.float64)
+
+# Move that beats each move: paper beats rock, scissors beat paper, rock beats scissors
+BEATS = np.array([1, 2, 0])
+
+# Predictors each difficulty consults, and how often it plays a random move instead.
+# Without wsls a deterministic reply is easy prey for a win-stay/lose-shift player,
+# so MEDIUM has it too and stays below HARD through more noise (see bench_ensemble)
+DIFFICULTY_LEVELS = {
+    Difficulty.EASY: (("frequency",), 0.4),
+    Difficulty.MEDIUM: (("frequency", "markov1", "wsls", "mirror"), 0.3),
+    Difficulty.HARD: (("frequency", "markov1", "markov2", "wsls", "mirror"), 0.1),
+    Difficulty.EXPERT: (("frequency", "markov1", "markov2", "markov3", "wsls", "mirror"), 0.0),
+}
+# Highest n-gram order any difficulty uses; the ensemble always builds at least these tables
+ENSEMBLE_ORDER = max(int(name[len("markov"):]) for names, _ in DIFFICULTY_LEVELS.values()
+                     for name in names if name.startswith("markov"))
+
+
+class EnsembleAI(MarkovChainAI):
+    """Several move predictors reweighted online, sized by difficulty.
+
+    Every predictor gives a probability row over the player's next move:
+    overall move frequency, the n-gram tables of MarkovChainAI for orders 1-3,
+    win-stay/lose-shift (repeat after a win, otherwise play what beats the AI's
+    last move) and mirror (copy the AI's last move). The rows form one matrix,
+    so the mixture, the best reply and the multiplicative-weights update
+    ``w *= exp(-eta * (1 - p[actual]))`` are each a single NumPy expression.
+    An ``order`` below ``ENSEMBLE_ORDER`` is raised to it so every difficulty
+    keeps its predictors.
+    """
+
+    def __init__(self, history_file="../historico.json", difficulty: Difficulty = Difficulty.MEDIUM,
+                 order: int = 3, use_outcomes: bool = False, snapshot_file: str = None,
+                 learning_rate: float = 0.5, smoothing: float = 0.1, seed: int = None):
+        order = max(order, ENSEMBLE_ORDER)
+        super().__init__(history_file, order=order, use_outcomes=use_outcomes, snapshot_file=snapshot_file)
+        self.names = ("frequency",) + tuple(f"markov{k}" for k in range(1, order + 1)) + ("wsls", "mirror")
+        self.learning_rate = learning_rate
+        self.smoothing = smoothing
+        self.rng = np.random.default_rng(seed)
+        self.weights = np.ones(len(self.names))
+        self.rows = np.zeros((len(self.names), len(MOVES)))
+        self.last_ai_move = None
+        self.last_outcome = None
+        # AI move of the round in progress; becomes last_ai_move once the player's move is counted
+        self.pending_ai_move = None
+        self.set_difficulty(difficulty)
+
+    def set_difficulty(self, difficulty: Difficulty):
+        names, noise = DIFFICULTY_LEVELS[difficulty]
+        unknown = set(names) - set(self.names)
+        if unknown:
+            raise ValueError(f"{difficulty.value} uses predictors this ensemble lacks: {sorted(unknown)}")
+        self.noise = noise
+        self.difficulty = difficulty
+        self.active = np.array([name in names for name in self.names])
+
+    def prediction_matrix(self) -> np.ndarray:
+        """``(n_predictors, 3)`` probabilities of the player's next move."""
+        rows = self.rows
+        rows.fill(0.0)
+        # predictors[0] is the highest order, so order k sits at index order - k
+        first_order = self.predictors[-1]
+        rows[0] = first_order.counts.sum(axis=0)
+        for k in range(1, self.order + 1):
+            predictor = self.predictors[self.order - k]
+            if predictor.filled >= predictor.order:
+                rows[k] = predictor.counts[predictor.context]
+        if self.last_player_move is not None and self.last_ai_move is not None:
+            player = MOVE_INDEX[self.last_player_move]
+            ai = MOVE_INDEX[self.last_ai_move]
+            rows[-2, player if self.last_outcome == "win" else BEATS[ai]] = 1.0
+            rows[-1, ai] = 1.0
+        rows += self.smoothing
+        rows /= rows.sum(axis=1, keepdims=True)
+        return rows
+
+    def mixture(self) -> np.ndarray:
+        weights = self.weights * self.active
+        return weights @ self.prediction_matrix() / weights.sum()
+
+    def predict_next_move(self):
+        return MOVES[int(np.argmax(self.mixture()))]
+
+    def get_counter_move(self):
+        """Best reply to the ensemble's prediction, or a random move with probability ``noise``."""
+        if self.noise and self.rng.random() < self.noise:
+            move = int(self.rng.integers(len(MOVES)))
+        else:
+            move = int(np.argmax(PAYOFF @ self.mixture()))
+        self.pending_ai_move = MOVES[move]
+        return self.pending_ai_move
+
+    def update_history(self, new_move, outcome=None):
+        if new_move not in MOVE_INDEX:
+            return
+        # Score every predictor on what it said before this move was counted
+        probabilities = self.prediction_matrix()[:, MOVE_INDEX[new_move]]
+        self.weights *= np.exp(-self.learning_rate * (1.0 - probabilities))
+        self.weights /= self.weights.max()
+        np.maximum(self.weights, 1e-6, out=self.weights)
+
+        super().update_history(new_move, outcome)
+        self.last_outcome = outcome if outcome in OUTCOME_INDEX else None
+        self.last_ai_move = self.pending_ai_move
+
+    def weight_report(self) -> dict:
+        return {name: float(w) for name, w, on in zip(self.names, self.weights, self.active) if on}
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Bump when the computation of existing features changes; new optional features get a schema flag instead
+FEATURE_SCHEMA_VERSION = 1
+NUM_LANDMARKS = 21
+
+# Landmark chains from the wrist to each fingertip (thumb, index, middle, ring, pinky)
+FINGERS = ((0, 1, 2, 3, 4), (0, 5, 6, 7, 8), (0, 9, 10, 11, 12), (0, 13, 14, 15, 16), (0, 17, 18, 19, 20))
+# (previous, joint, next) landmark of the three bending joints of every finger
+_ANGLE_PREV = np.array([chain[i - 1] for chain in FINGERS for i in (1, 2, 3)])
+_ANGLE_JOINT = np.array([chain[i] for chain in FINGERS for i in (1, 2, 3)])
+_ANGLE_NEXT = np.array([chain[i + 1] for chain in FINGERS for i in (1, 2, 3)])
+NUM_ANGLES = len(_ANGLE_JOINT)
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    """Which features a model was trained on; saved with the model and checked before inference.
+
+    The base 42 features are the (x, y) of every landmark relative to the
+    wrist, scaled by the largest wrist distance. ``use_z`` appends the 21
+    relative depths on the same scale and ``use_angles`` the 15 finger joint
+    angles (in 3D when z is used), divided by pi.
+    """
+    use_z: bool = False
+    use_angles: bool = False
+    version: int = FEATURE_SCHEMA_VERSION
+
+    @property
+    def dim(self) -> int:
+        return 2 * NUM_LANDMARKS + NUM_LANDMARKS * self.use_z + NUM_ANGLES * self.use_angles
+
+    def to_metadata(self) -> dict:
+        return {"version": self.version, "z": self.use_z, "angles": self.use_angles, "dim": self.dim}
+
+    @classmethod
+    def from_metadata(cls, metadata: dict) -> "FeatureSchema":
+        """Schema of a model's metadata sidecar; models saved without one use the base features."""
+        schema = metadata.get("feature_schema")
+        if schema is None:
+            return cls(version=metadata.get("schema_version", FEATURE_SCHEMA_VERSION))
+        return cls(use_z=bool(schema.get("z")), use_angles=bool(schema.get("angles")),
+                   version=schema.get("version", FEATURE_SCHEMA_VERSION))
+
+    def check(self, n_features: int = None):
+        """Raises ValueError if features computed by this code do not match the schema."""
+        if self.version != FEATURE_SCHEMA_VERSION:
+            raise ValueError(f"modelo treinado com features v{self.version}, esperado v{FEATURE_SCHEMA_VERSION}")
+        if n_features is not None and n_features != self.dim:
+            raise ValueError(f"modelo espera {n_features} features, o esquema gera {self.dim}")
+
+
+DEFAULT_SCHEMA = FeatureSchema()
+
+
+def hand_points(hands, dims: int = 3) -> np.ndarray:
+    """MediaPipe landmark lists to an (N, 21, dims) float64 array, filled in one pass without nested lists."""
+    if not hands:
+        return np.empty((0, NUM_LANDMARKS, dims))
+    values = (v for hand in hands for lm in hand.landmark for v in (lm.x, lm.y, lm.z)[:dims])
+    return np.fromiter(values, dtype=np.float64, count=len(hands) * NUM_LANDMARKS * dims).reshape(-1, NUM_LANDMARKS, dims)
+
+
+def featurize(points, schema: FeatureSchema = DEFAULT_SCHEMA) -> np.ndarray:
+    """(N, 21, 2|3) landmarks to (N, schema.dim) float32 features; a single (21, D) hand is accepted too."""
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    if points.shape[1:2] != (NUM_LANDMARKS,) or points.shape[2] not in (2, 3):
+        raise ValueError(f"expected (N, {NUM_LANDMARKS}, 2|3) landmarks, got {points.shape}")
+    if schema.use_z and points.shape[2] < 3:
+        raise ValueError("schema uses z but the landmarks have no depth")
+
+    n = len(points)
+    relative = points - points[:, :1, :]
+    xy = relative[:, :, :2]
+    # x*x + y*y as np.linalg.norm computes it, and sqrt is monotonic, so taking the root after the
+    # max still matches the old extract_features bit for bit
+    squared = np.square(xy)
+    scale = np.sqrt((squared[:, :, 0] + squared[:, :, 1]).max(axis=1))
+    if not scale.all():
+        scale[scale == 0] = 1.0
+
+    features = np.empty((n, schema.dim), dtype=np.float32)
+    if schema.dim == 2 * NUM_LANDMARKS:
+        # Divided straight into the float32 output, rounded exactly like an assignment
+        np.divide(xy, scale[:, None, None], out=features.reshape(n, NUM_LANDMARKS, 2), casting="same_kind")
+    else:
+        features[:, :2 * NUM_LANDMARKS] = (xy / scale[:, None, None]).reshape(n, -1)
+    column = 2 * NUM_LANDMARKS
+    if schema.use_z:
+        features[:, column:column + NUM_LANDMARKS] = relative[:, :, 2] / scale[:, None]
+        column += NUM_LANDMARKS
+    if schema.use_angles:
+        vectors = relative if schema.use_z else xy
+        a = vectors[:, _ANGLE_PREV] - vectors[:, _ANGLE_JOINT]
+        b = vectors[:, _ANGLE_NEXT] - vectors[:, _ANGLE_JOINT]
+        norms = np.linalg.norm(a, axis=2) * np.linalg.norm(b, axis=2)
+        norms[norms == 0] = 1.0
+        cosine = np.einsum("nkd,nkd->nk", a, b) / norms
+        features[:, column:column + NUM_ANGLES] = np.arccos(np.clip(cosine, -1.0, 1.0)) / np.pi
+    return features
@@ -0,0 +1,145 @@
+import os
+import argparse
+import numpy as np
+
+from utils.logger import setup_logging
+
+logger = setup_logging()
+
+FOREST_ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "leaf_proba", "roots", "classes", "max_depth")
+# Saved alongside the arrays; files compiled before it was added load without it
+OPTIONAL_ARRAYS = ("n_features_in",)
+
+
+class CompiledForest:
+    """RandomForestClassifier flattened into contiguous NumPy arrays.
+
+    All trees share one node table. Leaves point to themselves, so every sample
+    can be walked ``max_depth`` steps in lockstep without branching per tree.
+    Results match sklearn's ``predict``/``predict_proba`` bit for bit.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, leaf_proba, roots, classes, max_depth,
+                 n_features_in=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.n_estimators = len(roots)
+        # Checked against the feature schema when the model is loaded, as for sklearn models
+        self.n_features_in_ = int(n_features_in) if n_features_in is not None else None
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        features, thresholds, lefts, rights, missing, probas, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+
+            feature = tree.feature.astype(np.int64)
+            feature[is_leaf] = 0
+            left = np.where(is_leaf, node_ids, tree.children_left + offset)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset)
+            mgl = getattr(tree, "missing_go_to_left", None)
+            if mgl is None:
+                mgl = np.zeros(n_nodes, dtype=bool)
+
+            # Classification trees store each leaf's class fractions, which predict_proba returns as is
+            proba = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+
+            features.append(feature)
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(left)
+            rights.append(right)
+            missing.append(np.asarray(mgl, dtype=bool))
+            probas.append(proba)
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            np.ascontiguousarray(np.concatenate(features)),
+            np.ascontiguousarray(np.concatenate(thresholds)),
+            np.ascontiguousarray(np.concatenate(lefts)),
+            np.ascontiguousarray(np.concatenate(rights)),
+            np.ascontiguousarray(np.concatenate(missing)),
+            np.ascontiguousarray(np.concatenate(probas)),
+            np.array(roots, dtype=np.int64),
+            np.asarray(forest.classes_),
+            max_depth,
+            forest.n_features_in_,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledForest":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(*(data[name] for name in FOREST_ARRAYS),
+                       **{name: data[name] for name in OPTIONAL_ARRAYS if name in data.files})
+
+    def save(self, path: str):
+        np.savez(
+            path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            missing_left=self.missing_left, leaf_proba=self.leaf_proba, roots=self.roots,
+            # String labels are object arrays in sklearn, which np.load cannot read without pickle
+            classes=self.classes_.astype(str) if self.classes_.dtype == object else self.classes_,
+            max_depth=np.array(self.max_depth),
+            **({"n_features_in": np.array(self.n_features_in_)} if self.n_features_in_ is not None else {})
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right,
+                                      self.missing_left, self.leaf_proba, self.roots, self.classes_))
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf index reached in every tree, shape (n_trees, n_samples)."""
+        # sklearn evaluates trees on float32 input
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        rows = np.arange(X.shape[0])[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            go_left |= np.isnan(values) & self.missing_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        per_tree = self.leaf_proba[self.apply(X)]
+        # Accumulate tree by tree like sklearn does so the sums round identically
+        proba = np.cumsum(per_tree, axis=0)[-1]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def export_forest(forest, path: str) -> CompiledForest:
+    compiled = CompiledForest.from_sklearn(forest)
+    compiled.save(path)
+    logger.info(f"Compiled forest saved to {path} ({compiled.n_estimators} trees, {compiled.nbytes} bytes)")
+    return compiled
+
+
+def compiled_path_for(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+if __name__ == "__main__":
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Exporta um RandomForest salvo com joblib para o formato compilado (.npz)")
+    parser.add_argument("model", help="Caminho do gesture_model.pkl")
+    parser.add_argument("--output", help="Destino (padrão: mesmo nome com extensão .npz)")
+    args = parser.parse_args()
+    export_forest(joblib.load(args.model), args.output or compiled_path_for(args.model))
@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+from utils.logger import setup_logging
+
+logger = setup_logging()
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FrameSource:
+    """Base class for everything GestureDetector and train_model can read frames from.
+
+    ``live`` sources (cameras) produce frames whether or not we keep up, so stale
+    frames may be dropped. Recorded sources are consumed frame by frame and can
+    run unthrottled, faster than real time.
+    """
+    live = False
+
+    def open(self) -> bool:
+        raise NotImplementedError
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        raise NotImplementedError
+
+    def recorded_hands(self):
+        """Landmarks recorded for the frame just read, or None if the frame must go through MediaPipe."""
+        return None
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    live = True
+
+    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480, fps: int = 30):
+        self.camera_index = camera_index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.cap = None
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.camera_index)
+        if not self.cap.isOpened():
+            logger.error(f"Failed to open camera {self.camera_index}")
+            return False
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue short; stale frames are dropped by our own buffer
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return True
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+
+class _PacedSource(FrameSource):
+    """Recorded source that can optionally replay at its native frame rate."""
+
+    def __init__(self, fps: float = 30.0, realtime: bool = False):
+        self.fps = fps
+        self.realtime = realtime
+        self._next_frame_time = None
+
+    def _pace(self):
+        if not self.realtime or self.fps <= 0:
+            return
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        remaining = self._next_frame_time - now
+        if remaining > 0:
+            time.sleep(remaining)
+        self._next_frame_time += 1.0 / self.fps
+
+
+class VideoFileSource(_PacedSource):
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        super().__init__(realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.cap = None
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            logger.error(f"Failed to open video {self.path}")
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+
+    def read(self):
+        self._pace()
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirectorySource(_PacedSource):
+    def __init__(self, path: str, fps: float = 30.0, realtime: bool = False, loop: bool = False):
+        super().__init__(fps=fps, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.files: List[str] = []
+        self.position = 0
+
+    def open(self) -> bool:
+        if not os.path.isdir(self.path):
+            logger.error(f"Image directory not found: {self.path}")
+            return False
+        self.files = sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.position = 0
+        return bool(self.files)
+
+    def read(self):
+        self._pace()
+        if self.position >= len(self.files):
+            if not self.loop or not self.files:
+                return False, None
+            self.position = 0
+        frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+
+def make_landmark_list(points):
+    """Builds a MediaPipe NormalizedLandmarkList from (21, 3) coordinates."""
+    from mediapipe.framework.formats import landmark_pb2
+
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        landmark_list.landmark.add(x=float(x), y=float(y), z=float(z))
+    return landmark_list
+
+
+class RecordedHandResults:
+    """Mirrors the fields of a MediaPipe Hands result that the detector reads."""
+
+    def __init__(self, multi_hand_landmarks, multi_handedness):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+class LandmarkStreamSource(_PacedSource):
+    """Replays a JSONL landmark dump (see LandmarkRecorder) without running MediaPipe.
+
+    Each line is ``{"t": seconds, "hands": [{"handedness": "Right", "score": 0.9,
+    "landmarks": [[x, y, z], ...]}]}`` with coordinates normalized to the frame.
+    """
+
+    def __init__(self, path: str, fps: float = 30.0, realtime: bool = False,
+                 frame_size: Tuple[int, int] = (640, 480), loop: bool = False):
+        super().__init__(fps=fps, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.frame_size = frame_size
+        self.records = []
+        self.position = 0
+        self._current = None
+        self._blank = None
+
+    def open(self) -> bool:
+        if not os.path.exists(self.path):
+            logger.error(f"Landmark stream not found: {self.path}")
+            return False
+        self.records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.records.append(self._to_results(json.loads(line)))
+        width, height = self.frame_size
+        self._blank = np.zeros((height, width, 3), dtype=np.uint8)
+        self.position = 0
+        return bool(self.records)
+
+    @staticmethod
+    def _to_results(record):
+        from mediapipe.framework.formats import classification_pb2
+
+        hands = record.get("hands", [])
+        if not hands:
+            return RecordedHandResults(None, None)
+
+        landmark_lists = []
+        handedness = []
+        for hand in hands:
+            landmark_lists.append(make_landmark_list(hand["landmarks"]))
+
+            classification = classification_pb2.ClassificationList()
+            classification.classification.add(
+                label=hand.get("handedness", "Right"), score=hand.get("score", 1.0)
+            )
+            handedness.append(classification)
+        return RecordedHandResults(landmark_lists, handedness)
+
+    def read(self):
+        self._pace()
+        if self.position >= len(self.records):
+            if not self.loop or not self.records:
+                self._current = None
+                return False, None
+            self.position = 0
+        self._current = self.records[self.position]
+        self.position += 1
+        return True, self._blank.copy()
+
+    def recorded_hands(self):
+        return self._current
+
+
+class LandmarkRecorder:
+    """Writes MediaPipe results as a JSONL stream readable by LandmarkStreamSource.
+
+    ``write`` optionally tags a frame with the gesture it shows (the ``label``
+    field the benchmarks and ``train_model.py --sequence`` read).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.start_time = time.perf_counter()
+
+    def write(self, results, label: str = None):
+        hands = []
+        if results.multi_hand_landmarks:
+            handedness = results.multi_handedness or []
+            for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                entry = {"landmarks": [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]}
+                if i < len(handedness):
+                    entry["handedness"] = handedness[i].classification[0].label
+                    entry["score"] = handedness[i].classification[0].score
+                hands.append(entry)
+        record = {"t": round(time.perf_counter() - self.start_time, 4), "hands": hands}
+        if label is not None:
+            record["label"] = label
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def create_source(spec, realtime: bool = False, loop: bool = False) -> FrameSource:
+    """Builds a source from a camera index, image directory, ``.jsonl`` landmark dump or video path."""
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop)
+    if spec.lower().endswith(".jsonl"):
+        return LandmarkStreamSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
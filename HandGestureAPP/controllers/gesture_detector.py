@@ -1,54 +1,148 @@
-import os
 import time
-import joblib
+import threading
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import Tuple
+from collections import deque
+from typing import List, Tuple
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from utils.logger import setup_logging
+from utils.frame_buffer import LatestFrameBuffer
+from utils.stage_profiler import StageProfiler
+from utils.display_buffer import DisplayBuffer
+from controllers.featurizer import DEFAULT_SCHEMA, featurize, hand_points
+from controllers.frame_sources import FrameSource, CameraSource, RecordedHandResults, make_landmark_list
+from controllers.model_registry import ModelRegistry
+from controllers.roi_tracker import HandROITracker
+from controllers.adaptive_controller import AdaptiveInferenceController
+from controllers.gesture_filter import GestureVoter
+from controllers.sequence_classifier import DEFAULT_SEQUENCE_MODEL_PATH, SequenceClassifier, SequenceVoter
+from controllers.hand_tracker import HandTracker
 from models.game_models import GameSettings, Gesture
 
 logger = setup_logging()
 
+FINGER_TIPS = [4, 8, 12, 16, 20]
+FINGER_PIPS = [3, 6, 10, 14, 18]
+# Finger count shown for a gesture emitted before the hand matches it (see classify_sequences)
+GESTURE_FINGERS = {Gesture.ROCK.value: 0, Gesture.SCISSORS.value: 2, Gesture.PAPER.value: 5}
+
+
+def count_extended_fingers(points: np.ndarray) -> np.ndarray:
+    """Extended fingers of each (21, 2+) hand in ``points``, by the same test as ``rule_based_classify``."""
+    extended = (points[:, FINGER_TIPS[1:], 1] < points[:, FINGER_PIPS[1:], 1]).sum(axis=1)
+    wrist_x = points[:, 0, 0]
+    thumb = np.abs(points[:, 4, 0] - wrist_x) > np.abs(points[:, 3, 0] - wrist_x) * 1.5
+    return extended + thumb
+
+
+def fingers_gesture(finger_count: int) -> str:
+    """Gesture ``rule_based_classify`` reads from a number of extended fingers."""
+    if finger_count <= 1:
+        return Gesture.ROCK.value
+    if finger_count <= 3:
+        return Gesture.SCISSORS.value
+    return Gesture.PAPER.value
+
+
 class GestureDetector(QThread):
-    gesture_detected = pyqtSignal(str, float, int)
+    # gesture, confidence, finger_count, onset_ts, capture_ts (time.perf_counter clock)
+    gesture_detected = pyqtSignal(str, float, int, float, float)
     frame_processed = pyqtSignal(np.ndarray)
+    display_ready = pyqtSignal()
+    player_gesture_detected = pyqtSignal(int, str, float, int, float, float)
+    latency_stats = pyqtSignal(dict)
+    stage_timings = pyqtSignal(dict)
     
-    def __init__(self, settings: GameSettings):
+    def __init__(self, settings: GameSettings, source: FrameSource = None, throttle: bool = None):
         super().__init__()
         self.settings = settings
         self.running = False
-        self.cap = None
+        self.source = source
+        # Recorded sources run unthrottled unless asked otherwise
+        self.throttle = throttle
+        self.capture_thread = None
+        self.frame_buffer = LatestFrameBuffer(settings.frame_buffer_size)
+        self.frames_processed = 0
+        self.display_buffer = DisplayBuffer()
+        self.last_display = 0.0
+        self.frame_ages = deque(maxlen=120)
         self.mp_hands = mp.solutions.hands
         self.hands = None
+        # Separate tracking state for ROI crops; see HandROITracker
+        self.roi_hands = None
         self.mp_draw = mp.solutions.drawing_utils
-        self.gesture_history = []
-        self.model = None
-        try:
-            model_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gesture_model.pkl")
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
-                logger.info("Modelo ML carregado com sucesso!")
-        except Exception as e:
-            logger.error(f"Erro ao carregar modelo ML: {e}")
+        self.profiler = StageProfiler() if settings.profiling_enabled else None
+        self.timing_report = {}
+        self.controller = None
+        # (timestamp, [(21, 3) arrays]) of the last inferred frames, used to extrapolate skipped ones
+        self.landmark_track = deque(maxlen=2)
+        if settings.adaptive_inference:
+            budget_ms = settings.latency_budget_ms or 1000.0 / max(1, settings.target_fps)
+            self.controller = AdaptiveInferenceController(budget_ms)
+        self.roi_tracker = None
+        if settings.roi_tracking:
+            self.roi_tracker = HandROITracker(
+                margin=settings.roi_margin,
+                input_size=settings.roi_input_size,
+                refresh_interval=settings.roi_refresh_interval
+            )
+        # Set after the fallback voter is built, so only hand tracks get windowed voters
+        self.sequence_model = None
+        self.voter = self.create_voter()
+        self.hand_tracker = HandTracker(self.create_voter)
+        if settings.sequence_classifier and settings.use_ml_model:
+            self.sequence_model = self.load_sequence_model()
+        # Whether the current hand tracks hold SequenceVoters
+        self._sequence_tracks = self.sequence_active
+        # Hands waiting for a batched ML pass when classifying over a window of frames
+        self.pending_hands = []
+        self.pending_frames = 0
+        self.model_registry = ModelRegistry.instance()
+        self.model_registry.load_async()
+        self._model = None
+        self._model_generation = None
+        # A model assigned directly (benchmarks, tests) is kept instead of the registry's
+        self._model_pinned = False
+        self.feature_schema = DEFAULT_SCHEMA
+        
+    @property
+    def sequence_active(self) -> bool:
+        # The sequence classifier is an ML model too; "use_ml_model" off means rules and voting
+        return self.sequence_model is not None and self.settings.use_ml_model
+        
+    @property
+    def model(self):
+        # Shared model from the registry; None (rule-based path) while it is still loading
+        if not self.settings.use_ml_model:
+            return None
+        if self._model_pinned:
+            return self._model
+        registry = self.model_registry
+        registry.check_for_update()
+        if self._model is None or self._model_generation != registry.generation:
+            self._model_generation = registry.generation
+            self._model, self.feature_schema = registry.get_model_and_schema()
+        return self._model
+        
+    @model.setter
+    def model(self, value):
+        self._model = value
+        self._model_pinned = value is not None
         
     def initialize_camera(self):
         try:
-            self.cap = cv2.VideoCapture(self.settings.camera_index)
-            if not self.cap.isOpened():
-                logger.error(f"Failed to open camera {self.settings.camera_index}")
+            if self.source is None:
+                self.source = CameraSource(self.settings.camera_index)
+            if not self.source.open():
                 return False
-                        
-            if self.cap.isOpened():
-                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                self.cap.set(cv2.CAP_PROP_FPS, 30)
-                logger.info("Camera initialized successfully")
-                return True
+            if self.throttle is None:
+                self.throttle = self.source.live
+            logger.info("Frame source initialized successfully")
+            return True
         except Exception as e:
-            logger.error(f"Camera initialization failed: {e}")
+            logger.error(f"Frame source initialization failed: {e}")
         return False
         
     def start_detection(self):
@@ -56,68 +150,302 @@ class GestureDetector(QThread):
             logger.error("Failed to start detection due to camera error")
             return False
             
-        self.hands = self.mp_hands.Hands(
+        if self.hands is None:
+            self.open_hands(self.controller.complexity if self.controller else 1)
+        
+        self.running = True
+        self.frame_buffer.reset()
+        self.capture_thread = threading.Thread(target=self.capture_loop, name="FrameCapture", daemon=True)
+        self.capture_thread.start()
+        self.start()
+        logger.info("Gesture detection started")
+        return True
+        
+    def create_hands(self, model_complexity: int = 1):
+        return self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=2,
+            model_complexity=model_complexity,
             min_detection_confidence=self.settings.detection_confidence,
             min_tracking_confidence=self.settings.tracking_confidence
         )
         
-        self.running = True
-        self.start()
-        logger.info("Gesture detection started")
-        return True
+    def open_hands(self, model_complexity: int = 1):
+        self.close_hands()
+        self.hands = self.create_hands(model_complexity)
+        if self.roi_tracker is not None:
+            self.roi_hands = self.create_hands(model_complexity)
+            self.roi_tracker.reset()
+            
+    def close_hands(self):
+        for hands in (self.hands, self.roi_hands):
+            if hands:
+                hands.close()
+        self.hands = None
+        self.roi_hands = None
         
     def stop_detection(self):
         self.running = False
+        self.frame_buffer.close()
         if self.isRunning():
             self.quit()
             self.wait()
-        if self.cap:
-            self.cap.release()
-        if self.hands:
-            self.hands.close()
+        if self.capture_thread:
+            self.capture_thread.join(timeout=2.0)
+            self.capture_thread = None
+        if self.profiler and self.settings.profiling_export_path:
+            try:
+                self.profiler.export(self.settings.profiling_export_path)
+                logger.info(f"Stage timings exported to {self.settings.profiling_export_path}")
+            except OSError as e:
+                logger.error(f"Failed to export stage timings: {e}")
+        if self.source:
+            self.source.release()
+        self.close_hands()
         logger.info("Gesture detection stopped")
             
-    def run(self):
+    def capture_loop(self):
+        live = self.source.live
+        profiler = self.profiler
         while self.running:
-            ret, frame = self.cap.read()
+            read_start = time.perf_counter()
+            ret, frame = self.source.read()
+            capture_ts = time.perf_counter()
+            if profiler:
+                profiler.record("capture", capture_ts - read_start)
             if not ret:
+                if not live:
+                    # End of a recorded stream: let the inference loop drain and finish
+                    self.frame_buffer.close()
+                    return
                 logger.warning("Failed to capture frame")
+                time.sleep(0.01)
+                continue
+            self.frame_buffer.put(frame, capture_ts, self.source.recorded_hands(), block=not live)
+            
+    def run(self):
+        frame_interval = 1.0 / max(1, self.settings.target_fps)
+        next_deadline = time.perf_counter()
+        last_report = next_deadline
+        take_frame = self.frame_buffer.get_latest if self.source.live else self.frame_buffer.get_next
+        
+        while self.running:
+            item = take_frame(timeout=0.5)
+            if item is None:
+                if self.frame_buffer.closed:
+                    break
+                continue
+            frame, capture_ts, _, hands = item
+            
+            self.process_frame(frame, hands, capture_ts)
+            
+            now = time.perf_counter()
+            self.frames_processed += 1
+            self.frame_ages.append((now - capture_ts) * 1000.0)
+            
+            if now - last_report >= 1.0:
+                self.latency_stats.emit(self.get_latency_stats())
+                if self.profiler:
+                    self.timing_report = self.profiler.percentiles()
+                    self.stage_timings.emit(self.timing_report)
+                last_report = now
+            
+            if not self.throttle:
                 continue
+            # Sleep only for what is left of the frame budget after processing
+            next_deadline += frame_interval
+            remaining = next_deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                next_deadline = time.perf_counter()
                 
+    def process_frame(self, frame, results=None, capture_ts: float = None):
+        prof = self.profiler
+        if prof:
+            prof.start()
+        frame_start = time.perf_counter()
+        if capture_ts is None:
+            capture_ts = frame_start
+        inferred = True
+        inference_ms = 0.0
+        if results is None:
             frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
-            
+            if prof:
+                prof.lap("flip")
+            if self.controller is None or self.controller.should_infer():
+                inference_start = time.perf_counter()
+                results = self.detect_hands(frame)
+                inference_ms = (time.perf_counter() - inference_start) * 1000.0
+            else:
+                inferred = False
+                results = self.extrapolate_hands(frame_start)
+        
+        if results.multi_hand_landmarks and self.settings.show_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                self.mp_draw.draw_landmarks(
+                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
+                )
+            if prof:
+                prof.lap("draw")
+        
+        # Skipped frames only show the extrapolated hands; they carry no new evidence to classify
+        if inferred:
+            if self.controller is not None:
+                self.remember_landmarks(results, frame_start)
+            if self.sequence_active != self._sequence_tracks:
+                # The mode changed at runtime; tracks are rebuilt with the matching voter
+                self._sequence_tracks = self.sequence_active
+                self.hand_tracker = HandTracker(self.create_voter)
+                self.pending_hands = []
             if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    if self.settings.show_landmarks:
-                        self.mp_draw.draw_landmarks(
-                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                        )
-                    
-                    gesture, confidence, finger_count = self.rule_based_classify(hand_landmarks)
-                    logger.debug(f"Detected gesture: {gesture}, confidence: {confidence}, fingers: {finger_count}")
-                    self.filter_gesture(gesture, confidence, finger_count)
-                    
+                tracks = self.hand_tracker.assign(
+                    results.multi_hand_landmarks, results.multi_handedness, capture_ts
+                )
+                self.pending_hands.extend(
+                    (hand, track, capture_ts) for hand, track in zip(results.multi_hand_landmarks, tracks)
+                )
+            else:
+                self.hand_tracker.expire(capture_ts)
+            self.pending_frames += 1
+        
+        if self.pending_frames >= max(1, self.settings.ml_batch_frames):
+            pending = self.pending_hands
+            self.pending_hands = []
+            self.pending_frames = 0
+            if self.sequence_active:
+                self.classify_sequences(pending)
+                if prof:
+                    prof.lap("classify")
+            else:
+                classified = self.classify_hands([hand for hand, _, _ in pending])
+                if prof:
+                    prof.lap("classify")
+                for (_, track, timestamp), (gesture, confidence, finger_count) in zip(pending, classified):
+                    logger.debug(f"Detected gesture: {gesture}, confidence: {confidence}, fingers: {finger_count}, track: {track.track_id}")
+                    self.filter_gesture(gesture, confidence, finger_count, timestamp, track)
+                if prof:
+                    prof.lap("filter")
+        
+        if self.controller is not None and inferred and inference_ms > 0:
+            frame_ms = (time.perf_counter() - frame_start) * 1000.0
+            if self.controller.record(frame_ms, inference_ms):
+                self.open_hands(self.controller.complexity)
+        
+        if prof and self.settings.profiling_overlay and self.timing_report:
+            StageProfiler.draw_overlay(frame, self.timing_report)
+                
+        self.publish_frame(frame)
+        if prof:
+            prof.lap("emit")
+            prof.finish()
+        
+    def publish_frame(self, frame):
+        # Full-size frames are only emitted if someone still listens for them
+        if self.receivers(self.frame_processed) > 0:
             self.frame_processed.emit(frame)
-            self.msleep(33)
-            
-    def extract_features(self, landmarks):
-        points = np.array([[lm.x, lm.y] for lm in landmarks.landmark])
-        base = points[0]
-        points = points - base
-        max_dist = np.max(np.linalg.norm(points, axis=1))
-        if max_dist > 0:
-            points = points / max_dist
-        return points.flatten().tolist()
-            
-    def rule_based_classify(self, landmarks) -> Tuple[str, float, int]:
+        # Display frames are capped to their own rate, independent of inference
+        now = time.perf_counter()
+        if now - self.last_display < 1.0 / max(1, self.settings.display_fps):
+            return
+        self.last_display = now
+        self.display_buffer.write(frame)
+        self.display_ready.emit()
+        
+    def set_display_size(self, width: int, height: int):
+        """Size of the widget showing the feed; frames are resized to fit it on the worker."""
+        self.display_buffer.set_target_size(width, height)
+        
+    def remember_landmarks(self, results, timestamp: float):
+        hands = []
+        if results.multi_hand_landmarks:
+            hands = [np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark])
+                     for hand in results.multi_hand_landmarks]
+        self.landmark_track.append((timestamp, hands))
+        
+    def extrapolate_hands(self, timestamp: float):
+        """Predicts landmarks for a skipped frame from the last two inferred frames."""
+        if not self.landmark_track or not self.landmark_track[-1][1]:
+            return RecordedHandResults(None, None)
+        last_time, last_hands = self.landmark_track[-1]
+        hands = last_hands
+        if len(self.landmark_track) == 2:
+            prev_time, prev_hands = self.landmark_track[0]
+            if len(prev_hands) == len(last_hands) and last_time > prev_time:
+                alpha = (timestamp - last_time) / (last_time - prev_time)
+                hands = [last + (last - prev) * alpha for last, prev in zip(last_hands, prev_hands)]
+        return RecordedHandResults([make_landmark_list(points) for points in hands], None)
+        
+    def get_adaptive_stats(self) -> dict:
+        """Budget, current complexity/skip level and the controller's recent decisions (empty when disabled)."""
+        return self.controller.stats() if self.controller is not None else {}
+        
+    def detect_hands(self, frame):
+        prof = self.profiler
+        if self.roi_tracker is not None:
+            # Crop, conversion and inference are timed together in ROI mode
+            results = self.roi_tracker.process(frame, self.hands.process, self.roi_hands.process)
+            if prof:
+                prof.lap("inference")
+            return results
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if prof:
+            prof.lap("convert")
+        results = self.hands.process(rgb_frame)
+        if prof:
+            prof.lap("inference")
+        return results
+        
+    def get_stage_timings(self) -> dict:
+        """Rolling p50/p95/p99 per detection stage (empty when profiling is disabled)."""
+        return self.profiler.percentiles() if self.profiler else {}
+        
+    def get_roi_stats(self) -> dict:
+        """Per-frame inference cost and re-detection rate of the ROI tracker (empty when disabled)."""
+        return self.roi_tracker.stats() if self.roi_tracker is not None else {}
+        
+    def get_latency_stats(self) -> dict:
+        """Frames dropped before inference and age (capture -> processed) of recent frames."""
+        ages = list(self.frame_ages)
+        return {
+            "frames_captured": self.frame_buffer.written,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frame_buffer.dropped,
+            "last_frame_age_ms": ages[-1] if ages else 0.0,
+            "avg_frame_age_ms": float(np.mean(ages)) if ages else 0.0,
+            "max_frame_age_ms": max(ages) if ages else 0.0,
+            "roi": self.get_roi_stats(),
+            "adaptive": self.get_adaptive_stats(),
+        }
+            
+    def extract_features(self, landmarks) -> np.ndarray:
+        return featurize(hand_points([landmarks]), self.feature_schema)[0]
+        
+    def extract_features_batch(self, hands) -> np.ndarray:
+        """Features of several hands as one (N, F) array, in the schema of the loaded model."""
+        return featurize(hand_points(hands), self.feature_schema)
+        
+    def classify_features(self, features: np.ndarray) -> np.ndarray:
+        """Classifies a batch of feature rows with a single predict call."""
+        return self.model.predict(features)
+        
+    def classify_hands(self, hands) -> List[Tuple[str, float, int]]:
+        """Classifies all hands in one ML pass, falling back to the rules per hand."""
+        if not hands:
+            return []
         if self.model is not None:
+            try:
+                gestures = self.classify_features(self.extract_features_batch(hands))
+                return [(str(gesture), 1.0, 0) for gesture in gestures]
+            except Exception as e:
+                logger.error(f"ML classification error: {e}")
+        return [self.rule_based_classify(hand, use_model=False) for hand in hands]
+            
+    def rule_based_classify(self, landmarks, use_model: bool = True) -> Tuple[str, float, int]:
+        if use_model and self.model is not None:
             try:
                 features = self.extract_features(landmarks)
-                gesture = self.model.predict([features])[0]
+                gesture = self.model.predict(features[np.newaxis])[0]
                 return gesture, 1.0, 0
             except Exception as e:
                 logger.error(f"ML classification error: {e}")
@@ -125,14 +453,11 @@ class GestureDetector(QThread):
         try:
             points = np.array([[lm.x, lm.y] for lm in landmarks.landmark])
             
-            finger_tips = [4, 8, 12, 16, 20]
-            finger_pips = [3, 6, 10, 14, 18]
-            
             extended_fingers = 0
             
             for i in range(1, 5):
-                tip_y = points[finger_tips[i]][1]
-                pip_y = points[finger_pips[i]][1]
+                tip_y = points[FINGER_TIPS[i]][1]
+                pip_y = points[FINGER_PIPS[i]][1]
                 if tip_y < pip_y:
                     extended_fingers += 1
                 logger.debug(f"Finger {i}: tip_y={tip_y:.3f}, pip_y={pip_y:.3f}, extended={tip_y < pip_y}")
@@ -160,15 +485,75 @@ class GestureDetector(QThread):
             logger.error(f"Rule-based classification error: {e}")
             return Gesture.UNKNOWN.value, 0.0, 0
             
-    def filter_gesture(self, gesture: str, confidence: float, finger_count: int):
-        self.gesture_history.append((gesture, confidence, time.time(), finger_count))
+    def load_sequence_model(self):
+        path = self.settings.sequence_model_path or DEFAULT_SEQUENCE_MODEL_PATH
+        try:
+            model = SequenceClassifier.load(path)
+            logger.info(f"Sequence classifier loaded from {path} (window {model.window})")
+            return model
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Sequence classifier unavailable ({e}); using frame-by-frame voting")
+            return None
+        
+    def classify_sequences(self, pending):
+        """Adds each hand to its track's window and scores all windows in one matrix product."""
+        if not pending:
+            return
+        model = self.sequence_model
+        points = hand_points([hand for hand, _, _ in pending])
+        features = featurize(points, model.schema)
+        fingers = count_extended_fingers(points)
+        windows = np.stack([track.voter.push(row, timestamp)
+                            for (_, track, timestamp), row in zip(pending, features)])
+        for (_, track, timestamp), proba, finger_count in zip(pending, model.predict_proba(windows), fingers):
+            # A gesture can be emitted while the hand is still forming it; the count is only
+            # reported when the frame agrees with the gesture, otherwise the gesture's own count
+            gesture = str(model.classes_[int(np.argmax(proba))])
+            finger_count = int(finger_count)
+            if fingers_gesture(finger_count) != gesture:
+                finger_count = GESTURE_FINGERS.get(gesture, 0)
+            stable = track.voter.update(proba, model.classes_, timestamp, finger_count)
+            self.emit_stable(track.voter, stable, timestamp, track)
         
-        current_time = time.time()
-        self.gesture_history = [(g, c, t, f) for g, c, t, f in self.gesture_history 
-                               if current_time - t < 1.0]
+    def create_voter(self):
+        if self.sequence_active:
+            return SequenceVoter(
+                self.sequence_model.window,
+                self.sequence_model.coef.shape[1] // 3,
+                threshold=self.settings.sequence_threshold,
+                heartbeat_s=self.settings.vote_heartbeat_s
+            )
+        return GestureVoter(
+            window=self.settings.vote_window,
+            min_votes=self.settings.vote_min_count,
+            heartbeat_s=self.settings.vote_heartbeat_s
+        )
+        
+    def filter_gesture(self, gesture: str, confidence: float, finger_count: int, timestamp: float = None,
+                       track=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        voter = track.voter if track is not None else self.voter
+        self.emit_stable(voter, voter.add(gesture, confidence, finger_count, timestamp), timestamp, track)
+        
+    def emit_stable(self, voter, stable, timestamp: float, track=None):
+        if stable is None:
+            return
+        gesture, confidence, finger_count = stable
+        onset = voter.stable_onset if voter.stable_onset is not None else timestamp
+        if track is not None:
+            self.player_gesture_detected.emit(track.player, gesture, confidence, finger_count, onset, timestamp)
+            # Single-player consumers follow the longest-lived hand only
+            if track is not self.hand_tracker.primary():
+                return
+        self.gesture_detected.emit(gesture, confidence, finger_count, onset, timestamp)
+        logger.info(f"Stable gesture emitted: {gesture}, confidence: {confidence}, fingers: {finger_count}")
+            
+    def current_gesture(self):
+        """The currently stable ``(gesture, confidence, finger_count)`` of the primary hand, or None."""
+        primary = self.hand_tracker.primary()
+        return primary.voter.stable if primary is not None else self.voter.stable
         
-        if len(self.gesture_history) >= 3:
-            recent_gestures = [g for g, c, t, f in self.gesture_history[-5:]]
-            if recent_gestures.count(gesture) >= 3 and confidence > 0.7:
-                self.gesture_detected.emit(gesture, confidence, finger_count)
-                logger.info(f"Stable gesture emitted: {gesture}, confidence: {confidence}, fingers: {finger_count}")
+    def current_player_gestures(self) -> dict:
+        """Stable ``(gesture, confidence, finger_count)`` per player number."""
+        return self.hand_tracker.stable_gestures()
@@ -0,0 +1,107 @@
+from collections import deque
+from typing import Optional, Tuple
+
+# Share comparisons tolerate the float residue of the running weight totals
+_SHARE_EPS = 1e-9
+
+
+class GestureVoter:
+    """Constant-time temporal vote over the last ``window`` classifications.
+
+    Votes are weighted by classifier confidence. Running per-gesture totals are
+    updated as votes enter and leave the window, so each frame costs O(1).
+    A new gesture becomes stable once it has ``min_votes`` votes and at least
+    ``enter_share`` of the window weight; the current stable gesture is only
+    replaced when its own share has fallen below ``exit_share`` (hysteresis).
+    The default shares sit between the fifths of a 5-vote window, so with equal
+    confidences a change takes 3 of 5 votes (2 left for the old gesture is a
+    0.4 share, below 0.45) and 2 of 5 never does.
+    ``add`` returns a result only when the stable gesture changes, or every
+    ``heartbeat_s`` seconds while it stays the same if a heartbeat is set.
+    ``stable_onset`` is the timestamp since which the stable gesture has been
+    continuously present in the window, i.e. when the hand started showing it.
+    """
+
+    def __init__(self, window: int = 5, min_votes: int = 3, min_confidence: float = 0.7,
+                 enter_share: float = 0.55, exit_share: float = 0.45, max_age: float = 1.0,
+                 heartbeat_s: float = 0.0):
+        self.window = window
+        self.min_votes = min_votes
+        self.min_confidence = min_confidence
+        self.enter_share = enter_share
+        self.exit_share = exit_share
+        self.max_age = max_age
+        self.heartbeat_s = heartbeat_s
+        self.votes = deque()
+        self.weights = {}
+        self.counts = {}
+        self.total_weight = 0.0
+        self.onsets = {}
+        self.stable = None
+        self.stable_onset = None
+        self.last_emit = 0.0
+
+    def reset(self):
+        self.votes.clear()
+        self.weights.clear()
+        self.counts.clear()
+        self.onsets.clear()
+        self.total_weight = 0.0
+        self.stable = None
+        self.stable_onset = None
+
+    def _evict(self):
+        gesture, weight, _ = self.votes.popleft()
+        self.weights[gesture] -= weight
+        self.counts[gesture] -= 1
+        self.total_weight -= weight
+        if not self.counts[gesture]:
+            # Drop float residue so an empty gesture has exactly zero weight
+            self.weights[gesture] = 0.0
+            self.onsets.pop(gesture, None)
+        if not self.votes:
+            self.total_weight = 0.0
+
+    def expire(self, timestamp: float):
+        """Forgets votes older than ``max_age``; the stable gesture is cleared once all are gone."""
+        while self.votes and timestamp - self.votes[0][2] >= self.max_age:
+            self._evict()
+        if not self.votes:
+            self.stable = None
+            self.stable_onset = None
+
+    def share(self, gesture: str) -> float:
+        if self.total_weight <= 0:
+            return 0.0
+        return self.weights.get(gesture, 0.0) / self.total_weight
+
+    def add(self, gesture: str, confidence: float, finger_count: int,
+            timestamp: float) -> Optional[Tuple[str, float, int]]:
+        self.votes.append((gesture, confidence, timestamp))
+        self.weights[gesture] = self.weights.get(gesture, 0.0) + confidence
+        self.counts[gesture] = self.counts.get(gesture, 0) + 1
+        self.onsets.setdefault(gesture, timestamp)
+        self.total_weight += confidence
+        if len(self.votes) > self.window:
+            self._evict()
+        self.expire(timestamp)
+
+        stable_gesture = self.stable[0] if self.stable else None
+        if gesture != stable_gesture:
+            can_enter = (
+                confidence > self.min_confidence
+                and self.counts.get(gesture, 0) >= self.min_votes
+                and self.share(gesture) >= self.enter_share - _SHARE_EPS
+            )
+            can_leave = stable_gesture is None or self.share(stable_gesture) < self.exit_share - _SHARE_EPS
+            if can_enter and can_leave:
+                self.stable = (gesture, confidence, finger_count)
+                self.stable_onset = self.onsets.get(gesture, timestamp)
+                self.last_emit = timestamp
+                return self.stable
+        elif confidence > self.min_confidence:
+            self.stable = (gesture, confidence, finger_count)
+            if self.heartbeat_s > 0 and timestamp - self.last_emit >= self.heartbeat_s:
+                self.last_emit = timestamp
+                return self.stable
+        return None
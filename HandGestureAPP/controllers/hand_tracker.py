@@ -0,0 +1,108 @@
+from typing import Callable, Dict, List, Optional
+
+from controllers.gesture_filter import GestureVoter
+
+
+class HandTrack:
+    def __init__(self, track_id: int, player: int, handedness: str, centroid, timestamp: float,
+                 voter: GestureVoter):
+        self.track_id = track_id
+        self.player = player
+        self.handedness = handedness
+        self.centroid = centroid
+        self.last_seen = timestamp
+        self.voter = voter
+
+
+class HandTracker:
+    """Gives each hand a stable track ID across frames.
+
+    Detections are matched to existing tracks greedily by centroid distance,
+    with a penalty when MediaPipe's handedness label disagrees. Each track has
+    its own GestureVoter, so two hands never mix their votes. A new track is
+    assigned to the player on its side of the (mirrored) frame: player 1 on
+    the left, player 2 on the right, unless that player already has a track.
+    """
+
+    def __init__(self, voter_factory: Callable[[], GestureVoter], max_distance: float = 0.25,
+                 handedness_penalty: float = 0.15, max_age: float = 0.5):
+        self.voter_factory = voter_factory
+        self.max_distance = max_distance
+        self.handedness_penalty = handedness_penalty
+        self.max_age = max_age
+        self.tracks: Dict[int, HandTrack] = {}
+        self.next_id = 1
+
+    def reset(self):
+        self.tracks.clear()
+
+    @staticmethod
+    def centroid(hand_landmarks):
+        landmarks = hand_landmarks.landmark
+        return (sum(lm.x for lm in landmarks) / len(landmarks),
+                sum(lm.y for lm in landmarks) / len(landmarks))
+
+    def assign(self, hands, handedness, timestamp: float) -> List[HandTrack]:
+        """Returns the track of each hand in ``hands``, in the same order."""
+        self._prune(timestamp)
+        labels = [h.classification[0].label if h is not None else "" for h in (handedness or [None] * len(hands))]
+        centroids = [self.centroid(hand) for hand in hands]
+
+        candidates = []
+        for i, (cx, cy) in enumerate(centroids):
+            for track in self.tracks.values():
+                distance = ((cx - track.centroid[0]) ** 2 + (cy - track.centroid[1]) ** 2) ** 0.5
+                if distance > self.max_distance:
+                    continue
+                cost = distance
+                if labels[i] and track.handedness and labels[i] != track.handedness:
+                    cost += self.handedness_penalty
+                candidates.append((cost, i, track.track_id))
+        candidates.sort()
+
+        assigned: List[Optional[HandTrack]] = [None] * len(hands)
+        used_tracks = set()
+        for _, i, track_id in candidates:
+            if assigned[i] is not None or track_id in used_tracks:
+                continue
+            assigned[i] = self.tracks[track_id]
+            used_tracks.add(track_id)
+
+        for i, track in enumerate(assigned):
+            if track is None:
+                track = self._new_track(labels[i], centroids[i], timestamp)
+                assigned[i] = track
+            track.centroid = centroids[i]
+            track.last_seen = timestamp
+            if labels[i]:
+                track.handedness = labels[i]
+        return assigned
+
+    def _new_track(self, handedness: str, centroid, timestamp: float) -> HandTrack:
+        taken = {track.player for track in self.tracks.values()}
+        player = 1 if centroid[0] < 0.5 else 2
+        if player in taken and (3 - player) not in taken:
+            player = 3 - player
+        track = HandTrack(self.next_id, player, handedness, centroid, timestamp, self.voter_factory())
+        self.tracks[track.track_id] = track
+        self.next_id += 1
+        return track
+
+    def _prune(self, timestamp: float):
+        for track_id in [t for t, track in self.tracks.items() if timestamp - track.last_seen > self.max_age]:
+            del self.tracks[track_id]
+
+    def expire(self, timestamp: float):
+        """Drops tracks not seen for ``max_age`` and ages out the votes of the rest."""
+        self._prune(timestamp)
+        for track in list(self.tracks.values()):
+            track.voter.expire(timestamp)
+
+    def primary(self) -> Optional[HandTrack]:
+        """The longest-lived track, which drives the single-player gesture signal."""
+        tracks = list(self.tracks.values())
+        return min(tracks, key=lambda track: track.track_id) if tracks else None
+
+    def stable_gestures(self) -> Dict[int, tuple]:
+        """Stable ``(gesture, confidence, finger_count)`` per player."""
+        return {track.player: track.voter.stable for track in list(self.tracks.values()) if track.voter.stable}
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import threading
+import joblib
+
+from utils.logger import setup_logging
+from controllers.featurizer import DEFAULT_SCHEMA, FeatureSchema
+from controllers.forest_evaluator import CompiledForest, compiled_path_for
+
+logger = setup_logging()
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gesture_model.pkl")
+# How often a running app looks for a model saved by another process (train_model.py)
+UPDATE_CHECK_INTERVAL_S = 2.0
+
+def metadata_path_for(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".json"
+
+
+def load_metadata(model_path: str) -> dict:
+    """The model's sidecar metadata, or an empty dict for models saved without one."""
+    path = metadata_path_for(model_path)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Metadados do modelo ilegíveis em {path}: {e}")
+        return {}
+
+
+def estimate_model_bytes(model) -> int:
+    """Bytes held by the model's arrays (compiled forest or sklearn tree ensemble)."""
+    if hasattr(model, "nbytes"):
+        return int(model.nbytes)
+    total = 0
+    for estimator in getattr(model, "estimators_", []):
+        state = estimator.tree_.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+class ModelRegistry:
+    """Process-wide gesture model cache.
+
+    The model is loaded once on a background thread and the same instance is
+    handed to every GestureDetector. Until loading finishes ``get_model``
+    returns None and detectors use the rule-based classifier. ``generation``
+    grows with every load; ``check_for_update`` reloads the model when its
+    files changed on disk, so a model retrained in another process is picked up.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH):
+        self.model_path = model_path
+        self.model = None
+        self.state = "idle"
+        self.source_path = None
+        self.load_time_ms = 0.0
+        self.footprint_bytes = 0
+        self.metadata = {}
+        self.feature_schema = DEFAULT_SCHEMA
+        self.generation = 0
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def instance(cls) -> "ModelRegistry":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def load_async(self):
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "loading"
+            self._loaded.clear()
+            self._thread = threading.Thread(target=self._load, name="ModelLoader", daemon=True)
+            self._thread.start()
+
+    def reload(self):
+        """Drops the cached model and loads it again, e.g. after retraining."""
+        with self._lock:
+            if self.state == "loading":
+                return
+            self.state = "idle"
+            self.model = None
+        self.load_async()
+
+    def file_signature(self) -> tuple:
+        """Modification times of the pickle, compiled forest and metadata (None when absent)."""
+        signature = []
+        for path in (self.model_path, compiled_path_for(self.model_path), metadata_path_for(self.model_path)):
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def check_for_update(self, interval_s: float = UPDATE_CHECK_INTERVAL_S) -> bool:
+        """Reloads if the model files changed since they were loaded; stats them at most every ``interval_s``."""
+        now = time.perf_counter()
+        if now < self._next_check or self.state in ("idle", "loading"):
+            return False
+        self._next_check = now + interval_s
+        if self.file_signature() == self._signature:
+            return False
+        logger.info(f"Modelo alterado em disco; recarregando {self.model_path}")
+        self.reload()
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._loaded.wait(timeout)
+
+    def get_model(self):
+        return self.model
+
+    def get_model_and_schema(self):
+        """The model together with the feature schema it expects, read consistently."""
+        with self._lock:
+            return self.model, self.feature_schema
+
+    def _load(self):
+        start = time.perf_counter()
+        signature = self.file_signature()
+        model = None
+        state = "missing"
+        compiled_path = compiled_path_for(self.model_path)
+        metadata = load_metadata(self.model_path)
+        schema = FeatureSchema.from_metadata(metadata)
+        try:
+            schema.check()
+            # The compiled forest skips unpickling sklearn; use it unless the pickle is newer
+            if os.path.exists(compiled_path) and (
+                not os.path.exists(self.model_path)
+                or os.path.getmtime(compiled_path) >= os.path.getmtime(self.model_path)
+            ):
+                model = CompiledForest.load(compiled_path)
+                self.source_path = compiled_path
+            elif os.path.exists(self.model_path):
+                # Large arrays inside the pickle are memory-mapped instead of copied
+                model = joblib.load(self.model_path, mmap_mode="r")
+                self.source_path = self.model_path
+            if model is not None:
+                schema.check(getattr(model, "n_features_in_", None))
+                state = "ready"
+        except Exception as e:
+            model = None
+            state = "failed"
+            logger.error(f"Erro ao carregar modelo ML: {e}")
+
+        with self._lock:
+            self.model = model
+            self.metadata = metadata if model is not None else {}
+            self.feature_schema = schema if model is not None else DEFAULT_SCHEMA
+            self.state = state
+            self.load_time_ms = (time.perf_counter() - start) * 1000.0
+            self.footprint_bytes = estimate_model_bytes(model) if model is not None else 0
+            self._signature = signature
+            self.generation += 1
+        self._loaded.set()
+
+        if state == "ready":
+            logger.info(f"Modelo ML carregado de {self.source_path} em {self.load_time_ms:.1f} ms "
+                        f"({self.footprint_bytes / 1024:.0f} KiB)")
+            if metadata.get("latency_us"):
+                logger.info(f"Modelo {metadata.get('model')}: {metadata['latency_us'].get('frame_us', 0):.0f} us "
+                            f"por quadro medidos no treino")
+        elif state == "missing":
+            logger.info("Nenhum modelo ML encontrado; usando classificação por regras")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "path": self.source_path,
+                "load_time_ms": self.load_time_ms,
+                "footprint_bytes": self.footprint_bytes,
+                "metadata": self.metadata,
+            }
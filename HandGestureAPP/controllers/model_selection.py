@@ -0,0 +1,141 @@
+import os
+import time
+import platform
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.neighbors import KNeighborsClassifier
+
+from controllers.featurizer import DEFAULT_SCHEMA, FeatureSchema
+from controllers.forest_evaluator import CompiledForest, compiled_path_for, export_forest
+from controllers.model_registry import metadata_path_for
+from utils.logger import setup_logging
+from utils.persistence import atomic_write_json
+
+logger = setup_logging()
+
+# GestureDetector tracks up to two hands and classifies them in one predict call per frame
+HANDS_PER_FRAME = 2
+BATCH_SIZE = 64
+DEFAULT_BUDGET_US = 1000.0
+
+CANDIDATES: Dict[str, Callable[[], object]] = {
+    "random_forest_25": lambda: RandomForestClassifier(n_estimators=25, random_state=42),
+    "random_forest_50": lambda: RandomForestClassifier(n_estimators=50, random_state=42),
+    "random_forest_100": lambda: RandomForestClassifier(n_estimators=100, random_state=42),
+    "random_forest_200": lambda: RandomForestClassifier(n_estimators=200, random_state=42),
+    "random_forest_100_depth12": lambda: RandomForestClassifier(n_estimators=100, max_depth=12, random_state=42),
+    "extra_trees_50": lambda: ExtraTreesClassifier(n_estimators=50, random_state=42),
+    "extra_trees_100": lambda: ExtraTreesClassifier(n_estimators=100, random_state=42),
+    "knn_5": lambda: KNeighborsClassifier(n_neighbors=5),
+    "logistic_regression": lambda: LogisticRegression(max_iter=1000),
+}
+
+
+def is_forest(model) -> bool:
+    return hasattr(model, "estimators_") and all(hasattr(e, "tree_") for e in model.estimators_)
+
+
+def runtime_model(model):
+    """What GestureDetector will actually call: tree ensembles run as a CompiledForest."""
+    return CompiledForest.from_sklearn(model) if is_forest(model) else model
+
+
+def measure_latency(model, features: np.ndarray, repeats: int = 200) -> Dict[str, float]:
+    """Median microseconds for one hand, one frame (HANDS_PER_FRAME hands) and per hand in a batch."""
+    rng = np.random.default_rng(0)
+
+    def median_us(rows: int, n: int) -> float:
+        samples = np.empty(n)
+        for i in range(n):
+            batch = features[rng.integers(len(features), size=rows)]
+            start = time.perf_counter()
+            model.predict(batch)
+            samples[i] = time.perf_counter() - start
+        return float(np.median(samples) * 1e6)
+
+    model.predict(features[:1])
+    return {
+        "single_us": median_us(1, repeats),
+        "frame_us": median_us(HANDS_PER_FRAME, repeats),
+        "batch_per_sample_us": median_us(BATCH_SIZE, max(1, repeats // 10)) / BATCH_SIZE,
+    }
+
+
+def evaluate(name: str, features: np.ndarray, labels: np.ndarray, folds: int = 5, repeats: int = 200) -> dict:
+    """Cross-validated accuracy of one candidate plus the latency of its first fold's model."""
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    start = time.perf_counter()
+    scores = cross_validate(CANDIDATES[name](), features, labels, cv=cv, n_jobs=-1, return_estimator=True)
+    fit_s = time.perf_counter() - start
+    result = {
+        "name": name,
+        "accuracy": float(np.mean(scores["test_score"])),
+        "accuracy_std": float(np.std(scores["test_score"])),
+        "cv_s": fit_s,
+    }
+    result.update(measure_latency(runtime_model(scores["estimator"][0]), features, repeats))
+    return result
+
+
+def select_model(features: np.ndarray, labels: np.ndarray, budget_us: float = DEFAULT_BUDGET_US,
+                 candidates: List[str] = None, folds: int = 5,
+                 repeats: int = 200) -> Tuple[Optional[dict], List[dict]]:
+    """Evaluates every candidate and returns the most accurate one whose per-frame latency fits ``budget_us``.
+
+    Falls back to the fastest candidate (with a warning) when none fits.
+    """
+    folds = max(2, min(folds, int(np.min(np.unique(labels, return_counts=True)[1]))))
+    report = []
+    for name in candidates or list(CANDIDATES):
+        result = evaluate(name, features, labels, folds, repeats)
+        result["within_budget"] = result["frame_us"] <= budget_us
+        report.append(result)
+        logger.info(f"{name}: accuracy {result['accuracy']:.4f} +- {result['accuracy_std']:.4f}, "
+                    f"frame {result['frame_us']:.0f} us")
+    within = [r for r in report if r["within_budget"]]
+    if within:
+        best = max(within, key=lambda r: (r["accuracy"], -r["frame_us"]))
+    else:
+        best = min(report, key=lambda r: r["frame_us"])
+        logger.warning(f"No candidate fits {budget_us:.0f} us per frame; using the fastest, {best['name']}")
+    return best, report
+
+
+def save_selected(model, model_path: str, metadata: dict):
+    """Saves the model, its compiled forest when it has one, and the metadata sidecar."""
+    import joblib
+
+    joblib.dump(model, model_path)
+    compiled_path = compiled_path_for(model_path)
+    if is_forest(model):
+        export_forest(model, compiled_path)
+    elif os.path.exists(compiled_path):
+        # A stale compiled forest would be loaded instead of the new model
+        os.remove(compiled_path)
+    atomic_write_json(metadata_path_for(model_path), metadata)
+
+
+def build_metadata(model, features: np.ndarray, schema: FeatureSchema = DEFAULT_SCHEMA, name: str = None,
+                   accuracy: float = None, accuracy_std: float = None, budget_us: float = None,
+                   latency: dict = None, candidates: List[dict] = None) -> dict:
+    """Sidecar describing the model: feature schema, classes, accuracy and latency on this machine."""
+    if latency is None:
+        latency = measure_latency(runtime_model(model), features)
+    return {
+        "feature_schema": schema.to_metadata(),
+        "model": name or type(model).__name__,
+        "params": {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, bool, type(None)))},
+        "classes": [str(c) for c in model.classes_],
+        "samples": int(len(features)),
+        "accuracy": accuracy,
+        "accuracy_std": accuracy_std,
+        "budget_us": budget_us,
+        "latency_us": latency,
+        "machine": {"platform": platform.platform(), "processor": platform.processor(), "cpus": os.cpu_count()},
+        "trained_at": time.time(),
+        "candidates": candidates or [],
+    }
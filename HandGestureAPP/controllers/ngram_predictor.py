@@ -0,0 +1,141 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+MOVES = ("rock", "paper", "scissors")
+OUTCOMES = ("win", "draw", "loss")
+MOVE_INDEX = {move: i for i, move in enumerate(MOVES)}
+OUTCOME_INDEX = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+
+
+class NGramPredictor:
+    """Order-k move predictor backed by a dense count tensor.
+
+    The context is the last ``order`` rounds, each encoded as the player's move
+    (or move and outcome when ``use_outcomes`` is set) and packed into a single
+    row index of ``counts``, shape ``(symbols ** order, 3)``. The context index
+    is rolled forward in O(1) per round, and the argmax of every row is cached:
+    counts only grow, so only the move just counted can take over the row.
+    Ties go to the first of rock, paper, scissors, like ``np.argmax``.
+
+    Per-round updates go through flat memoryviews of the arrays, which avoids
+    creating a NumPy scalar per access; bulk loads use vectorized ``fit``.
+    """
+
+    def __init__(self, order: int = 1, use_outcomes: bool = False):
+        if not 1 <= order <= 4:
+            raise ValueError(f"order must be between 1 and 4, got {order}")
+        self.order = order
+        self.use_outcomes = use_outcomes
+        self.symbols = len(MOVES) * len(OUTCOMES) if use_outcomes else len(MOVES)
+        self.contexts = self.symbols ** order
+        self.counts = np.zeros((self.contexts, len(MOVES)), dtype=np.int64)
+        self.totals = np.zeros(self.contexts, dtype=np.int64)
+        self.best = np.zeros(self.contexts, dtype=np.int8)
+        self._counts = memoryview(self.counts).cast("B").cast("q")
+        self._totals = memoryview(self.totals)
+        self._best = memoryview(self.best)
+        self.context = 0
+        self.filled = 0
+
+    def reset(self):
+        self.counts.fill(0)
+        self.totals.fill(0)
+        self.best.fill(0)
+        self.context = 0
+        self.filled = 0
+
+    def symbol(self, move: int, outcome: Optional[int] = None) -> int:
+        if self.use_outcomes:
+            return move * len(OUTCOMES) + (outcome if outcome is not None else OUTCOME_INDEX["draw"])
+        return move
+
+    def update(self, move: int, outcome: Optional[int] = None):
+        """Counts ``move`` (an index into MOVES) in the current context, then shifts it in."""
+        context = self.context
+        if self.filled >= self.order:
+            counts = self._counts
+            row = context * len(MOVES)
+            counts[row + move] += 1
+            self._totals[context] += 1
+            best = self._best[context]
+            if move != best and (counts[row + move] > counts[row + best]
+                                 or (counts[row + move] == counts[row + best] and move < best)):
+                self._best[context] = move
+        else:
+            self.filled += 1
+        self.context = (context * self.symbols + self.symbol(move, outcome)) % self.contexts
+
+    def predict(self) -> Optional[int]:
+        """Most frequent next move in the current context, or None if it has never been seen."""
+        if self.filled < self.order or not self._totals[self.context]:
+            return None
+        return self._best[self.context]
+
+    def probabilities(self) -> Optional[np.ndarray]:
+        if self.filled < self.order or not self.totals[self.context]:
+            return None
+        return self.counts[self.context] / self.totals[self.context]
+
+    def fit(self, moves: Sequence[int], outcomes: Sequence[int] = None):
+        """Counts a whole history at once and leaves the context at its end.
+
+        Equivalent to calling ``update`` for every round, but vectorized so
+        millions of rounds load in well under a second.
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        if self.use_outcomes:
+            if outcomes is None:
+                outcomes = np.full(len(moves), OUTCOME_INDEX["draw"], dtype=np.int64)
+            symbols = moves * len(OUTCOMES) + np.asarray(outcomes, dtype=np.int64)
+        else:
+            symbols = moves
+        if not len(symbols):
+            return
+
+        # Prepend the current partial context so fit() continues an existing history
+        recent = self._recent_symbols()
+        symbols_all = np.concatenate([recent, symbols])
+        moves_all = np.concatenate([np.zeros(len(recent), dtype=np.int64), moves])
+        n = len(symbols_all)
+
+        if n > self.order:
+            context = np.zeros(n - self.order, dtype=np.int64)
+            for offset in range(self.order):
+                context = context * self.symbols + symbols_all[offset:n - self.order + offset]
+            targets = moves_all[self.order:]
+            flat = context * len(MOVES) + targets
+            self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+            self.totals[:] = self.counts.sum(axis=1)
+            self.best[:] = self.counts.argmax(axis=1)
+
+        self.filled = min(self.order, self.filled + len(symbols))
+        tail = symbols_all[-self.filled:] if self.filled else symbols_all[:0]
+        self.context = 0
+        for symbol in tail:
+            self.context = self.context * self.symbols + int(symbol)
+
+    def get_state(self) -> dict:
+        return {"counts": self.counts.copy(), "context": np.array(self.context), "filled": np.array(self.filled)}
+
+    def set_state(self, state: dict):
+        counts = np.asarray(state["counts"], dtype=np.int64)
+        if counts.shape != self.counts.shape:
+            raise ValueError(f"count tensor shape {counts.shape} does not match {self.counts.shape}")
+        self.counts[:] = counts
+        self.totals[:] = counts.sum(axis=1)
+        self.best[:] = counts.argmax(axis=1)
+        self.context = int(state["context"])
+        self.filled = int(state["filled"])
+
+    def _recent_symbols(self) -> np.ndarray:
+        symbols = []
+        context = self.context
+        for _ in range(self.filled):
+            symbols.append(context % self.symbols)
+            context //= self.symbols
+        return np.array(symbols[::-1], dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.totals.nbytes + self.best.nbytes
@@ -0,0 +1,164 @@
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from controllers.ai_logic import MarkovChainAI
+from utils.logger import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_PROFILE = "default"
+PROFILE_NAME = re.compile(r"^[\w\- ]{1,40}$")
+HISTORY_FILE = "historico.rpsh"
+
+
+class ProfileManager:
+    """Per-player MarkovChainAI instances behind an LRU cache.
+
+    Each profile persists its own round history (and AI snapshot) under
+    ``root_dir/<name>/``; the default profile keeps using ``default_history``.
+    At most ``max_profiles`` models and ``max_bytes`` of count tensors stay in
+    memory; the least recently used ones are evicted first, except the active
+    profile and one that has just been loaded and not yet activated. Loading happens on one background thread, so a cache hit is a
+    dictionary lookup and a miss only costs reading the profile's snapshot.
+    """
+
+    def __init__(self, root_dir: str, default_history: str, order: int = 1, use_outcomes: bool = False,
+                 max_profiles: int = 16, max_bytes: int = 16 * 1024 * 1024,
+                 before_load: Callable[[], object] = None,
+                 factory: Callable[[str], MarkovChainAI] = None):
+        self.root_dir = root_dir
+        self.default_history = default_history
+        self.order = order
+        self.use_outcomes = use_outcomes
+        # Builds the AI for a history path; defaults to a plain MarkovChainAI
+        self.factory = factory or (lambda path: MarkovChainAI(history_file=path, order=self.order,
+                                                                use_outcomes=self.use_outcomes))
+        self.max_profiles = max(1, max_profiles)
+        self.max_bytes = max_bytes
+        self.before_load = before_load
+        self.active = DEFAULT_PROFILE
+        self.cache: "OrderedDict[str, MarkovChainAI]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ProfileLoader")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_load_ms = 0.0
+
+    @staticmethod
+    def valid_name(name: str) -> bool:
+        return bool(PROFILE_NAME.match(name or "")) and name.strip() == name
+
+    def history_path(self, name: str) -> str:
+        if name == DEFAULT_PROFILE:
+            return self.default_history
+        return os.path.join(self.root_dir, name, HISTORY_FILE)
+
+    def list_profiles(self) -> List[str]:
+        names = []
+        if os.path.isdir(self.root_dir):
+            names = sorted(n for n in os.listdir(self.root_dir)
+                           if n != DEFAULT_PROFILE and os.path.isdir(os.path.join(self.root_dir, n)))
+        return [DEFAULT_PROFILE] + names
+
+    def create(self, name: str):
+        if not self.valid_name(name):
+            raise ValueError(f"Invalid profile name: {name!r}")
+        if name != DEFAULT_PROFILE:
+            os.makedirs(os.path.join(self.root_dir, name), exist_ok=True)
+
+    def cached(self, name: str) -> Optional[MarkovChainAI]:
+        with self._lock:
+            ai = self.cache.get(name)
+            if ai is not None:
+                self.cache.move_to_end(name)
+                self.hits += 1
+            return ai
+
+    def get(self, name: str) -> MarkovChainAI:
+        """Returns the profile's AI, loading it on the calling thread if it is not cached."""
+        return self.load_async(name).result()
+
+    def load_async(self, name: str) -> Future:
+        """Future resolving to the profile's AI; already resolved on a cache hit."""
+        ai = self.cached(name)
+        if ai is not None:
+            future = Future()
+            future.set_result(ai)
+            return future
+        with self._lock:
+            future = self._pending.get(name)
+            if future is None:
+                self.misses += 1
+                future = self._executor.submit(self._load, name)
+                self._pending[name] = future
+            return future
+
+    def activate(self, name: str):
+        """Marks ``name`` as the profile in play, which is never evicted."""
+        with self._lock:
+            self.active = name
+            if name in self.cache:
+                self.cache.move_to_end(name)
+            # A profile kept over the budget while it waited to be activated can go now
+            self._evict()
+
+    def _load(self, name: str) -> MarkovChainAI:
+        start = time.perf_counter()
+        try:
+            if self.before_load is not None:
+                # Rounds still queued for this profile must be on disk before its history is read
+                self.before_load()
+            self.create(name)
+            ai = self.factory(self.history_path(name))
+            with self._lock:
+                self.cache[name] = ai
+                self.cache.move_to_end(name)
+                # The caller has yet to activate it, so it must survive its own load
+                self._evict(keep=name)
+            self.last_load_ms = (time.perf_counter() - start) * 1000.0
+            logger.info(f"Perfil '{name}' carregado em {self.last_load_ms:.1f} ms")
+            return ai
+        finally:
+            with self._lock:
+                self._pending.pop(name, None)
+
+    def _evict(self, keep: str = None):
+        # Called with the lock held
+        def over_budget():
+            return (len(self.cache) > self.max_profiles
+                    or sum(ai.nbytes for ai in self.cache.values()) > self.max_bytes)
+
+        for name in list(self.cache):
+            if not over_budget():
+                break
+            if name == self.active or name == keep or len(self.cache) == 1:
+                continue
+            del self.cache[name]
+            self.evictions += 1
+            logger.debug(f"Perfil '{name}' removido do cache")
+
+    def loaded(self) -> List[MarkovChainAI]:
+        with self._lock:
+            return list(self.cache.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active": self.active,
+                "cached": list(self.cache),
+                "bytes": sum(ai.nbytes for ai in self.cache.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "last_load_ms": self.last_load_ms,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
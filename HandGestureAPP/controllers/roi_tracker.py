@@ -0,0 +1,130 @@
+import time
+import cv2
+import numpy as np
+from collections import deque
+from typing import Optional, Tuple
+
+
+class HandROITracker:
+    """Runs hand inference on a crop around the hands found in the previous frame.
+
+    The crop is a square around the last landmark bounding box (plus a margin),
+    downsampled to at most ``input_size`` pixels. Landmarks are mapped back to
+    full-frame coordinates. A full-frame pass is used when there is no ROI yet,
+    when the hand is lost inside the ROI, and every ``refresh_interval`` frames
+    so a hand entering elsewhere is still picked up.
+
+    MediaPipe's tracking mode seeds each frame with the previous hand rect in
+    the previous image's normalized coordinates, so crops and full frames need
+    separate tracking-mode ``Hands`` instances (``infer_roi`` and ``infer``).
+    """
+
+    def __init__(self, margin: float = 0.35, input_size: int = 256, refresh_interval: int = 30,
+                 min_size: int = 96):
+        self.margin = margin
+        self.input_size = input_size
+        self.refresh_interval = refresh_interval
+        self.min_size = min_size
+        self.roi: Optional[Tuple[int, int, int]] = None
+        self.frames_since_full = 0
+        self.frames = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.redetections = 0
+        self.roi_inference_ms = deque(maxlen=120)
+        self.full_inference_ms = deque(maxlen=120)
+        self.frame_inference_ms = deque(maxlen=120)
+
+    def reset(self):
+        self.roi = None
+        self.frames_since_full = 0
+
+    def next_region(self) -> Optional[Tuple[int, int, int]]:
+        if self.roi is None or self.frames_since_full >= self.refresh_interval:
+            return None
+        return self.roi
+
+    def prepare(self, frame: np.ndarray, roi: Tuple[int, int, int]) -> np.ndarray:
+        x0, y0, size = roi
+        crop = frame[y0:y0 + size, x0:x0 + size]
+        if size > self.input_size:
+            crop = cv2.resize(crop, (self.input_size, self.input_size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def map_to_frame(results, roi: Tuple[int, int, int], frame_shape):
+        """Converts crop-normalized landmarks to full-frame normalized coordinates, in place."""
+        x0, y0, size = roi
+        height, width = frame_shape[:2]
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (x0 + lm.x * size) / width
+                lm.y = (y0 + lm.y * size) / height
+                lm.z = lm.z * size / width
+
+    def update(self, results, frame_shape):
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return
+        height, width = frame_shape[:2]
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        x_min, x_max = min(xs) * width, max(xs) * width
+        y_min, y_max = min(ys) * height, max(ys) * height
+
+        size = max(x_max - x_min, y_max - y_min) * (1.0 + 2.0 * self.margin)
+        size = int(min(max(size, self.min_size), width, height))
+        cx = (x_min + x_max) / 2.0
+        cy = (y_min + y_max) / 2.0
+        # Shift rather than shrink at the borders so the crop stays square
+        x0 = int(np.clip(cx - size / 2.0, 0, width - size))
+        y0 = int(np.clip(cy - size / 2.0, 0, height - size))
+        self.roi = (x0, y0, size)
+
+    def process(self, frame: np.ndarray, infer, infer_roi=None):
+        """Detects hands in ``frame`` (BGR), using the ROI when possible.
+
+        ``infer(rgb_image)`` runs on full frames and ``infer_roi`` on crops; sharing
+        one tracking-mode instance for both (``infer_roi=None``) mixes coordinate spaces.
+        """
+        self.frames += 1
+        frame_start = time.perf_counter()
+        roi = self.next_region()
+        if roi is not None:
+            results = (infer_roi or infer)(self.prepare(frame, roi))
+            elapsed = (time.perf_counter() - frame_start) * 1000.0
+            self.roi_inference_ms.append(elapsed)
+            if results.multi_hand_landmarks:
+                self.map_to_frame(results, roi, frame.shape)
+                self.update(results, frame.shape)
+                self.roi_frames += 1
+                self.frames_since_full += 1
+                self.frame_inference_ms.append(elapsed)
+                return results
+            # Tracking lost inside the ROI: fall back to the full frame right away
+            self.redetections += 1
+
+        start = time.perf_counter()
+        results = infer(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        now = time.perf_counter()
+        self.full_inference_ms.append((now - start) * 1000.0)
+        self.frame_inference_ms.append((now - frame_start) * 1000.0)
+        self.full_frames += 1
+        self.frames_since_full = 0
+        self.update(results, frame.shape)
+        return results
+
+    def stats(self) -> dict:
+        roi_ms = list(self.roi_inference_ms)
+        full_ms = list(self.full_inference_ms)
+        recent = list(self.frame_inference_ms)
+        return {
+            "frames": self.frames,
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "redetections": self.redetections,
+            "redetection_rate": self.redetections / max(1, self.frames),
+            "roi_inference_ms": float(np.mean(roi_ms)) if roi_ms else 0.0,
+            "full_inference_ms": float(np.mean(full_ms)) if full_ms else 0.0,
+            "avg_inference_ms": float(np.mean(recent)) if recent else 0.0,
+        }
@@ -0,0 +1,287 @@
+import os
+import json
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from controllers.featurizer import DEFAULT_SCHEMA, FeatureSchema, featurize
+from controllers.model_registry import metadata_path_for
+from utils.logger import setup_logging
+from utils.persistence import atomic_write_json
+
+logger = setup_logging()
+
+DEFAULT_SEQUENCE_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                           "sequence_model.npz")
+DEFAULT_WINDOW = 8
+DEFAULT_THRESHOLD = 0.9
+# Candidate softmax temperatures, searched on held-out windows
+_TEMPERATURES = np.geomspace(0.05, 20.0, 400)
+
+
+def window_features(windows: np.ndarray) -> np.ndarray:
+    """(N, W, F) chronological frame features to (N, 3F): last frame, motion since the first, mean."""
+    last = windows[:, -1]
+    return np.concatenate([last, last - windows[:, 0], windows.mean(axis=1)], axis=1)
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+def expected_calibration_error(proba: np.ndarray, correct: np.ndarray, bins: int = 10) -> float:
+    """Mean |confidence - accuracy| over equal-width confidence bins, weighted by bin size."""
+    confidence = proba.max(axis=1)
+    which = np.minimum((confidence * bins).astype(int), bins - 1)
+    error = 0.0
+    for b in np.unique(which):
+        mask = which == b
+        error += mask.sum() * abs(confidence[mask].mean() - correct[mask].mean())
+    return float(error / max(1, len(confidence)))
+
+
+def sequence_windows(points: List[Optional[np.ndarray]], labels: List[Optional[str]],
+                     window: int = DEFAULT_WINDOW, schema: FeatureSchema = DEFAULT_SCHEMA):
+    """Training windows ``(X, y)`` of one labelled clip.
+
+    ``points`` holds one (21, 3) hand per frame (None when no hand is visible);
+    every frame with a hand becomes the end of one window. Windows do not cross
+    frames without a hand and are padded by repeating their first frame, as
+    ``SequenceVoter`` does. Frames labelled None (the hand changing shape) are
+    labelled with the next gesture of the same run, so the model learns to
+    recognize a gesture while it is still being formed.
+    """
+    features, targets = [], []
+    frame = 0
+    while frame < len(points):
+        if points[frame] is None:
+            frame += 1
+            continue
+        start = frame
+        while frame < len(points) and points[frame] is not None:
+            frame += 1
+        run = featurize(np.array(points[start:frame]), schema)
+        run_labels = list(labels[start:frame])
+        upcoming = None
+        for i in range(len(run_labels) - 1, -1, -1):
+            if run_labels[i] is None:
+                run_labels[i] = upcoming
+            else:
+                upcoming = run_labels[i]
+        ends = np.array([i for i, label in enumerate(run_labels) if label is not None], dtype=np.int64)
+        if not len(ends):
+            continue
+        index = np.maximum(ends[:, None] - window + 1 + np.arange(window), 0)
+        features.append(window_features(run[index]))
+        targets.extend(run_labels[i] for i in ends)
+    if not features:
+        return np.empty((0, 3 * schema.dim), dtype=np.float32), np.empty(0, dtype=str)
+    return np.concatenate(features), np.array(targets)
+
+
+def read_labelled_clip(path: str) -> Tuple[List[Optional[np.ndarray]], List[Optional[str]]]:
+    """First hand and ``label`` of every frame of a LandmarkStreamSource ``.jsonl`` dump."""
+    points, labels = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            hands = record.get("hands") or []
+            points.append(np.array(hands[0]["landmarks"], dtype=np.float64) if hands else None)
+            labels.append(record.get("label"))
+    return points, labels
+
+
+class SequenceClassifier:
+    """Gesture classifier over a sliding window of the last ``window`` frames of one hand.
+
+    A multinomial logistic regression on ``window_features`` whose logits are
+    divided by a temperature fitted on held-out clips, so ``predict_proba`` is
+    calibrated and can be thresholded to emit a gesture before the hand has
+    finished forming it. Inference is one matrix product per frame.
+    """
+
+    def __init__(self, coef, intercept, classes, temperature: float = 1.0, window: int = DEFAULT_WINDOW,
+                 schema: FeatureSchema = DEFAULT_SCHEMA, metrics: dict = None):
+        self.coef = np.asarray(coef, dtype=np.float32)
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+        self.classes_ = np.asarray(classes)
+        self.temperature = float(temperature)
+        self.window = int(window)
+        self.schema = schema
+        self.metrics = metrics or {}
+
+    @classmethod
+    def fit(cls, sequences: Iterable[Tuple[list, list]], window: int = DEFAULT_WINDOW,
+            schema: FeatureSchema = DEFAULT_SCHEMA, holdout: float = 0.2, seed: int = 0) -> "SequenceClassifier":
+        """Trains on ``(points, labels)`` clips, fitting the temperature on a held-out share of them."""
+        from sklearn.linear_model import LogisticRegression
+
+        parts = [sequence_windows(points, labels, window, schema) for points, labels in sequences]
+        parts = [(X, y) for X, y in parts if len(X)]
+        if not parts:
+            raise ValueError("nenhuma janela rotulada nas sequências")
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(parts))
+        n_holdout = int(round(len(parts) * holdout))
+        if len(parts) > 1:
+            n_holdout = min(max(1, n_holdout), len(parts) - 1)
+            train = [parts[i] for i in order[n_holdout:]]
+            held = [parts[i] for i in order[:n_holdout]]
+        else:
+            # A single clip is split in time; neighbouring windows overlap, so this is optimistic
+            X, y = parts[0]
+            cut = int(len(X) * (1 - holdout))
+            train, held = [(X[:cut], y[:cut])], [(X[cut:], y[cut:])]
+        X_train = np.concatenate([X for X, _ in train])
+        y_train = np.concatenate([y for _, y in train])
+        X_held = np.concatenate([X for X, _ in held])
+        y_held = np.concatenate([y for _, y in held])
+
+        mean = X_train.mean(axis=0)
+        scale = X_train.std(axis=0)
+        scale[scale == 0] = 1.0
+        lr = LogisticRegression(max_iter=2000).fit((X_train - mean) / scale, y_train)
+        coef, intercept = lr.coef_, lr.intercept_
+        if len(lr.classes_) == 2:
+            # Binary models hold one logit; softmax over (-z/2, z/2) is the same sigmoid
+            coef = np.vstack([-coef, coef]) / 2
+            intercept = np.array([-intercept[0], intercept[0]]) / 2
+        # Standardization folded into the weights
+        coef = coef / scale
+        intercept = intercept - coef @ mean
+        model = cls(coef, intercept, lr.classes_, 1.0, window, schema)
+
+        metrics = {"train_windows": int(len(X_train)), "holdout_windows": int(len(X_held))}
+        if len(X_held):
+            logits = model.logits(X_held)
+            known = np.isin(y_held, model.classes_)
+            target = np.searchsorted(model.classes_, y_held[known])
+            logits, y_held = logits[known], y_held[known]
+            nll = [-np.log(softmax(logits / t)[np.arange(len(target)), target] + 1e-12).mean() for t in _TEMPERATURES]
+            model.temperature = float(_TEMPERATURES[int(np.argmin(nll))])
+            raw = softmax(logits.copy())
+            calibrated = model.predict_proba(X_held[known])
+            correct = model.classes_[calibrated.argmax(axis=1)] == y_held
+            metrics.update({
+                "holdout_accuracy": float(correct.mean()),
+                "ece_uncalibrated": expected_calibration_error(raw, correct),
+                "ece": expected_calibration_error(calibrated, correct),
+                "temperature": model.temperature,
+            })
+        model.metrics = metrics
+        return model
+
+    def logits(self, X) -> np.ndarray:
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        return X @ self.coef.T + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        return softmax(self.logits(X) / self.temperature)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.logits(X), axis=1))
+
+    @classmethod
+    def load(cls, path: str) -> "SequenceClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            schema = FeatureSchema(use_z=bool(data["use_z"]), use_angles=bool(data["use_angles"]),
+                                   version=int(data["schema_version"]))
+            schema.check(int(data["coef"].shape[1]) // 3)
+            return cls(data["coef"], data["intercept"], data["classes"], float(data["temperature"]),
+                       int(data["window"]), schema)
+
+    def save(self, path: str):
+        """Writes the weights as ``.npz`` and the training metrics to the ``.json`` sidecar."""
+        np.savez(
+            path, coef=self.coef, intercept=self.intercept, classes=self.classes_.astype(str),
+            temperature=np.array(self.temperature), window=np.array(self.window),
+            use_z=np.array(self.schema.use_z), use_angles=np.array(self.schema.use_angles),
+            schema_version=np.array(self.schema.version)
+        )
+        atomic_write_json(metadata_path_for(path), {
+            "feature_schema": self.schema.to_metadata(),
+            "window": self.window,
+            "classes": [str(c) for c in self.classes_],
+            "metrics": self.metrics,
+        })
+        logger.info(f"Sequence classifier saved to {path} (window {self.window}, T={self.temperature:.3f})")
+
+
+class SequenceVoter:
+    """Per-hand state of the sequence classifier, a drop-in for ``GestureVoter`` on a ``HandTrack``.
+
+    ``push`` adds a frame's features to a ring buffer of ``window`` frames and
+    returns the window's feature row; ``update`` takes that row's calibrated
+    probabilities and returns ``(gesture, probability, finger_count)`` as soon as another
+    gesture than the stable one reaches ``threshold`` (every ``heartbeat_s``
+    while it stays the same, if set). ``stable_onset`` is when the winning
+    gesture last became the most likely one. A gap of more than ``max_gap``
+    seconds restarts the window; ``max_age`` without frames clears the state.
+    """
+
+    def __init__(self, window: int, dim: int, threshold: float = DEFAULT_THRESHOLD, max_gap: float = 0.25,
+                 max_age: float = 1.0, heartbeat_s: float = 0.0):
+        self.frames = np.zeros((window, dim), dtype=np.float32)
+        self.window = window
+        self.threshold = threshold
+        self.max_gap = max_gap
+        self.max_age = max_age
+        self.heartbeat_s = heartbeat_s
+        self.position = -1
+        self.last_seen = None
+        self.leader = None
+        self.leader_onset = None
+        self.stable = None
+        self.stable_onset = None
+        self.last_emit = 0.0
+
+    def reset(self):
+        self.position = -1
+        self.last_seen = None
+        self.leader = None
+        self.leader_onset = None
+        self.stable = None
+        self.stable_onset = None
+
+    def expire(self, timestamp: float):
+        if self.last_seen is not None and timestamp - self.last_seen >= self.max_age:
+            self.reset()
+
+    def push(self, features: np.ndarray, timestamp: float) -> np.ndarray:
+        self.expire(timestamp)
+        if self.position < 0 or timestamp - self.last_seen > self.max_gap:
+            # A new window starts filled with its first frame, as in training
+            self.frames[:] = features
+            self.position = 0
+        else:
+            self.position = (self.position + 1) % self.window
+            self.frames[self.position] = features
+        self.last_seen = timestamp
+        last = self.frames[self.position]
+        first = self.frames[(self.position + 1) % self.window]
+        return np.concatenate([last, last - first, self.frames.mean(axis=0)])
+
+    def update(self, proba: np.ndarray, classes: np.ndarray, timestamp: float,
+               finger_count: int = 0) -> Optional[Tuple[str, float, int]]:
+        best = int(np.argmax(proba))
+        gesture, confidence = str(classes[best]), float(proba[best])
+        if gesture != self.leader:
+            self.leader = gesture
+            self.leader_onset = timestamp
+        stable_gesture = self.stable[0] if self.stable else None
+        if confidence < self.threshold:
+            return None
+        self.stable = (gesture, confidence, finger_count)
+        if gesture != stable_gesture:
+            self.stable_onset = self.leader_onset
+            self.last_emit = timestamp
+            return self.stable
+        if self.heartbeat_s > 0 and timestamp - self.last_emit >= self.heartbeat_s:
+            self.last_emit = timestamp
+            return self.stable
+        return None
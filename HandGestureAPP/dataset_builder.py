@@ -0,0 +1,351 @@
+"""Offline training set builder: labelled folders of images and videos to .npy shards.
+
+The input is one folder per gesture::
+
+    dataset/rock/*.jpg|*.mp4|*.jsonl
+    dataset/paper/...
+    dataset/scissors/...
+
+Every file goes through MediaPipe Hands in a process pool and its landmarks are cached under the SHA-1 of the file
+contents and extraction settings, so rebuilding after adding a few clips only
+extracts the new ones. The result is a directory of ``landmarks-NNNNN.npy``
+(N, 21, 3) / ``labels-NNNNN.npy`` shards plus a ``manifest.json`` that
+train_model.py can train from with ``--dataset``; features are computed from
+the landmarks at training time (controllers/featurizer.py), so the shards do
+not depend on the feature schema.
+
+Images and videos are mirrored before detection, like the webcam in the app
+(``--no-flip`` turns that off). ``.jsonl`` landmark dumps are used as they
+are: LandmarkRecorder writes them from frames the app already mirrored.
+
+Run from HandGestureAPP:
+    python dataset_builder.py dataset --output dataset_shards
+    python train_model.py --dataset dataset_shards
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from controllers.featurizer import NUM_LANDMARKS, hand_points
+from controllers.frame_sources import IMAGE_EXTENSIONS, LandmarkStreamSource, VideoFileSource
+from utils.logger import setup_logging
+from utils.persistence import atomic_write, atomic_write_json
+
+logger = setup_logging()
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+LANDMARK_EXTENSIONS = (".jsonl",)
+# Bump when what is written to the cache changes, so old entries are not reused
+EXTRACTOR_VERSION = 3
+MANIFEST = "manifest.json"
+INDEX = "index.json"
+
+# Static-mode MediaPipe instances of the current worker process, by detection confidence;
+# every video gets its own tracking-mode instance instead
+_hands = {}
+
+
+def scan_dataset(root: str):
+    """Returns the sorted ``(path, label)`` pairs of every supported file under ``root/<label>/``."""
+    extensions = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS + LANDMARK_EXTENSIONS
+    files = []
+    for label in sorted(os.listdir(root)):
+        label_dir = os.path.join(root, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for dirpath, _, names in os.walk(label_dir):
+            for name in names:
+                if name.lower().endswith(extensions):
+                    files.append((os.path.join(dirpath, name), label))
+    files.sort()
+    return files
+
+
+def file_digest(path: str, settings: str) -> str:
+    digest = hashlib.sha1(settings.encode("utf-8"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Per-file (N, 21, 3) landmark arrays stored as ``<cache_dir>/<sha1[:2]>/<sha1>.npy``.
+
+    ``index.json`` remembers the digest of each path together with its size and
+    mtime, so unchanged files are not even re-hashed on the next run.
+    """
+
+    def __init__(self, cache_dir: str, settings: str):
+        self.cache_dir = cache_dir
+        self.settings = settings
+        self.index_path = os.path.join(cache_dir, INDEX)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    def digest(self, path: str) -> str:
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.index.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns and entry[2] == self.settings:
+            return entry[3]
+        digest = file_digest(path, self.settings)
+        self.index[key] = [stat.st_size, stat.st_mtime_ns, self.settings, digest]
+        return digest
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], digest + ".npy")
+
+    def save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write_json(self.index_path, self.index)
+
+
+def _create_hands(static_image_mode: bool, min_detection_confidence: float):
+    import mediapipe as mp
+
+    # One process per core already; keep OpenCV from oversubscribing them
+    cv2.setNumThreads(1)
+    return mp.solutions.hands.Hands(static_image_mode=static_image_mode, max_num_hands=1,
+                                    min_detection_confidence=min_detection_confidence)
+
+
+def _get_static_hands(min_detection_confidence: float):
+    """Reused across images: static mode keeps no state between calls."""
+    hands = _hands.get(min_detection_confidence)
+    if hands is None:
+        hands = _hands[min_detection_confidence] = _create_hands(True, min_detection_confidence)
+    return hands
+
+
+def _detect(hands, frame, flip: bool):
+    if flip:
+        frame = cv2.flip(frame, 1)
+    return hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def _points(results):
+    if not results or not results.multi_hand_landmarks:
+        return None
+    return hand_points(results.multi_hand_landmarks[:1])[0]
+
+
+def extract_file(path: str, cache_path: str, frame_step: int = 1, flip: bool = True,
+                 min_detection_confidence: float = 0.7):
+    """Extracts the landmarks of one file into ``cache_path``; returns (samples, frames read)."""
+    lower = path.lower()
+    points = []
+    frames = 0
+    if lower.endswith(IMAGE_EXTENSIONS):
+        frame = cv2.imread(path)
+        if frame is not None:
+            frames = 1
+            detected = _points(_detect(_get_static_hands(min_detection_confidence), frame, flip))
+            if detected is not None:
+                points.append(detected)
+    else:
+        hands = None
+        if lower.endswith(LANDMARK_EXTENSIONS):
+            # Recorded after the app mirrored the frame, so never flipped again
+            source = LandmarkStreamSource(path)
+        else:
+            source = VideoFileSource(path)
+        if source.open():
+            if not lower.endswith(LANDMARK_EXTENSIONS):
+                # A fresh tracking state per video, so one clip's last hand never seeds the next
+                hands = _create_hands(False, min_detection_confidence)
+            try:
+                while True:
+                    ret, frame = source.read()
+                    if not ret:
+                        break
+                    frames += 1
+                    results = source.recorded_hands()
+                    if results is None:
+                        # Tracking mode needs every frame, even the ones not kept
+                        results = _detect(hands, frame, flip)
+                    if (frames - 1) % frame_step == 0:
+                        detected = _points(results)
+                        if detected is not None:
+                            points.append(detected)
+            finally:
+                source.release()
+                if hands is not None:
+                    hands.close()
+
+    landmarks = np.array(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    # Cache entries can always be extracted again, so they skip the fsync
+    atomic_write(cache_path, lambda f: np.save(f, landmarks), sync=False)
+    return len(landmarks), frames
+
+
+def write_shards(output_dir: str, parts, shard_size: int):
+    """Writes ``(landmarks, label_index)`` parts as fixed-size shards and returns their names."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith(("landmarks-", "features-", "labels-")) and name.endswith(".npy"):
+            os.remove(os.path.join(output_dir, name))
+
+    shards = []
+    buffer, buffer_labels, buffered = [], [], 0
+
+    def flush():
+        nonlocal buffer, buffer_labels, buffered
+        n = len(shards)
+        landmarks = np.concatenate(buffer)
+        labels = np.concatenate(buffer_labels)
+        np.save(os.path.join(output_dir, f"landmarks-{n:05d}.npy"), landmarks)
+        np.save(os.path.join(output_dir, f"labels-{n:05d}.npy"), labels)
+        shards.append({"landmarks": f"landmarks-{n:05d}.npy", "labels": f"labels-{n:05d}.npy",
+                       "samples": len(landmarks)})
+        buffer, buffer_labels, buffered = [], [], 0
+
+    for landmarks, label in parts:
+        start = 0
+        while start < len(landmarks):
+            take = min(shard_size - buffered, len(landmarks) - start)
+            buffer.append(landmarks[start:start + take])
+            buffer_labels.append(np.full(take, label, dtype=np.int16))
+            buffered += take
+            start += take
+            if buffered == shard_size:
+                flush()
+    if buffered:
+        flush()
+    return shards
+
+
+def build_dataset(root: str, output_dir: str, cache_dir: str = None, workers: int = None,
+                  frame_step: int = 1, flip: bool = True, min_detection_confidence: float = 0.7,
+                  shard_size: int = 65536) -> dict:
+    """Extracts every file under ``root`` (reusing the cache) and writes the shards; returns the manifest."""
+    cache_dir = cache_dir or os.path.join(output_dir, "cache")
+    settings = f"v{EXTRACTOR_VERSION}:step={frame_step}:flip={int(flip)}:conf={min_detection_confidence}"
+    cache = FeatureCache(cache_dir, settings)
+    files = scan_dataset(root)
+    classes = sorted({label for _, label in files})
+    class_index = {label: i for i, label in enumerate(classes)}
+
+    start = time.perf_counter()
+    digests = [cache.digest(path) for path, _ in files]
+    hash_s = time.perf_counter() - start
+    cache.save_index()
+
+    # Identical files (same digest) are extracted once
+    todo = {}
+    for (path, _), digest in zip(files, digests):
+        if digest not in todo and not os.path.exists(cache.path_for(digest)):
+            todo[digest] = path
+
+    extracted_samples = extracted_frames = failed = 0
+    start = time.perf_counter()
+    if todo:
+        workers = workers or os.cpu_count() or 1
+        logger.info(f"Extraindo {len(todo)} de {len(files)} arquivos com {workers} processos...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(extract_file, path, cache.path_for(digest), frame_step, flip,
+                            min_detection_confidence): path
+                for digest, path in todo.items()
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    samples, frames = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Falha ao extrair {futures[future]}: {e}")
+                    continue
+                extracted_samples += samples
+                extracted_frames += frames
+                if done % 100 == 0 or done == len(futures):
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"{done}/{len(futures)} arquivos, {extracted_samples / elapsed:,.0f} amostras/s")
+    extract_s = time.perf_counter() - start
+
+    counts = {label: 0 for label in classes}
+
+    def parts():
+        for (path, label), digest in zip(files, digests):
+            cache_path = cache.path_for(digest)
+            if not os.path.exists(cache_path):
+                continue
+            landmarks = np.load(cache_path)
+            counts[label] += len(landmarks)
+            yield landmarks, class_index[label]
+
+    shards = write_shards(output_dir, parts(), shard_size)
+    manifest = {
+        "extractor_version": EXTRACTOR_VERSION,
+        "settings": settings,
+        "landmark_shape": [NUM_LANDMARKS, 3],
+        "classes": classes,
+        "counts": counts,
+        "samples": sum(counts.values()),
+        "files": len(files),
+        "files_extracted": len(todo) - failed,
+        "files_cached": len(files) - len(todo),
+        "files_failed": failed,
+        "shards": shards,
+        "hash_s": hash_s,
+        "extract_s": extract_s,
+        "frames_per_s": extracted_frames / extract_s if extract_s > 0 else 0.0,
+        "samples_per_s": extracted_samples / extract_s if extract_s > 0 else 0.0,
+    }
+    atomic_write_json(os.path.join(output_dir, MANIFEST), manifest, indent=2)
+    return manifest
+
+
+def load_dataset(output_dir: str):
+    """Loads the shards written by build_dataset as ``(landmarks, labels)`` with string labels."""
+    with open(os.path.join(output_dir, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    classes = np.array(manifest["classes"])
+    if manifest.get("extractor_version") != EXTRACTOR_VERSION:
+        raise ValueError(f"{output_dir} was built by an older dataset_builder; rebuild it")
+    if not manifest["shards"]:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), classes[:0]
+    landmarks = np.concatenate([np.load(os.path.join(output_dir, s["landmarks"])) for s in manifest["shards"]])
+    labels = np.concatenate([np.load(os.path.join(output_dir, s["labels"])) for s in manifest["shards"]])
+    return landmarks, classes[labels]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="pasta com uma subpasta por gesto (rock, paper, scissors)")
+    parser.add_argument("--output", default="dataset_shards", help="pasta dos shards .npy")
+    parser.add_argument("--cache", help="pasta do cache de extração (padrão: <output>/cache)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--frame-step", type=int, default=1, help="usa um quadro a cada N dos vídeos")
+    parser.add_argument("--no-flip", action="store_true",
+                        help="não espelha imagens e vídeos (o treino pela webcam espelha); "
+                             "dumps .jsonl nunca são espelhados")
+    parser.add_argument("--min-confidence", type=float, default=0.7)
+    parser.add_argument("--shard-size", type=int, default=65536, help="amostras por shard")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        parser.error(f"Pasta não encontrada: {args.root}")
+    manifest = build_dataset(args.root, args.output, args.cache, args.workers, max(1, args.frame_step),
+                             not args.no_flip, args.min_confidence, args.shard_size)
+    print(f"{manifest['samples']} amostras de {manifest['files']} arquivos "
+          f"({manifest['files_extracted']} extraídos, {manifest['files_cached']} do cache, "
+          f"{manifest['files_failed']} com falha) em {len(manifest['shards'])} shards")
+    for label, count in manifest["counts"].items():
+        print(f"  {label}: {count}")
+    print(f"Hash: {manifest['hash_s']:.2f} s  Extração: {manifest['extract_s']:.2f} s  "
+          f"({manifest['samples_per_s']:,.0f} amostras/s, {manifest['frames_per_s']:,.0f} quadros/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import math
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List
+
+REACTION_SAMPLE_LIMIT = 200
 
 class GameMode(Enum):
     SINGLE_PLAYER = "single_player"
@@ -32,10 +35,48 @@ class GameStats:
     accuracy: float = 0.0
     avg_reaction_time: float = 0.0
     gestures_detected: Dict[str, int] = None
+    reaction_samples: int = 0
+    avg_human_latency: float = 0.0
+    avg_pipeline_latency: float = 0.0
+    reaction_times: List[float] = None
+    human_latencies: List[float] = None
+    pipeline_latencies: List[float] = None
     
     def __post_init__(self):
         if self.gestures_detected is None:
             self.gestures_detected = {g.value: 0 for g in Gesture}
+        if self.reaction_times is None:
+            self.reaction_times = []
+        if self.human_latencies is None:
+            self.human_latencies = []
+        if self.pipeline_latencies is None:
+            self.pipeline_latencies = []
+            
+    def record_reaction(self, reaction_ms: float, human_ms: float, pipeline_ms: float):
+        """Adds one prompt-to-gesture measurement, split into human and pipeline latency (ms).
+
+        Means are running over every sample; the lists keep the most recent
+        ``REACTION_SAMPLE_LIMIT`` samples for percentiles.
+        """
+        self.reaction_samples += 1
+        n = self.reaction_samples
+        self.avg_reaction_time += (reaction_ms - self.avg_reaction_time) / n
+        self.avg_human_latency += (human_ms - self.avg_human_latency) / n
+        self.avg_pipeline_latency += (pipeline_ms - self.avg_pipeline_latency) / n
+        for samples, value in ((self.reaction_times, reaction_ms), (self.human_latencies, human_ms),
+                               (self.pipeline_latencies, pipeline_ms)):
+            samples.append(round(value, 1))
+            if len(samples) > REACTION_SAMPLE_LIMIT:
+                del samples[0]
+                
+    @staticmethod
+    def percentile(samples: List[float], q: float) -> float:
+        """Nearest-rank percentile of ``samples`` (0.0 when empty)."""
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
 
 @dataclass
 class GameSettings:
@@ -51,3 +92,28 @@ class GameSettings:
     game_mode: GameMode = GameMode.SINGLE_PLAYER
     auto_save: bool = True
     show_landmarks: bool = True
+    target_fps: int = 30
+    display_fps: int = 30
+    frame_buffer_size: int = 1
+    use_ml_model: bool = True
+    ml_batch_frames: int = 1
+    roi_tracking: bool = False
+    roi_margin: float = 0.35
+    roi_input_size: int = 256
+    roi_refresh_interval: int = 30
+    adaptive_inference: bool = False
+    latency_budget_ms: float = 0.0
+    vote_window: int = 5
+    vote_min_count: int = 3
+    vote_heartbeat_s: float = 0.0
+    sequence_classifier: bool = False
+    sequence_threshold: float = 0.9
+    sequence_model_path: str = ""
+    profiling_enabled: bool = False
+    profiling_overlay: bool = False
+    profiling_export_path: str = ""
+    ai_order: int = 3
+    ai_use_outcomes: bool = False
+    profile: str = "default"
+    profile_cache_size: int = 16
+    profile_cache_bytes: int = 16 * 1024 * 1024
@@ -4,93 +4,278 @@ import numpy as np
 import joblib
 from sklearn.ensemble import RandomForestClassifier
 import os
+import argparse
 
-def extract_features(landmarks):
-    points = np.array([[lm.x, lm.y] for lm in landmarks.landmark])
-    # Normalize points relative to wrist (index 0)
-    base = points[0]
-    points = points - base
-    # Scale points based on the max distance to the wrist
-    max_dist = np.max(np.linalg.norm(points, axis=1))
-    if max_dist > 0:
-        points = points / max_dist
-    return points.flatten().tolist()
-
-def main():
-    cap = cv2.VideoCapture(0)
+from controllers.featurizer import DEFAULT_SCHEMA, NUM_LANDMARKS, FeatureSchema, featurize, hand_points
+from controllers.frame_sources import CameraSource, LandmarkRecorder, create_source
+from controllers.model_registry import load_metadata
+from controllers.model_selection import (CANDIDATES, DEFAULT_BUDGET_US, build_metadata, is_forest,
+                                         save_selected, select_model)
+from controllers.sequence_classifier import (DEFAULT_SEQUENCE_MODEL_PATH, DEFAULT_WINDOW, SequenceClassifier,
+                                             read_labelled_clip)
+from dataset_builder import load_dataset
+from utils.sample_store import SampleStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "gesture_model.pkl")
+SAMPLES_DIR = os.path.join(BASE_DIR, "training_samples")
+# The sample store keeps raw (x, y, z) landmarks, so changing the feature schema never invalidates it
+SAMPLE_DIM = NUM_LANDMARKS * 3
+# Trees added per incremental retrain; past MAX_TREES the forest is rebuilt from all samples
+TREES_PER_RETRAIN = 25
+MAX_TREES = 200
+# Old samples replayed per new sample, so the new trees still see every class
+REPLAY_RATIO = 2
+
+def open_store(path=SAMPLES_DIR):
+    return SampleStore(path, feature_dim=SAMPLE_DIM)
+
+def as_points(rows):
+    return np.asarray(rows).reshape(-1, NUM_LANDMARKS, 3)
+
+def save_model(clf, features, schema=DEFAULT_SCHEMA, metadata=None):
+    """Saves the model with its metadata sidecar (latency is measured here when not given)."""
+    save_selected(clf, MODEL_PATH, metadata or build_metadata(clf, features, schema))
+    # A running game notices the new files on its own (ModelRegistry.check_for_update)
+    print(f"Modelo salvo com sucesso em: {MODEL_PATH}")
+
+def train_and_save(points, labels, schema=DEFAULT_SCHEMA):
+    print("Treinando o modelo RandomForest...")
+    data = featurize(points, schema)
+    clf = RandomForestClassifier(n_estimators=100, random_state=42)
+    clf.fit(data, labels)
+    save_model(clf, data, schema)
+    return clf
+
+def train_selected(points, labels, schema=DEFAULT_SCHEMA, budget_us=DEFAULT_BUDGET_US, candidates=None):
+    """Cross-validates the candidate models and saves the most accurate one that fits the per-frame budget."""
+    data = featurize(points, schema)
+    print(f"Avaliando {len(candidates or CANDIDATES)} modelos com {len(data)} amostras "
+          f"(orçamento de {budget_us:.0f} us por quadro)...")
+    best, report = select_model(data, labels, budget_us, candidates)
+    print(f"{'modelo':28s} {'acurácia':>10s} {'1 mão':>9s} {'quadro':>9s} {'lote/mão':>9s}")
+    for r in report:
+        marker = "*" if r is best else (" " if r["within_budget"] else "-")
+        print(f"{marker}{r['name']:27s} {r['accuracy']:10.4f} {r['single_us']:7.0f}us {r['frame_us']:7.0f}us "
+              f"{r['batch_per_sample_us']:7.1f}us")
+
+    print(f"Treinando {best['name']} com todas as amostras...")
+    clf = CANDIDATES[best["name"]]()
+    clf.fit(data, labels)
+    latency = {k: best[k] for k in ("single_us", "frame_us", "batch_per_sample_us")}
+    save_model(clf, data, schema, build_metadata(clf, data, schema, best["name"], best["accuracy"],
+                                                 best["accuracy_std"], budget_us, latency, report))
+    return clf
+
+def load_model():
+    """The saved model and its feature schema, or (None, None) if it cannot be warm-started."""
+    if not os.path.exists(MODEL_PATH):
+        return None, None
+    try:
+        clf = joblib.load(MODEL_PATH)
+    except Exception as e:
+        print(f"Não foi possível carregar o modelo atual: {e}")
+        return None, None
+    # Only tree ensembles can be warm-started with more trees
+    if not (is_forest(clf) and "warm_start" in clf.get_params()):
+        return None, None
+    return clf, FeatureSchema.from_metadata(load_metadata(MODEL_PATH))
+
+def retrain(store, schema=DEFAULT_SCHEMA, full=False, seed=None):
+    """Retrains from the sample store, warm-starting the saved forest when possible.
+
+    The incremental path only fits TREES_PER_RETRAIN new trees on the samples
+    added since the last training plus a random replay of REPLAY_RATIO old
+    samples per new one, so its cost follows the new data, not the corpus.
+    It falls back to a full fit when there is no model yet, the classes or
+    the feature schema changed, the forest would grow past MAX_TREES or
+    ``full`` is set.
+    """
+    if len(store) < 10:
+        print("Poucos dados! Tente coletar mais amostras antes de treinar.")
+        return None
+    clf, model_schema = (None, None) if full or not store.trained else load_model()
+    if clf is not None and model_schema != schema:
+        print("O esquema de features mudou desde o último treino; treinando do zero.")
+        clf = None
+    if clf is not None and sorted(clf.classes_) != sorted(store.counts):
+        print("As classes mudaram desde o último treino; treinando do zero.")
+        clf = None
+    if clf is not None and len(clf.estimators_) + TREES_PER_RETRAIN > MAX_TREES:
+        print(f"A floresta chegou a {len(clf.estimators_)} árvores; treinando do zero.")
+        clf = None
+    if clf is None:
+        points, labels = store.labelled()
+        clf = train_and_save(as_points(points), labels, schema)
+        store.mark_trained()
+        return clf
+    if not store.untrained:
+        print("Nenhuma amostra nova desde o último treino.")
+        return clf
+
+    rng = np.random.default_rng(seed)
+    new_data, new_labels = store.labelled(store.trained)
+    old = store.read(0, store.trained)
+    replay = rng.choice(store.trained, size=min(store.trained, REPLAY_RATIO * len(new_data)), replace=False)
+    classes = np.array(store.classes)
+    missing = set(clf.classes_) - set(new_labels) - set(classes[old["labels"][replay]])
+    if missing:
+        # Every tree must vote over the same classes; top up with one old sample of each missing one
+        codes = np.asarray(old["labels"])
+        replay = np.concatenate([replay] + [np.flatnonzero(codes == store.classes.index(label))[:1]
+                                            for label in missing])
+    replay = np.sort(replay)
+    data = featurize(as_points(np.concatenate([new_data, old["features"][replay]])), schema)
+    labels = np.concatenate([new_labels, classes[old["labels"][replay]]])
+
+    print(f"Treino incremental: {len(new_data)} amostras novas, {len(data) - len(new_data)} antigas revistas...")
+    clf.set_params(warm_start=True, n_estimators=len(clf.estimators_) + TREES_PER_RETRAIN)
+    clf.fit(data, labels)
+    clf.set_params(warm_start=False)
+    save_model(clf, data, schema)
+    store.mark_trained()
+    return clf
+
+def train_from_dataset(dataset_dir, schema=DEFAULT_SCHEMA):
+    """Trains from the .npy shards written by dataset_builder.py instead of the webcam."""
+    points, labels = load_dataset(dataset_dir)
+    if len(points) < 10:
+        print("Poucos dados! Tente coletar mais amostras antes de treinar.")
+        return None
+    for label in sorted(set(labels)):
+        print(f"{label}: {int((labels == label).sum())}")
+    return train_and_save(points, labels, schema)
+
+def train_sequence(clip_paths, schema=DEFAULT_SCHEMA, window=DEFAULT_WINDOW):
+    """Trains the sliding-window classifier on labelled landmark dumps (.jsonl with a "label" per frame)."""
+    model = SequenceClassifier.fit([read_labelled_clip(path) for path in clip_paths], window, schema)
+    model.save(DEFAULT_SEQUENCE_MODEL_PATH)
+    metrics = model.metrics
+    if "holdout_accuracy" in metrics:
+        print(f"Acurácia em clipes separados: {metrics['holdout_accuracy']:.3f} "
+              f"(erro de calibração {metrics['ece_uncalibrated']:.3f} -> {metrics['ece']:.3f})")
+    print(f"Modelo sequencial salvo em: {DEFAULT_SEQUENCE_MODEL_PATH}")
+    return model
+
+def main(source=None, store=None, source_name="0", schema=DEFAULT_SCHEMA, record_path=None):
+    if store is None:
+        store = open_store()
+    if source is None:
+        source = CameraSource(0)
+    if not source.open():
+        print("Não foi possível abrir a fonte de vídeo.")
+        return
     mp_hands = mp.solutions.hands
     hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.7)
     mp_draw = mp.solutions.drawing_utils
 
-    data = []
-    labels = []
+    keys = {ord('r'): 'rock', ord('p'): 'paper', ord('s'): 'scissors'}
+    recorder = LandmarkRecorder(record_path) if record_path else None
+    if len(store):
+        print(f"{len(store)} amostras já salvas em {store.directory} ({store.untrained} ainda não treinadas)")
 
     print("=== Coleta de Dados para Treinamento de Gestos ===")
     print("Pressione 'r' para salvar Pedra (Rock)")
     print("Pressione 'p' para salvar Papel (Paper)")
     print("Pressione 's' para salvar Tesoura (Scissors)")
     print("Pressione 't' para treinar e salvar o modelo")
-    print("Pressione 'q' para sair sem salvar")
+    print("Pressione 'q' para sair (as amostras ficam salvas para a próxima sessão)")
     print("DICA: Colete pelo menos 30 amostras de cada gesto em diferentes ângulos e distâncias.")
 
     while True:
-        ret, frame = cap.read()
+        ret, frame = source.read()
         if not ret:
             break
 
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
+        results = source.recorded_hands()
+        if results is None:
+            frame = cv2.flip(frame, 1)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = hands.process(rgb_frame)
 
-        features = None
+        points = None
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
                 mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                features = extract_features(hand_landmarks)
+                points = hand_points([hand_landmarks])
 
         # UI Overlay
-        cv2.putText(frame, f"Amostras Totais: {len(data)}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        counts = {label: labels.count(label) for label in set(labels)}
+        cv2.putText(frame, f"Amostras Totais: {len(store)}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
         y_offset = 60
-        for k, v in counts.items():
+        for k, v in store.counts.items():
             cv2.putText(frame, f"{k}: {v}", (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
             y_offset += 30
 
         cv2.imshow("Captura de Dados - Pressione r, p, s, t ou q", frame)
         key = cv2.waitKey(1) & 0xFF
+        if recorder is not None:
+            recorder.write(results, keys.get(key) if points is not None else None)
 
         if key == ord('q'):
-            print("Saindo sem salvar...")
+            print(f"Saindo... {len(store)} amostras salvas em {store.directory}")
             break
         elif key == ord('t'):
-            if len(data) < 10:
-                print("Poucos dados! Tente coletar mais amostras antes de treinar.")
-            else:
-                print("Treinando o modelo RandomForest...")
-                clf = RandomForestClassifier(n_estimators=100, random_state=42)
-                clf.fit(data, labels)
-                
-                # Save in the same directory as the script
-                save_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gesture_model.pkl")
-                joblib.dump(clf, save_path)
-                print(f"Modelo salvo com sucesso em: {save_path}")
+            if retrain(store, schema) is not None:
                 break
-        elif features is not None:
-            if key == ord('r'):
-                data.append(features)
-                labels.append('rock')
-                print("Salvo: rock")
-            elif key == ord('p'):
-                data.append(features)
-                labels.append('paper')
-                print("Salvo: paper")
-            elif key == ord('s'):
-                data.append(features)
-                labels.append('scissors')
-                print("Salvo: scissors")
-
-    cap.release()
+        elif points is not None and key in keys:
+            store.append(points.reshape(1, -1), [keys[key]], source=str(source_name))
+            print(f"Salvo: {keys[key]}")
+
+    source.release()
+    if recorder is not None:
+        recorder.close()
+        print(f"Landmarks gravados em: {record_path}")
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Coleta de dados e treinamento do modelo de gestos")
+    parser.add_argument("--source", default="0",
+                        help="Índice da câmera, vídeo, pasta de imagens ou dump de landmarks (.jsonl)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Reproduz fontes gravadas na taxa de quadros original")
+    parser.add_argument("--record", metavar="ARQUIVO",
+                        help="Grava os landmarks de cada quadro em um dump .jsonl (rótulo nos quadros salvos)")
+    parser.add_argument("--samples", default=SAMPLES_DIR,
+                        help="Pasta onde as amostras coletadas são acumuladas entre sessões")
+    parser.add_argument("--retrain", action="store_true",
+                        help="Treina com as amostras salvas, sem câmera (incremental se já houver modelo)")
+    parser.add_argument("--full", action="store_true",
+                        help="Com --retrain, treina do zero com todas as amostras")
+    parser.add_argument("--select", action="store_true",
+                        help="Compara vários modelos por validação cruzada e latência e salva o melhor")
+    parser.add_argument("--budget-us", type=float, default=DEFAULT_BUDGET_US,
+                        help="Com --select, latência máxima de classificação por quadro em microssegundos")
+    parser.add_argument("--candidates", nargs="+", choices=list(CANDIDATES),
+                        help="Com --select, modelos a comparar (padrão: todos)")
+    parser.add_argument("--dataset",
+                        help="Treina a partir dos shards .npy gerados por dataset_builder.py, sem câmera")
+    parser.add_argument("--sequence", nargs="+", metavar="CLIPE",
+                        help="Treina o classificador de janela deslizante com dumps .jsonl rotulados por quadro")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="Com --sequence, número de quadros por janela")
+    parser.add_argument("--z", action="store_true", help="Inclui a profundidade (z) dos landmarks nas features")
+    parser.add_argument("--angles", action="store_true", help="Inclui os ângulos das articulações dos dedos")
+    args = parser.parse_args()
+    schema = FeatureSchema(use_z=args.z, use_angles=args.angles)
+    if args.sequence:
+        train_sequence(args.sequence, schema, args.window)
+    elif args.select:
+        store = None if args.dataset else open_store(args.samples)
+        if args.dataset:
+            points, labels = load_dataset(args.dataset)
+        else:
+            rows, labels = store.labelled()
+            points = as_points(rows)
+        if len(points) < 10:
+            print("Poucos dados! Tente coletar mais amostras antes de treinar.")
+        else:
+            train_selected(points, labels, schema, args.budget_us, args.candidates)
+            if store is not None:
+                store.mark_trained()
+    elif args.dataset:
+        train_from_dataset(args.dataset, schema)
+    elif args.retrain:
+        retrain(open_store(args.samples), schema, full=args.full)
+    else:
+        main(create_source(args.source, realtime=args.realtime), open_store(args.samples), args.source, schema,
+             args.record)
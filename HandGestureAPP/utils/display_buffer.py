@@ -0,0 +1,58 @@
+import threading
+import cv2
+import numpy as np
+from contextlib import contextmanager
+from typing import Tuple
+
+
+class DisplayBuffer:
+    """Double buffer of display-sized RGB frames shared by the detector and the GUI.
+
+    The worker resizes and colour-converts into the back buffer using
+    preallocated arrays, then swaps it to the front. The GUI reads the front
+    buffer under the lock, so the worker never writes memory being displayed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = [None, None]
+        self._scratch = None
+        self._front = 0
+        self._target = (0, 0)
+        self.frame_id = 0
+
+    def set_target_size(self, width: int, height: int):
+        self._target = (max(1, int(width)), max(1, int(height)))
+
+    def _fit(self, frame_shape) -> Tuple[int, int]:
+        height, width = frame_shape[:2]
+        target_w, target_h = self._target
+        if not target_w or not target_h:
+            return width, height
+        scale = min(target_w / width, target_h / height)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def write(self, frame: np.ndarray):
+        width, height = self._fit(frame.shape)
+        back = 1 - self._front
+        if self._scratch is None or self._scratch.shape[:2] != (height, width):
+            self._scratch = np.empty((height, width, 3), dtype=np.uint8)
+        if self._buffers[back] is None or self._buffers[back].shape[:2] != (height, width):
+            self._buffers[back] = np.empty((height, width, 3), dtype=np.uint8)
+
+        if (width, height) == (frame.shape[1], frame.shape[0]):
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._buffers[back])
+        else:
+            interpolation = cv2.INTER_AREA if width < frame.shape[1] else cv2.INTER_LINEAR
+            cv2.resize(frame, (width, height), dst=self._scratch, interpolation=interpolation)
+            cv2.cvtColor(self._scratch, cv2.COLOR_BGR2RGB, dst=self._buffers[back])
+
+        with self._lock:
+            self._front = back
+            self.frame_id += 1
+
+    @contextmanager
+    def front(self):
+        """Yields the latest RGB frame (or None); the worker cannot swap while it is held."""
+        with self._lock:
+            yield self._buffers[self._front]
@@ -0,0 +1,73 @@
+import threading
+from collections import deque
+
+
+class LatestFrameBuffer:
+    """Bounded hand-off between the capture thread and the inference loop.
+
+    Holds at most ``capacity`` frames. For live sources the oldest frame is
+    discarded when full and the consumer takes the newest frame, skipping the
+    rest. Recorded sources use blocking puts and ``get_next`` so no frame is lost.
+    """
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = max(1, int(capacity))
+        self._slots = deque(maxlen=self.capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, frame, timestamp: float, hands=None, block: bool = False) -> bool:
+        with self._cond:
+            if block:
+                while len(self._slots) == self.capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return False
+            elif len(self._slots) == self.capacity:
+                self.dropped += 1
+            self._slots.append((frame, timestamp, self.written, hands))
+            self.written += 1
+            self._cond.notify_all()
+            return True
+
+    def get_latest(self, timeout: float = None):
+        """Returns ``(frame, capture_timestamp, sequence, hands)`` or None on timeout/close."""
+        with self._cond:
+            if not self._slots and not self._closed:
+                self._cond.wait(timeout)
+            if not self._slots:
+                return None
+            item = self._slots.pop()
+            self.dropped += len(self._slots)
+            self._slots.clear()
+            self._cond.notify_all()
+            return item
+
+    def get_next(self, timeout: float = None):
+        """Like get_latest, but in FIFO order without skipping frames."""
+        with self._cond:
+            if not self._slots and not self._closed:
+                self._cond.wait(timeout)
+            if not self._slots:
+                return None
+            item = self._slots.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reset(self):
+        with self._cond:
+            self._slots.clear()
+            self._closed = False
+            self.written = 0
+            self.dropped = 0
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import queue
+import tempfile
+import threading
+from collections import deque
+
+import numpy as np
+
+from utils.logger import setup_logging
+from utils.round_history import RoundHistory
+
+logger = setup_logging()
+
+_WAKE = "wake"
+_STOP = "stop"
+
+
+def atomic_write(path: str, write, binary: bool = True, sync: bool = True):
+    """Calls ``write(f)`` on a temp file in the same directory and renames it over ``path``.
+
+    ``sync`` fsyncs the temp file first, so a crash leaves either the old or
+    the new contents; caches that can be rebuilt may skip it.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", **({} if binary else {"encoding": "utf-8"})) as f:
+            write(f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data, indent: int = None):
+    """Writes ``data`` as JSON through ``atomic_write``."""
+    atomic_write(path, lambda f: json.dump(data, f, indent=indent), binary=False)
+
+
+class PersistenceWriter(threading.Thread):
+    """Writes round records and stats snapshots off the GUI thread.
+
+    Rounds go through a bounded queue and are appended to their history in one
+    write per batch and file. Stats snapshots are coalesced: only the latest one is kept
+    and written (temp file + rename) when the thread next wakes up. Submitting
+    never blocks; if the queue is full the round is dropped and counted.
+    """
+
+    def __init__(self, history: RoundHistory, stats_path: str, max_queue: int = 1024,
+                 flush_interval: float = 0.5):
+        super().__init__(name="PersistenceWriter", daemon=True)
+        self.history = history
+        self.stats_path = stats_path
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._pending_stats = None
+        self._flushed = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        self.rounds_written = 0
+        self.batches_written = 0
+        self.stats_written = 0
+        self.stats_coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self.write_ms = deque(maxlen=256)
+
+    def submit_round(self, record: np.ndarray, history: RoundHistory = None) -> bool:
+        """Queues ``record`` for ``history`` (the writer's default history if omitted)."""
+        try:
+            self.queue.put_nowait((history if history is not None else self.history, record))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Persistence queue full, dropping round record")
+            return False
+        self._mark_submitted()
+        return True
+
+    def submit_stats(self, snapshot: dict):
+        with self._stats_lock:
+            coalesced = self._pending_stats is not None
+            self._pending_stats = snapshot
+        if coalesced:
+            # A wake-up for the previous snapshot is still queued and will write this one
+            self.stats_coalesced += 1
+            return
+        try:
+            self.queue.put_nowait(_WAKE)
+        except queue.Full:
+            # The writer is already busy with a full queue and will pick the snapshot up
+            return
+        self._mark_submitted()
+
+    def _mark_submitted(self):
+        with self._flushed:
+            self._submitted += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until everything submitted so far is on disk."""
+        with self._flushed:
+            target = self._submitted
+            return self._flushed.wait_for(lambda: self._completed >= target or not self.is_alive(), timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Flushes pending writes and stops the thread."""
+        if not self.is_alive():
+            return
+        self.flush(timeout)
+        self.queue.put(_STOP)
+        self.join(timeout)
+
+    def run(self):
+        running = True
+        while running:
+            try:
+                items = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            running = not any(item is _STOP for item in items)
+            records = [item for item in items if isinstance(item, tuple)]
+            self._write(records)
+            with self._flushed:
+                self._completed += sum(1 for item in items if item is not _STOP)
+                self._flushed.notify_all()
+
+    def _write(self, records):
+        with self._stats_lock:
+            snapshot, self._pending_stats = self._pending_stats, None
+        if not records and snapshot is None:
+            return
+
+        start = time.perf_counter()
+        by_path = {}
+        for history, record in records:
+            by_path.setdefault(history.path, (history, []))[1].append(record)
+        for history, batch in by_path.values():
+            try:
+                history.append_records(np.concatenate(batch))
+                self.rounds_written += sum(len(r) for r in batch)
+                self.batches_written += 1
+            except (OSError, ValueError) as e:
+                self.errors += 1
+                logger.error(f"Failed to append round history {history.path}: {e}")
+        if snapshot is not None:
+            try:
+                atomic_write_json(self.stats_path, snapshot)
+                self.stats_written += 1
+            except (OSError, TypeError, ValueError) as e:
+                self.errors += 1
+                logger.error(f"Failed to save stats: {e}")
+        self.write_ms.append((time.perf_counter() - start) * 1000.0)
+
+    def stats(self) -> dict:
+        latencies = np.array(self.write_ms) if self.write_ms else np.zeros(1)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "rounds_written": self.rounds_written,
+            "batches_written": self.batches_written,
+            "stats_written": self.stats_written,
+            "stats_coalesced": self.stats_coalesced,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "write_ms_mean": float(latencies.mean()),
+            "write_ms_p95": float(np.percentile(latencies, 95)),
+            "write_ms_max": float(latencies.max()),
+        }
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+from models.game_models import GameStats, Gesture
+
+MAGIC = b"RPSHIST\0"
+VERSION = 1
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("record_size", "<u4")])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+
+# 16-byte little-endian record; ``timestamp`` is NaN when the round was not timed
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("session_id", "<u4"),
+    ("player_id", "u1"),
+    ("player", "u1"),
+    ("opponent", "u1"),
+    ("result", "u1"),
+])
+
+# Codes match the move and outcome indices of NGramPredictor
+MOVES = ("rock", "paper", "scissors", "unknown")
+RESULTS = ("win", "draw", "loss")
+MOVE_CODES = {move: i for i, move in enumerate(MOVES)}
+RESULT_CODES = {result: i for i, result in enumerate(RESULTS)}
+
+# Strings used by historico.json
+JSON_MOVES = {"Pedra": "rock", "Papel": "paper", "Tesoura": "scissors", "Desconhecido": "unknown"}
+JSON_RESULTS = {"Vitória": "win", "Empate": "draw", "Derrota": "loss"}
+JSON_FIELDS = {"usuario", "oponente", "resultado", "timestamp", "jogador", "sessao"}
+
+
+def is_binary_history(path: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class RoundHistory:
+    """Append-only file of fixed-size round records, read through a memory map.
+
+    A 16-byte header is followed by RECORD_DTYPE records, so the whole history
+    is one ``np.memmap`` and analytics are vectorized passes over its columns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _ensure_header(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER_SIZE:
+            if not is_binary_history(self.path):
+                raise ValueError(f"{self.path} is not a binary round history")
+            return
+        header = np.array([(MAGIC, VERSION, RECORD_DTYPE.itemsize)], dtype=HEADER_DTYPE)
+        with open(self.path, "wb") as f:
+            f.write(header.tobytes())
+
+    @staticmethod
+    def make_records(count: int) -> np.ndarray:
+        records = np.zeros(count, dtype=RECORD_DTYPE)
+        records["timestamp"] = np.nan
+        return records
+
+    @classmethod
+    def make_record(cls, player_move: str, opponent_move: str, result: str, timestamp: float = None,
+                    player_id: int = 1, session_id: int = 0) -> np.ndarray:
+        record = cls.make_records(1)
+        record["timestamp"] = time.time() if timestamp is None else timestamp
+        record["session_id"] = session_id
+        record["player_id"] = player_id
+        record["player"] = MOVE_CODES.get(player_move, MOVE_CODES["unknown"])
+        record["opponent"] = MOVE_CODES.get(opponent_move, MOVE_CODES["unknown"])
+        record["result"] = RESULT_CODES[result]
+        return record
+
+    def append(self, player_move: str, opponent_move: str, result: str, timestamp: float = None,
+               player_id: int = 1, session_id: int = 0):
+        self.append_records(self.make_record(player_move, opponent_move, result, timestamp, player_id, session_id))
+
+    def append_records(self, records: np.ndarray):
+        self._ensure_header()
+        with open(self.path, "ab") as f:
+            f.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return max(0, os.path.getsize(self.path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+
+    def read(self, offset: int = HEADER_SIZE) -> np.ndarray:
+        """Memory-mapped view of the complete records from byte ``offset`` on.
+
+        A partially written trailing record is left out.
+        """
+        if not is_binary_history(self.path):
+            raise ValueError(f"{self.path} is not a binary round history")
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)[0]
+        if header["version"] != VERSION or header["record_size"] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Unsupported round history version {header['version']} in {self.path}")
+        offset = max(offset, HEADER_SIZE)
+        count = max(0, os.path.getsize(self.path) - offset) // RECORD_DTYPE.itemsize
+        if not count:
+            return self.make_records(0)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=offset, shape=(count,))
+
+
+def convert_jsonl(source: str, destination: str) -> int:
+    """Converts a historico.json JSONL file to the binary format; returns the number of rounds.
+
+    Refuses lines with fields or values the binary format cannot represent, so
+    ``export_jsonl`` always gives back the same records. Blank and malformed
+    lines are skipped, as the AI already did when reading them.
+    """
+    rows = []
+    with open(source, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            unknown = set(data) - JSON_FIELDS
+            if unknown:
+                raise ValueError(f"{source}:{number}: cannot convert fields {sorted(unknown)}")
+            try:
+                player = JSON_MOVES[data["usuario"]]
+                opponent = JSON_MOVES[data["oponente"]]
+                result = JSON_RESULTS[data["resultado"]]
+            except KeyError as e:
+                raise ValueError(f"{source}:{number}: cannot convert value {e}") from None
+            rows.append((data.get("timestamp"), data.get("sessao", 0), data.get("jogador", 1),
+                         MOVE_CODES[player], MOVE_CODES[opponent], RESULT_CODES[result]))
+
+    records = RoundHistory.make_records(len(rows))
+    if rows:
+        timestamps, session_ids, player_ids, players, opponents, results = zip(*rows)
+        records["timestamp"] = [np.nan if t is None else t for t in timestamps]
+        records["session_id"] = session_ids
+        records["player_id"] = player_ids
+        records["player"] = players
+        records["opponent"] = opponents
+        records["result"] = results
+
+    tmp_path = destination + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    RoundHistory(tmp_path).append_records(records)
+    os.replace(tmp_path, destination)
+    return len(records)
+
+
+def export_jsonl(source: str, destination: str) -> int:
+    """Writes a binary history back as historico.json lines."""
+    to_json_move = {v: k for k, v in JSON_MOVES.items()}
+    to_json_result = {v: k for k, v in JSON_RESULTS.items()}
+    records = RoundHistory(source).read()
+    with open(destination, "w", encoding="utf-8") as f:
+        for record in records:
+            data = {
+                "usuario": to_json_move[MOVES[record["player"]]],
+                "oponente": to_json_move[MOVES[record["opponent"]]],
+                "resultado": to_json_result[RESULTS[record["result"]]],
+            }
+            if not np.isnan(record["timestamp"]):
+                data["timestamp"] = float(record["timestamp"])
+            if record["player_id"] != 1:
+                data["jogador"] = int(record["player_id"])
+            if record["session_id"]:
+                data["sessao"] = int(record["session_id"])
+            f.write(json.dumps(data) + "\n")
+    return len(records)
+
+
+def history_stats(records: np.ndarray) -> GameStats:
+    """Lifetime GameStats computed in vectorized passes over ``records``."""
+    stats = GameStats()
+    results = np.asarray(records["result"])
+    counts = np.bincount(results, minlength=len(RESULTS))
+    stats.wins = int(counts[RESULT_CODES["win"]])
+    stats.draws = int(counts[RESULT_CODES["draw"]])
+    stats.losses = int(counts[RESULT_CODES["loss"]])
+    stats.total_games = len(results)
+
+    if len(results):
+        # Streaks are runs of consecutive wins; run boundaries are where the win flag changes
+        wins = np.concatenate([[0], (results == RESULT_CODES["win"]).astype(np.int8), [0]])
+        edges = np.flatnonzero(np.diff(wins))
+        runs = edges[1::2] - edges[::2]
+        stats.best_streak = int(runs.max()) if len(runs) else 0
+        stats.win_streak = int(runs[-1]) if len(runs) and edges[-1] == len(results) else 0
+
+    moves = np.bincount(np.asarray(records["player"]), minlength=len(MOVES))
+    for gesture in Gesture:
+        stats.gestures_detected[gesture.value] = int(moves[MOVE_CODES[gesture.value]])
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o histórico de partidas entre JSONL e o formato binário")
+    parser.add_argument("source", help="historico.json (JSONL) ou histórico binário")
+    parser.add_argument("destination")
+    parser.add_argument("--to-jsonl", action="store_true", help="Converte do formato binário de volta para JSONL")
+    args = parser.parse_args()
+    if args.to_jsonl:
+        print(f"{export_jsonl(args.source, args.destination)} partidas exportadas")
+    else:
+        print(f"{convert_jsonl(args.source, args.destination)} partidas convertidas")
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from utils.persistence import atomic_write_json
+
+VERSION = 1
+META_FILE = "meta.json"
+
+# One raw little-endian file per column; features are ``feature_dim`` float32 per row
+COLUMNS = {
+    "features": np.dtype("<f4"),
+    "labels": np.dtype("u1"),
+    "timestamps": np.dtype("<f8"),
+    "sources": np.dtype("<u2"),
+}
+
+
+class SampleStore:
+    """Append-only columnar store of training samples (features, label, timestamp, source).
+
+    Each column is a flat file that only grows; ``meta.json`` holds the number
+    of committed rows, the label and source names the codes refer to, running
+    per-label counts and how many rows the current model was trained on. Rows
+    are committed by rewriting ``meta.json`` atomically after the columns were
+    appended, so a crash mid-append leaves a tail that is cut off on the next open.
+    """
+
+    def __init__(self, directory: str, feature_dim: int = 42):
+        self.directory = directory
+        self.feature_dim = feature_dim
+        self.count = 0
+        self.trained = 0
+        self.classes: List[str] = []
+        self.sources: List[str] = []
+        self.counts: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._load_meta()
+        self._truncate()
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.bin")
+
+    def _load_meta(self):
+        path = os.path.join(self.directory, META_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != VERSION:
+            raise ValueError(f"Unsupported sample store version {meta.get('version')} in {self.directory}")
+        if meta["feature_dim"] != self.feature_dim:
+            raise ValueError(f"{self.directory} stores {meta['feature_dim']} features per sample, "
+                             f"expected {self.feature_dim}")
+        self.count = meta["count"]
+        self.trained = meta.get("trained", 0)
+        self.classes = meta["classes"]
+        self.sources = meta["sources"]
+        self.counts = meta["counts"]
+
+    def _save_meta(self):
+        atomic_write_json(os.path.join(self.directory, META_FILE), {
+            "version": VERSION,
+            "feature_dim": self.feature_dim,
+            "count": self.count,
+            "trained": self.trained,
+            "classes": self.classes,
+            "sources": self.sources,
+            "counts": self.counts,
+        })
+
+    def _row_size(self, column: str) -> int:
+        return COLUMNS[column].itemsize * (self.feature_dim if column == "features" else 1)
+
+    def _truncate(self):
+        # Drops rows appended after the last committed meta.json
+        for column in COLUMNS:
+            path = self._path(column)
+            size = self.count * self._row_size(column)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _code(self, names: List[str], name: str, limit: int) -> int:
+        try:
+            return names.index(name)
+        except ValueError:
+            if len(names) >= limit:
+                raise ValueError(f"Too many distinct values in {self.directory}: {name!r}")
+            names.append(name)
+            return len(names) - 1
+
+    def append(self, features, labels, source: str = "", timestamps=None) -> int:
+        """Appends rows of ``features`` with their string ``labels``; returns the new row count."""
+        features = np.asarray(features, dtype=COLUMNS["features"]).reshape(-1, self.feature_dim)
+        labels = np.atleast_1d(np.asarray(labels))
+        if len(labels) != len(features):
+            raise ValueError(f"{len(features)} samples but {len(labels)} labels")
+        if not len(features):
+            return self.count
+
+        codes = np.array([self._code(self.classes, str(label), 256) for label in labels], dtype=COLUMNS["labels"])
+        source_code = self._code(self.sources, source, 65536)
+        if timestamps is None:
+            timestamps = np.full(len(features), time.time())
+        columns = {
+            "features": features,
+            "labels": codes,
+            "timestamps": np.asarray(timestamps, dtype=COLUMNS["timestamps"]).reshape(len(features)),
+            "sources": np.full(len(features), source_code, dtype=COLUMNS["sources"]),
+        }
+        for column, values in columns.items():
+            with open(self._path(column), "ab") as f:
+                f.write(np.ascontiguousarray(values, dtype=COLUMNS[column]).tobytes())
+
+        self.count += len(features)
+        for code, n in zip(*np.unique(codes, return_counts=True)):
+            label = self.classes[code]
+            self.counts[label] = self.counts.get(label, 0) + int(n)
+        self._save_meta()
+        return self.count
+
+    def __len__(self):
+        return self.count
+
+    def read(self, start: int = 0, stop: int = None) -> Dict[str, np.ndarray]:
+        """Memory-mapped columns of the committed rows ``start:stop``."""
+        stop = self.count if stop is None else min(stop, self.count)
+        rows = max(0, stop - start)
+        columns = {}
+        for column, dtype in COLUMNS.items():
+            shape = (rows, self.feature_dim) if column == "features" else (rows,)
+            if not rows:
+                columns[column] = np.empty(shape, dtype=dtype)
+                continue
+            columns[column] = np.memmap(self._path(column), dtype=dtype, mode="r",
+                                        offset=start * self._row_size(column), shape=shape)
+        return columns
+
+    def labelled(self, start: int = 0, stop: int = None):
+        """``(features, labels)`` of rows ``start:stop`` with labels as strings, ready for ``fit``."""
+        columns = self.read(start, stop)
+        classes = np.array(self.classes or [""])
+        return np.array(columns["features"]), classes[columns["labels"]]
+
+    def mark_trained(self, count: int = None):
+        """Records that the saved model has seen the first ``count`` rows (all of them by default)."""
+        self.trained = self.count if count is None else count
+        self._save_meta()
+
+    @property
+    def untrained(self) -> int:
+        return self.count - self.trained
@@ -0,0 +1,91 @@
+import csv
+import json
+import time
+import cv2
+import numpy as np
+
+DETECTION_STAGES = ("capture", "flip", "convert", "inference", "draw", "classify", "filter", "emit", "total")
+
+
+class StageProfiler:
+    """Monotonic per-stage timings kept in fixed-size ring buffers.
+
+    ``record`` and ``lap`` only write one slot of a preallocated array, so the
+    hot path allocates nothing. Percentiles are computed on demand.
+    """
+
+    def __init__(self, stages=DETECTION_STAGES, capacity: int = 512):
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self._index = {name: i for i, name in enumerate(self.stages)}
+        self._samples = np.zeros((len(self.stages), capacity), dtype=np.float64)
+        self._counts = [0] * len(self.stages)
+        self._last = 0.0
+        self._start = 0.0
+
+    def start(self):
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """Records the time since the previous lap (or start) under ``stage``."""
+        now = time.perf_counter()
+        self.record(stage, now - self._last)
+        self._last = now
+
+    def finish(self):
+        now = time.perf_counter()
+        self.record("total", now - self._start)
+        self._last = now
+
+    def record(self, stage: str, seconds: float):
+        i = self._index[stage]
+        n = self._counts[i]
+        self._samples[i, n % self.capacity] = seconds * 1000.0
+        self._counts[i] = n + 1
+
+    def samples(self, stage: str) -> np.ndarray:
+        i = self._index[stage]
+        return self._samples[i, :min(self._counts[i], self.capacity)]
+
+    def percentiles(self) -> dict:
+        """``{stage: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"}}`` for stages with samples."""
+        report = {}
+        for stage in self.stages:
+            values = self.samples(stage)
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            report[stage] = {
+                "count": self._counts[self._index[stage]],
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return report
+
+    def reset(self):
+        self._samples.fill(0.0)
+        self._counts = [0] * len(self.stages)
+
+    @staticmethod
+    def draw_overlay(frame: np.ndarray, report: dict):
+        y = 20
+        for stage, values in report.items():
+            text = f"{stage:9s} p50 {values['p50_ms']:6.2f}  p95 {values['p95_ms']:6.2f} ms"
+            cv2.putText(frame, text, (10, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 255), 1)
+            y += 16
+
+    def export(self, path: str):
+        """Writes the percentile report as JSON, or as CSV when ``path`` ends in ``.csv``."""
+        report = self.percentiles()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+                for stage, values in report.items():
+                    writer.writerow([stage, values["count"], values["mean_ms"],
+                                     values["p50_ms"], values["p95_ms"], values["p99_ms"]])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
@@ -4,17 +4,18 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QCoreApplication
 
-from models.game_models import GameStats, GameSettings
+from models.game_models import GameStats, GameSettings, GameMode, Difficulty
 
 class StatsDialog(QDialog):
-    def __init__(self, stats: GameStats, parent=None):
+    def __init__(self, stats: GameStats, parent=None, lifetime: GameStats = None):
         super().__init__(parent)
         self.stats = stats
+        self.lifetime = lifetime
         self.setup_ui()
         
     def setup_ui(self):
         self.setWindowTitle(QCoreApplication.translate("Main", "Estatísticas do Jogo"))
-        self.setFixedSize(400, 300)
+        self.setFixedSize(400, 400)
         
         layout = QVBoxLayout()
         
@@ -31,6 +32,12 @@ class StatsDialog(QDialog):
             (QCoreApplication.translate("Main", "Taxa de Vitórias:"), f"{win_rate:.1f}%"),
             (QCoreApplication.translate("Main", "Sequência Atual:"), str(self.stats.win_streak)),
             (QCoreApplication.translate("Main", "Melhor Sequência:"), str(self.stats.best_streak)),
+            (QCoreApplication.translate("Main", "Tempo de Reação:"),
+             self.format_latency(self.stats.avg_reaction_time, self.stats.reaction_times)),
+            (QCoreApplication.translate("Main", "Latência Humana:"),
+             self.format_latency(self.stats.avg_human_latency, self.stats.human_latencies)),
+            (QCoreApplication.translate("Main", "Latência do Sistema:"),
+             self.format_latency(self.stats.avg_pipeline_latency, self.stats.pipeline_latencies)),
         ]
         
         for i, (label, value) in enumerate(stats_data):
@@ -40,11 +47,49 @@ class StatsDialog(QDialog):
         stats_group.setLayout(stats_layout)
         layout.addWidget(stats_group)
         
+        if self.lifetime is not None:
+            layout.addWidget(self.create_lifetime_group())
+            self.setFixedSize(400, 540)
+        
         close_btn = QPushButton(QCoreApplication.translate("Main", "Fechar"))
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn)
         
         self.setLayout(layout)
+        
+    def create_lifetime_group(self):
+        group = QGroupBox(QCoreApplication.translate("Main", "Histórico Total"))
+        grid = QGridLayout()
+        
+        lifetime = self.lifetime
+        win_rate = (lifetime.wins/max(1, lifetime.total_games)*100)
+        played = {g: n for g, n in lifetime.gestures_detected.items() if g != "unknown"}
+        favorite = max(played, key=played.get) if any(played.values()) else None
+        favorite = {
+            "rock": QCoreApplication.translate("Main", "✊ Pedra"),
+            "paper": QCoreApplication.translate("Main", "✋ Papel"),
+            "scissors": QCoreApplication.translate("Main", "✌️ Tesoura")
+        }.get(favorite, "-")
+        
+        rows = [
+            (QCoreApplication.translate("Main", "Partidas:"), str(lifetime.total_games)),
+            (QCoreApplication.translate("Main", "Taxa de Vitórias:"), f"{win_rate:.1f}%"),
+            (QCoreApplication.translate("Main", "Melhor Sequência:"), str(lifetime.best_streak)),
+            (QCoreApplication.translate("Main", "Gesto Mais Usado:"), favorite),
+        ]
+        for i, (label, value) in enumerate(rows):
+            grid.addWidget(QLabel(label), i, 0)
+            grid.addWidget(QLabel(value), i, 1)
+            
+        group.setLayout(grid)
+        return group
+        
+    def format_latency(self, mean_ms, samples):
+        if not self.stats.reaction_samples:
+            return "-"
+        p50 = GameStats.percentile(samples, 50)
+        p95 = GameStats.percentile(samples, 95)
+        return f"{mean_ms:.0f} ms (p50 {p50:.0f} / p95 {p95:.0f})"
 
 class SettingsDialog(QDialog):
     def __init__(self, settings: GameSettings, parent=None):
@@ -54,7 +99,7 @@ class SettingsDialog(QDialog):
         
     def setup_ui(self):
         self.setWindowTitle(QCoreApplication.translate("Main", "Configurações"))
-        self.setFixedSize(400, 400)
+        self.setFixedSize(400, 610)
         
         layout = QVBoxLayout()
         
@@ -91,10 +136,47 @@ class SettingsDialog(QDialog):
         self.landmarks_checkbox.setChecked(self.settings.show_landmarks)
         layout.addWidget(self.landmarks_checkbox)
         
+        self.roi_checkbox = QCheckBox(QCoreApplication.translate("Main", "Rastrear Região da Mão (economiza CPU)"))
+        self.roi_checkbox.setChecked(self.settings.roi_tracking)
+        layout.addWidget(self.roi_checkbox)
+        
+        self.adaptive_checkbox = QCheckBox(QCoreApplication.translate("Main", "Ajustar Inferência ao Desempenho"))
+        self.adaptive_checkbox.setChecked(self.settings.adaptive_inference)
+        layout.addWidget(self.adaptive_checkbox)
+        
         self.sound_checkbox = QCheckBox(QCoreApplication.translate("Main", "Ativar Efeitos Sonoros"))
         self.sound_checkbox.setChecked(self.settings.sound_enabled)
         layout.addWidget(self.sound_checkbox)
         
+        difficulty_group = QGroupBox(QCoreApplication.translate("Main", "Dificuldade da IA"))
+        difficulty_layout = QHBoxLayout()
+        
+        self.difficulty_combo = QComboBox()
+        for label, difficulty in (
+            (QCoreApplication.translate("Main", "Fácil"), Difficulty.EASY),
+            (QCoreApplication.translate("Main", "Médio"), Difficulty.MEDIUM),
+            (QCoreApplication.translate("Main", "Difícil"), Difficulty.HARD),
+            (QCoreApplication.translate("Main", "Especialista"), Difficulty.EXPERT),
+        ):
+            self.difficulty_combo.addItem(label, difficulty)
+        self.difficulty_combo.setCurrentIndex(list(Difficulty).index(self.settings.difficulty))
+        difficulty_layout.addWidget(self.difficulty_combo)
+        
+        difficulty_group.setLayout(difficulty_layout)
+        layout.addWidget(difficulty_group)
+        
+        mode_group = QGroupBox(QCoreApplication.translate("Main", "Modo de Jogo"))
+        mode_layout = QHBoxLayout()
+        
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem(QCoreApplication.translate("Main", "Contra a IA"), GameMode.SINGLE_PLAYER)
+        self.mode_combo.addItem(QCoreApplication.translate("Main", "Dois Jogadores (mesma câmera)"), GameMode.MULTIPLAYER_LOCAL)
+        self.mode_combo.setCurrentIndex(1 if self.settings.game_mode == GameMode.MULTIPLAYER_LOCAL else 0)
+        mode_layout.addWidget(self.mode_combo)
+        
+        mode_group.setLayout(mode_layout)
+        layout.addWidget(mode_group)
+        
         language_group = QGroupBox(QCoreApplication.translate("Main", "Idioma"))
         language_layout = QHBoxLayout()
         
@@ -124,5 +206,9 @@ class SettingsDialog(QDialog):
         self.settings.countdown_duration = self.countdown_spin.value()
         self.settings.show_landmarks = self.landmarks_checkbox.isChecked()
         self.settings.sound_enabled = self.sound_checkbox.isChecked()
+        self.settings.roi_tracking = self.roi_checkbox.isChecked()
+        self.settings.adaptive_inference = self.adaptive_checkbox.isChecked()
+        self.settings.game_mode = self.mode_combo.currentData()
+        self.settings.difficulty = self.difficulty_combo.currentData()
         self.settings.language = "pt_BR" if self.language_combo.currentText() == "Português (BR)" else "en"
         self.accept()
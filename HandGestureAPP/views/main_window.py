@@ -1,24 +1,33 @@
 import sys
 import os
-import json
 import random
+import time
 from dataclasses import asdict
 from PyQt5.QtWidgets import (
     QApplication, QLabel, QPushButton, QVBoxLayout, QWidget, QMenu, QAction,
     QHBoxLayout, QMainWindow, QMessageBox, QDialog, QSlider, QComboBox, QCheckBox,
-    QSpinBox, QGroupBox, QGridLayout, QFrame
+    QSpinBox, QGroupBox, QGridLayout, QFrame, QInputDialog
 )
 from PyQt5.QtGui import QImage, QPixmap, QFont
 from PyQt5.QtCore import QTimer, Qt, QCoreApplication, QTranslator, QLocale, QThread, pyqtSignal, QSettings
 
-from models.game_models import GameSettings, GameStats, Gesture
+from models.game_models import GameSettings, GameStats, Gesture, GameMode, Difficulty
 from utils.theme_manager import ThemeManager
 from utils.sound_manager import SoundManager
 from controllers.gesture_detector import GestureDetector
-from controllers.ai_logic import MarkovChainAI
+from controllers.profile_manager import ProfileManager, DEFAULT_PROFILE
+from controllers.ensemble_ai import EnsembleAI
+from controllers.model_registry import ModelRegistry
 from views.dialogs import StatsDialog, SettingsDialog
+from utils.round_history import RoundHistory, convert_jsonl, history_stats
+from utils.persistence import PersistenceWriter
+from utils.logger import setup_logging
+
+logger = setup_logging()
 
 class HandsGestureRPS(QMainWindow):
+    profile_loaded = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         self.settings = GameSettings()
@@ -33,13 +42,38 @@ class HandsGestureRPS(QMainWindow):
         self.game_result = None
         self.translator = QTranslator()
         self.last_finger_count = 0
-        
-        history_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "historico.json")
-        self.ai = MarkovChainAI(history_file=history_path)
+        self.player_gestures = {}
+        self.prompt_ts = None
+        
+        # Load the gesture model in the background so camera start never waits on disk
+        ModelRegistry.instance().load_async()
+        
+        self.round_history = self.open_round_history()
+        self.session_id = int(time.time())
+        # Stats and round history are written by a background thread so disk I/O never stalls a round
+        self.writer = PersistenceWriter(self.round_history, "game_stats.json")
+        self.writer.start()
+        # One AI per player profile; switching to a cached profile is a dictionary lookup
+        self.profiles = ProfileManager(
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "profiles"),
+            self.round_history.path,
+            order=self.settings.ai_order,
+            use_outcomes=self.settings.ai_use_outcomes,
+            max_profiles=self.settings.profile_cache_size,
+            max_bytes=self.settings.profile_cache_bytes,
+            before_load=lambda: self.writer.flush(1.0),
+            factory=lambda path: EnsembleAI(path, difficulty=self.settings.difficulty, order=self.settings.ai_order,
+                                            use_outcomes=self.settings.ai_use_outcomes)
+        )
+        self.pending_profile = None
+        self.profile_loaded.connect(self.on_profile_loaded)
+        self.ai = self.profiles.get(DEFAULT_PROFILE)
         
         self.setup_ui()
         self.setup_connections()
         self.load_settings()
+        if self.settings.profile != DEFAULT_PROFILE:
+            self.switch_profile(self.settings.profile)
         self.apply_theme()
         self.load_language()
         
@@ -97,6 +131,10 @@ class HandsGestureRPS(QMainWindow):
         
         game_menu.addSeparator()
         
+        profile_action = QAction(QCoreApplication.translate("Main", "Trocar Jogador..."), self)
+        profile_action.triggered.connect(self.choose_profile)
+        game_menu.addAction(profile_action)
+        
         stats_action = QAction(QCoreApplication.translate("Main", "Estatísticas"), self)
         stats_action.triggered.connect(self.show_stats)
         game_menu.addAction(stats_action)
@@ -148,6 +186,11 @@ class HandsGestureRPS(QMainWindow):
         title.setStyleSheet("color: #00e5ff;")
         layout.addWidget(title)
         
+        self.profile_label = QLabel(self.profile_display_name(self.profiles.active))
+        self.profile_label.setAlignment(Qt.AlignCenter)
+        self.profile_label.setFont(QFont("Segoe UI", 14))
+        layout.addWidget(self.profile_label)
+        
         score_group = QGroupBox(QCoreApplication.translate("Main", "Placar"))
         score_layout = QGridLayout()
         
@@ -237,7 +280,9 @@ class HandsGestureRPS(QMainWindow):
     def start_camera(self):
         self.gesture_detector = GestureDetector(self.settings)
         self.gesture_detector.gesture_detected.connect(self.on_gesture_detected)
-        self.gesture_detector.frame_processed.connect(self.update_camera_feed)
+        self.gesture_detector.player_gesture_detected.connect(self.on_player_gesture_detected)
+        self.gesture_detector.display_ready.connect(self.update_camera_feed)
+        self.gesture_detector.set_display_size(self.camera_label.width(), self.camera_label.height())
         
         if self.gesture_detector.start_detection():
             self.start_camera_btn.setText(QCoreApplication.translate("Main", "Parar Câmera"))
@@ -257,22 +302,88 @@ class HandsGestureRPS(QMainWindow):
         self.camera_label.setText(QCoreApplication.translate("Main", "Câmera parada"))
         self.status_label.setText(QCoreApplication.translate("Main", "Câmera parada"))
         
-    def update_camera_feed(self, frame):
-        height, width, channel = frame.shape
-        bytes_per_line = 3 * width
-        
-        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-        pixmap = QPixmap.fromImage(q_image)
-        
-        scaled_pixmap = pixmap.scaled(
-            self.camera_label.size(), 
-            Qt.KeepAspectRatio, 
-            Qt.SmoothTransformation
+    def update_camera_feed(self):
+        if self.gesture_detector is None:
+            return
+        # The worker already resized and converted the frame; this is just a blit
+        with self.gesture_detector.display_buffer.front() as frame:
+            if frame is None:
+                return
+            height, width, _ = frame.shape
+            q_image = QImage(frame.data, width, height, 3 * width, QImage.Format_RGB888)
+            self.camera_label.setPixmap(QPixmap.fromImage(q_image))
+            
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.gesture_detector:
+            self.gesture_detector.set_display_size(self.camera_label.width(), self.camera_label.height())
+        
+    def open_round_history(self):
+        """Opens the binary round history, converting historico.json on first use."""
+        base_dir = os.path.dirname(os.path.dirname(__file__))
+        binary_path = os.path.join(base_dir, "historico.rpsh")
+        json_path = os.path.join(base_dir, "historico.json")
+        if not os.path.exists(binary_path) and os.path.exists(json_path):
+            try:
+                count = convert_jsonl(json_path, binary_path)
+                logger.info(f"Converted {count} rounds from historico.json to historico.rpsh")
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not convert historico.json: {e}")
+        return RoundHistory(binary_path)
+        
+    def profile_display_name(self, name):
+        player = QCoreApplication.translate("Main", "Convidado") if name == DEFAULT_PROFILE else name
+        return QCoreApplication.translate("Main", f"Jogador: {player}")
+        
+    def choose_profile(self):
+        if self.game_state != "waiting":
+            return
+        profiles = self.profiles.list_profiles()
+        name, ok = QInputDialog.getItem(
+            self, QCoreApplication.translate("Main", "Trocar Jogador"),
+            QCoreApplication.translate("Main", "Escolha ou digite um nome:"),
+            profiles, profiles.index(self.profiles.active) if self.profiles.active in profiles else 0, True
         )
+        if ok and name:
+            self.switch_profile(name.strip())
+            
+    def switch_profile(self, name):
+        """Makes ``name`` the player the AI learns from, loading its model in the background if needed."""
+        if name == self.profiles.active and self.pending_profile is None:
+            return
+        if not self.profiles.valid_name(name):
+            QMessageBox.warning(self, QCoreApplication.translate("Main", "Perfil"),
+                                QCoreApplication.translate("Main", f"Nome de jogador inválido: {name}"))
+            return
+        ai = self.profiles.cached(name)
+        if ai is not None:
+            self.apply_profile(name, ai)
+            return
+        self.pending_profile = name
+        self.status_label.setText(QCoreApplication.translate("Main", f"Carregando perfil {name}..."))
+        self.profiles.load_async(name).add_done_callback(lambda future: self.profile_loaded.emit(name))
         
-        self.camera_label.setPixmap(scaled_pixmap)
+    def on_profile_loaded(self, name):
+        if name != self.pending_profile:
+            return
+        self.pending_profile = None
+        ai = self.profiles.cached(name)
+        if ai is None:
+            self.status_label.setText(QCoreApplication.translate("Main", f"Erro ao carregar perfil {name}"))
+            return
+        self.apply_profile(name, ai)
+        
+    def apply_profile(self, name, ai):
+        self.pending_profile = None
+        self.profiles.activate(name)
+        self.ai = ai
+        self.round_history = RoundHistory(self.profiles.history_path(name))
+        self.settings.profile = name
+        self.reset_game()
+        self.profile_label.setText(self.profile_display_name(name))
+        self.status_label.setText(QCoreApplication.translate("Main", "Pronto para jogar!"))
         
-    def on_gesture_detected(self, gesture, confidence, finger_count):
+    def on_gesture_detected(self, gesture, confidence, finger_count, onset_ts, capture_ts):
         gesture_translated = {
             "rock": QCoreApplication.translate("Main", "✊ Pedra"),
             "paper": QCoreApplication.translate("Main", "✋ Papel"),
@@ -283,8 +394,48 @@ class HandsGestureRPS(QMainWindow):
         self.fingers_label.setText(QCoreApplication.translate("Main", f"Dedos detectados: {finger_count}"))
         self.last_finger_count = finger_count
         
-        if self.game_state == "playing":
+        if self.game_state == "playing" and not self.is_multiplayer():
             self.player_gesture = gesture
+            self.record_reaction(onset_ts)
+            self.end_round()
+            
+    def record_reaction(self, onset_ts):
+        """Splits prompt-to-decision time into human latency (prompt to the
+        first frame showing the gesture) and pipeline latency (that frame to now)."""
+        if self.prompt_ts is None:
+            return
+        decision_ts = time.perf_counter()
+        prompt_ts, self.prompt_ts = self.prompt_ts, None
+        if onset_ts < prompt_ts:
+            # Gesture shown before the prompt was a guess, not a reaction
+            return
+        self.stats.record_reaction(
+            (decision_ts - prompt_ts) * 1000.0,
+            (onset_ts - prompt_ts) * 1000.0,
+            (decision_ts - onset_ts) * 1000.0
+        )
+            
+    def is_multiplayer(self):
+        return self.settings.game_mode == GameMode.MULTIPLAYER_LOCAL
+        
+    def translate_gesture(self, gesture):
+        return {
+            "rock": QCoreApplication.translate("Main", "✊ Pedra"),
+            "paper": QCoreApplication.translate("Main", "✋ Papel"),
+            "scissors": QCoreApplication.translate("Main", "✌️ Tesoura"),
+            "unknown": QCoreApplication.translate("Main", "❓ Desconhecido")
+        }.get(gesture, gesture)
+        
+    def on_player_gesture_detected(self, player, gesture, confidence, finger_count, onset_ts, capture_ts):
+        if not self.is_multiplayer():
+            return
+        if self.game_state == "playing":
+            # Reaction stats follow player 1, like the score
+            if player == 1 and player not in self.player_gestures:
+                self.record_reaction(onset_ts)
+            self.player_gestures[player] = gesture
+        self.gesture_label.setText(QCoreApplication.translate("Main", f"Jogador {player}: {self.translate_gesture(gesture)}"))
+        if self.game_state == "playing" and len(self.player_gestures) >= 2:
             self.end_round()
             
     def start_round(self):
@@ -295,6 +446,7 @@ class HandsGestureRPS(QMainWindow):
         self.countdown_value = self.settings.countdown_duration
         self.player_gesture = None
         self.opponent_gesture = None
+        self.player_gestures = {}
         
         self.play_btn.setEnabled(False)
         self.status_label.setText(QCoreApplication.translate("Main", f"Prepare-se... {self.countdown_value}"))
@@ -310,6 +462,25 @@ class HandsGestureRPS(QMainWindow):
             self.countdown_timer.stop()
             self.game_state = "playing"
             self.status_label.setText(QCoreApplication.translate("Main", "Mostre seu gesto!"))
+            self.prompt_ts = time.perf_counter()
+            
+            # The detector only signals changes, so a gesture already held counts right away
+            if self.is_multiplayer():
+                if self.gesture_detector:
+                    self.player_gestures = {
+                        player: stable[0] for player, stable in self.gesture_detector.current_player_gestures().items()
+                    }
+                if len(self.player_gestures) >= 2:
+                    self.end_round()
+                    return
+                QTimer.singleShot(3000, self.end_round)
+                return
+            
+            held = self.gesture_detector.current_gesture() if self.gesture_detector else None
+            if held:
+                self.player_gesture = held[0]
+                self.end_round()
+                return
             
             QTimer.singleShot(3000, self.end_round)
             
@@ -319,22 +490,57 @@ class HandsGestureRPS(QMainWindow):
             
         self.game_state = "result"
         
+        if self.is_multiplayer():
+            self.end_multiplayer_round()
+            QTimer.singleShot(3000, self.reset_for_next_round)
+            return
+        
         self.opponent_gesture = self.ai.get_counter_move()
         
         if self.player_gesture is None:
             self.player_gesture = Gesture.UNKNOWN.value
             
-        if self.player_gesture != Gesture.UNKNOWN.value:
-            self.ai.update_history(self.player_gesture)
-            
         result = self.determine_winner(self.player_gesture, self.opponent_gesture)
         
+        if self.player_gesture != Gesture.UNKNOWN.value:
+            self.ai.update_history(self.player_gesture, result)
+        self.record_round(result)
+        
         self.update_stats(result)
         
         self.show_result(result)
         
         QTimer.singleShot(3000, self.reset_for_next_round)
         
+    def record_round(self, result):
+        self.writer.submit_round(RoundHistory.make_record(
+            self.player_gesture, self.opponent_gesture, result, session_id=self.session_id
+        ), self.round_history)
+            
+    def end_multiplayer_round(self):
+        # Scores are kept from player 1's point of view
+        self.player_gesture = self.player_gestures.get(1, Gesture.UNKNOWN.value)
+        self.opponent_gesture = self.player_gestures.get(2, Gesture.UNKNOWN.value)
+        
+        if self.player_gesture == self.opponent_gesture:
+            result = "draw"
+        elif self.opponent_gesture == Gesture.UNKNOWN.value:
+            result = "win"
+        else:
+            result = self.determine_winner(self.player_gesture, self.opponent_gesture)
+            
+        self.update_stats(result)
+        
+        player1 = self.translate_gesture(self.player_gesture)
+        player2 = self.translate_gesture(self.opponent_gesture)
+        if result == "win":
+            message = QCoreApplication.translate("Main", f"Jogador 1 venceu! {player1} vence {player2}")
+        elif result == "loss":
+            message = QCoreApplication.translate("Main", f"Jogador 2 venceu! {player2} vence {player1}")
+        else:
+            message = QCoreApplication.translate("Main", f"Empate! Ambos escolheram {player1}")
+        self.status_label.setText(message)
+        
     def determine_winner(self, player, opponent):
         if player == Gesture.UNKNOWN.value:
             return "loss"
@@ -402,6 +608,7 @@ class HandsGestureRPS(QMainWindow):
         
     def reset_for_next_round(self):
         self.game_state = "waiting"
+        self.prompt_ts = None
         self.player_gesture = None
         self.opponent_gesture = None
         self.status_label.setText(QCoreApplication.translate("Main", "Pronto para jogar!"))
@@ -428,7 +635,13 @@ class HandsGestureRPS(QMainWindow):
             self.save_stats()
             
     def show_stats(self):
-        dialog = StatsDialog(self.stats, self)
+        lifetime = None
+        if len(self.round_history):
+            try:
+                lifetime = history_stats(self.round_history.read())
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading round history: {e}")
+        dialog = StatsDialog(self.stats, self, lifetime=lifetime)
         dialog.exec_()
         
     def show_settings(self):
@@ -441,19 +654,30 @@ class HandsGestureRPS(QMainWindow):
                 
     def apply_settings(self):
         self.sound_manager.enabled = self.settings.sound_enabled
+        self.apply_difficulty()
         if self.gesture_detector:
             self.gesture_detector.settings = self.settings
             self.stop_camera()
             self.start_camera()
             
+    def apply_difficulty(self):
+        for ai in self.profiles.loaded():
+            ai.set_difficulty(self.settings.difficulty)
+            
     def load_settings(self):
         settings = QSettings("xAI", "HandsGestureRPS")
         self.settings.detection_confidence = settings.value("detection_confidence", 0.7, float)
         self.settings.countdown_duration = settings.value("countdown_duration", 3, int)
         self.settings.sound_enabled = settings.value("sound_enabled", True, bool)
         self.settings.show_landmarks = settings.value("show_landmarks", True, bool)
+        self.settings.roi_tracking = settings.value("roi_tracking", False, bool)
+        self.settings.adaptive_inference = settings.value("adaptive_inference", False, bool)
         self.settings.language = settings.value("language", "pt_BR", str)
         self.settings.camera_index = settings.value("camera_index", 0, int)
+        self.settings.game_mode = GameMode(settings.value("game_mode", GameMode.SINGLE_PLAYER.value, str))
+        self.settings.profile = settings.value("profile", DEFAULT_PROFILE, str)
+        self.settings.difficulty = Difficulty(settings.value("difficulty", Difficulty.MEDIUM.value, str))
+        self.apply_difficulty()
         
         if hasattr(self, 'camera_combo'):
             self.camera_combo.blockSignals(True)
@@ -466,15 +690,20 @@ class HandsGestureRPS(QMainWindow):
         settings.setValue("countdown_duration", self.settings.countdown_duration)
         settings.setValue("sound_enabled", self.settings.sound_enabled)
         settings.setValue("show_landmarks", self.settings.show_landmarks)
+        settings.setValue("roi_tracking", self.settings.roi_tracking)
+        settings.setValue("adaptive_inference", self.settings.adaptive_inference)
         settings.setValue("language", self.settings.language)
         settings.setValue("camera_index", self.settings.camera_index)
+        settings.setValue("game_mode", self.settings.game_mode.value)
+        settings.setValue("profile", self.settings.profile)
+        settings.setValue("difficulty", self.settings.difficulty.value)
         
     def save_stats(self):
-        try:
-            with open("game_stats.json", "w") as f:
-                json.dump(asdict(self.stats), f)
-        except Exception as e:
-            print(f"Failed to save stats: {e}")
+        self.writer.submit_stats(asdict(self.stats))
+        
+    def get_persistence_stats(self) -> dict:
+        """Queue depth and write latency of the background persistence writer."""
+        return self.writer.stats()
             
     def apply_theme(self):
         self.setStyleSheet(ThemeManager.get_dark_theme())
@@ -485,5 +714,8 @@ class HandsGestureRPS(QMainWindow):
         if self.settings.auto_save:
             self.save_settings()
             self.save_stats()
+        self.profiles.shutdown()
+        self.writer.close()
+        logger.info(f"Persistence: {self.get_persistence_stats()}")
         event.accept()
 